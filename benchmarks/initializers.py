@@ -0,0 +1,77 @@
+"""
+Compares the time needed to load rows as model instances with the Django implementation
+of `Model.__init__`/`Model.from_db` and with the fast paths enabled by `django_fast_init`.
+
+Usage: poetry run python benchmarks/initializers.py [number_of_rows]
+"""
+
+import django
+from django.conf import settings
+import sys
+import time
+
+settings.configure(
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    INSTALLED_APPS=[],
+)
+django.setup()
+
+from django.db import connection  # noqa: E402
+import polyjuice  # noqa: E402
+from sqlalchemy import Column, Date, Integer, MetaData, String, Table  # noqa: E402
+
+metadata = MetaData()
+
+
+def build_model(table_name: str, **table_options):
+    table = Table(
+        table_name,
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        Column("stock", Integer, nullable=False),
+        Column("brewed_at", Date, nullable=True),
+        **table_options,
+    )
+    return polyjuice.models_from_metadata(metadata, app_label="benchmark")[table.key]
+
+
+def measure(function, repeat: int = 3) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main(number_of_rows: int) -> None:
+    StandardPotion = build_model("benchmark__standard_potion")
+    FastPotion = build_model("benchmark__fast_potion", django_fast_init=True)
+
+    print(f"{number_of_rows} rows of 4 columns")
+    print(f"{'':<28}{'Django':>10}{'fast path':>12}{'speedup':>10}")
+    for django_model in (StandardPotion, FastPotion):
+        with connection.schema_editor() as editor:
+            editor.create_model(django_model)
+        django_model.polyjuice.bulk_insert(
+            {"id": index, "name": f"Potion {index}", "stock": index}
+            for index in range(number_of_rows)
+        )
+
+    values = (1, "Veritaserum", 10, None)
+    benchmarks = [
+        ("list(Model.objects.all())", lambda model: list(model.objects.all())),
+        (
+            "Model(*values)",
+            lambda model: [model(*values) for _ in range(number_of_rows)],
+        ),
+    ]
+    for label, benchmark in benchmarks:
+        standard = measure(lambda: benchmark(StandardPotion))
+        fast = measure(lambda: benchmark(FastPotion))
+        print(f"{label:<28}{standard:>9.3f}s{fast:>11.3f}s{standard / fast:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
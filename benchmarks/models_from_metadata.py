@@ -0,0 +1,137 @@
+"""
+Measures the time needed to load an app whose models are converted at start-up by
+`polyjuice.models_from_metadata`, against the same models declared one by one with
+`@polyjuice.model`, their foreign keys being resolved from lazy string references,
+and written ahead of time by `python -m polyjuice generate`.
+
+Usage: poetry run python benchmarks/models_from_metadata.py [number_of_tables]
+"""
+
+import django
+from django.conf import settings
+import gc
+import sys
+import time
+from typing import Callable
+
+settings.configure(
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    INSTALLED_APPS=[],
+)
+django.setup()
+
+from django.db import models  # noqa: E402, F401 (imported before the measures)
+from django.test.utils import isolate_apps  # noqa: E402
+import polyjuice  # noqa: E402
+from polyjuice import codegen  # noqa: E402
+from sqlalchemy import (  # noqa: E402
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+)
+
+ROUNDS = 5
+
+# Imported by the generated module.
+metadata = MetaData()
+
+
+def declare_tables(metadata: MetaData, app_label: str, number_of_tables: int) -> None:
+    for index in range(number_of_tables):
+        foreign_keys = []
+        if index:
+            foreign_keys.append(
+                Column(
+                    "previous",
+                    Integer,
+                    ForeignKey(f"{app_label}__table_{index - 1}.id"),
+                    django_on_delete="CASCADE",
+                )
+            )
+        Table(
+            f"{app_label}__table_{index}",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("name", String(50), nullable=False),
+            Column("description", String(200), nullable=True),
+            Column("stock", Integer, nullable=False),
+            Column("price", Numeric(10, 2), nullable=False),
+            Column("brewed_at", Date, nullable=True),
+            *foreign_keys,
+            Index(f"name_index_{index}", "name"),
+        )
+
+
+def decorate_tables(metadata: MetaData, app_label: str) -> None:
+    # Declared from the last table, each foreign key targets a model not built yet,
+    # ie: "decorated0.table_0", resolved by Django once its model is registered.
+    for table in reversed(metadata.sorted_tables):
+        meta = type("Meta", (), {"app_label": app_label})
+        placeholder = type(
+            table.name.split("__", 1)[1].capitalize(),
+            (),
+            {"__table__": table, "Meta": meta, "__module__": f"{app_label}.models"},
+        )
+        polyjuice.model(placeholder)
+
+
+def measure(load: Callable[[int], None]) -> float:
+    # Best of a few rounds, each loading its own tables in an app registry of its own.
+    durations = []
+    for round_index in range(ROUNDS):
+        with isolate_apps():
+            start = time.perf_counter()
+            load(round_index)
+            durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main(number_of_tables: int) -> None:
+    decorated_metadatas = [MetaData() for _ in range(ROUNDS)]
+    converted_metadatas = [metadata] + [MetaData() for _ in range(ROUNDS - 1)]
+    for round_index in range(ROUNDS):
+        app_label = f"decorated{round_index}"
+        declare_tables(decorated_metadatas[round_index], app_label, number_of_tables)
+        app_label = f"benchmark{round_index}"
+        declare_tables(converted_metadatas[round_index], app_label, number_of_tables)
+    # Like `timeit`, collections triggered by earlier allocations are left out.
+    gc.disable()
+
+    decorated = measure(
+        lambda round_index: decorate_tables(
+            decorated_metadatas[round_index], f"decorated{round_index}"
+        )
+    )
+    converted = measure(
+        lambda round_index: polyjuice.models_from_metadata(
+            converted_metadatas[round_index], app_label=f"benchmark{round_index}"
+        )
+    )
+    source_code = compile(
+        codegen.generate(metadata, "__main__:metadata"), "models_gen.py", "exec"
+    )
+    generated = measure(
+        lambda round_index: exec(source_code, {"__name__": "benchmark0.models_gen"})
+    )
+
+    print(f"{number_of_tables} tables of 6 or 7 columns and 1 index")
+    print(f"{'':<24}{'total':>10}{'ms per table':>14}")
+    for label, duration in [
+        ("@polyjuice.model", decorated),
+        ("models_from_metadata", converted),
+        ("generated models", generated),
+    ]:
+        print(
+            f"{label:<24}{duration:>9.3f}s"
+            f"{duration * 1000 / number_of_tables:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,81 @@
+"""
+Compares the memory and the time needed to load the rows of a table as model instances,
+as `values_list()` tuples and as `Model.Row` records.
+
+Usage: poetry run python benchmarks/rows.py [number_of_rows]
+"""
+import django
+from django.conf import settings
+import gc
+import sys
+import time
+import tracemalloc
+
+settings.configure(
+    DATABASES={
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    },
+    INSTALLED_APPS=[],
+)
+django.setup()
+
+from django.db import connection  # noqa: E402
+import polyjuice  # noqa: E402
+from sqlalchemy import Column, Date, Integer, MetaData, String, Table  # noqa: E402
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "benchmark__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        Column("stock", Integer, nullable=False),
+        Column("brewed_at", Date, nullable=True),
+    )
+
+    class Meta:
+        app_label = "benchmark"
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    duration = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, memory, duration
+
+
+def main(number_of_rows: int) -> None:
+    with connection.schema_editor() as editor:
+        editor.create_model(Potion)
+    Potion.polyjuice.bulk_insert(
+        {"id": index, "name": f"Potion {index}", "stock": index, "brewed_at": None}
+        for index in range(number_of_rows)
+    )
+
+    loaders = [
+        ("Model instances", lambda: list(Potion.objects.all())),
+        ("values_list() tuples", lambda: list(Potion.objects.values_list())),
+        ("Model.Row records", lambda: Potion.objects.all().rows()),
+    ]
+    print(f"{number_of_rows} rows of 4 columns")
+    print(f"{'':<22}{'bytes per row':>15}{'µs per row':>12}")
+    for label, load in loaders:
+        result, memory, duration = measure(load)
+        assert len(result) == number_of_rows
+        del result
+        print(
+            f"{label:<22}{memory / number_of_rows:>15.0f}"
+            f"{duration * 1_000_000 / number_of_rows:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,13 +1,31 @@
-from django.db import models
-from .errors import MissingTableDefinition
-from .fields import to_django_field
+from django.utils.functional import SimpleLazyObject
+from .arrays import to_arrays
+from .engine import connect, get_engine
+from .identity import identity_map
+from .errors import DuplicateModelName, MissingTableDefinition
+import functools
+from importlib import import_module
 import inspect
-from .meta import build_meta_class
-from sqlalchemy import Column, Table
-from typing import Dict, List
+from .lazy import LazyModel, materialize_all
+from . import options  # Registers the `django` dialect used by polyjuice tables.
+from . import query_cache, registry, row_cache
+from .registry import get_model_for_table, get_table_for_model
+from .rows import Row, build_row_class
+from .sql import execute, stream
+from sqlalchemy import Column, MetaData, Table
+from typing import Dict, List, Optional, Type
 
+# Importing the Django ORM is costly, so it is deferred until a model is
+# built: processes that only use polyjuice tables with SQLAlchemy Core never pay for it.
+models = SimpleLazyObject(lambda: import_module("django.db.models"))
+
+default_app_config = "polyjuice.apps.PolyjuiceConfig"
+
+
+def model(django_model_placeholder=None, *, lazy: bool = False):
+    if django_model_placeholder is None:
+        return functools.partial(model, lazy=lazy)
 
-def model(django_model_placeholder):
     model_name = django_model_placeholder.__name__
     module = django_model_placeholder.__module__
 
@@ -15,32 +33,194 @@ def model(django_model_placeholder):
     if not isinstance(sqlalchemy_table, Table):
         raise MissingTableDefinition(django_model_placeholder)
 
+    django_model = get_model_for_table(sqlalchemy_table)
+    if django_model is not None:
+        return django_model
+
     user_defined_meta = getattr(django_model_placeholder, "Meta", None)
-    Meta = build_meta_class(sqlalchemy_table, user_defined_meta)
+    methods = _get_methods(django_model_placeholder)
+
+    build = functools.partial(
+        _build_model, model_name, module, sqlalchemy_table, user_defined_meta, methods
+    )
+    if not lazy:
+        return build()
+
+    lazy_model = LazyModel(model_name, sqlalchemy_table, build)
+    registry.register(sqlalchemy_table, lazy_model)
+    return lazy_model
+
+
+def models_from_metadata(
+    metadata: MetaData, app_label: str, module: Optional[str] = None
+) -> Dict[str, Type["models.Model"]]:
+    if module is None:
+        module = f"{app_label}.models"
+
+    class Meta:
+        pass
+
+    Meta.app_label = app_label
+
+    model_names = _get_model_names(metadata, app_label)
+
+    # Tables are sorted by foreign key dependencies, so a related model
+    # is always registered before the models that point at it.
+    django_models: Dict[str, Type["models.Model"]] = {}
+    for table in metadata.sorted_tables:
+        django_model = get_model_for_table(table)
+        if isinstance(django_model, LazyModel):
+            django_model = django_model.materialize()
+        elif django_model is None:
+            django_model = _build_model(model_names[table], module, table, Meta, {})
+        django_models[table.key] = django_model
+
+    return django_models
+
+
+def _build_model(
+    model_name: str,
+    module: str,
+    table: Table,
+    user_defined_meta,
+    methods,
+) -> Type["models.Model"]:
+    # Modules using the Django ORM are imported when the first model is built, see `models`.
+    from .accessor import PolyjuiceAccessor
+    from .meta import build_meta_class
+
+    fields = _from_table(table)
 
     attributes = {
         "__module__": module,
-        "__table__": sqlalchemy_table,
-        "Meta": Meta,
+        "__table__": table,
+        "Meta": build_meta_class(table, user_defined_meta),
+        "polyjuice": PolyjuiceAccessor(),
+        "objects": _get_manager(table),
     }
+    attributes.update(fields)
+    attributes.update(methods)
 
-    _fields = _from_table(sqlalchemy_table)
-    attributes.update(_fields)
+    django_model = type(model_name, (_get_base(table),), attributes)
+    setup_model(django_model, fields)
+    return django_model
 
-    methods = _get_methods(django_model_placeholder)
-    attributes.update(methods)
 
-    django_model = type(model_name, (models.Model,), attributes)
+def setup_model(
+    django_model: Type["models.Model"],
+    fields: Optional[Dict[str, "models.Field"]] = None,
+) -> None:
+    """
+    Installs what polyjuice adds to a model once its class is created, from the fields
+    of its `__table__` (read from the model by default): the `Row` class, `from_db`,
+    the foreign key descriptors, the fast initializers and the cache signals.
+    """
+    from . import initializers, managers, tracking
+
+    table = django_model.__table__
+    if fields is None:
+        fields = {
+            field_name: django_model._meta.get_field(field_name)
+            for field_name in map(options.get_field_name, table.columns)
+        }
+
+    django_model.Row = _build_row_class(django_model, fields)
+    if "from_db" not in vars(django_model):
+        django_model.from_db = managers.from_db
+    for field_name, field in fields.items():
+        if field.many_to_one:
+            setattr(
+                django_model, field_name, managers.ForwardManyToOneDescriptor(field)
+            )
+
+    if table.dialect_kwargs.get("django_fast_init"):
+        django_model.__init__ = initializers.build_init(django_model)
+        django_model.from_db = initializers.build_from_db(django_model)
+    if table.dialect_kwargs.get("django_track_changes"):
+        django_model.from_db = tracking.wrap_from_db(django_model.from_db)
+    django_model.refresh_from_db = managers.wrap_refresh_from_db(
+        django_model.refresh_from_db
+    )
+
+    registry.register(table, django_model)
+    # Generated models declare their manager without building it from the table.
+    if row_cache.get_row_cache(table) is None:
+        row_cache.register(table)
+    _connect_signals(django_model, table)
 
-    return django_model
 
+def _from_table(table: Table) -> Dict[str, "models.Field"]:
+    from .fields import to_django_field
 
-def _from_table(table: Table) -> Dict[str, models.Field]:
     columns: List[Column] = table.columns.values()
     fields = [to_django_field(table, column) for column in columns]
     return {name: field for name, field in fields}
 
 
+def _get_base(table: Table) -> Type["models.Model"]:
+    from . import tracking
+
+    if table.dialect_kwargs.get("django_track_changes"):
+        return tracking.ChangeTrackingModel
+    return models.Model
+
+
+def _get_manager(table: Table) -> "models.Manager":
+    from . import managers
+
+    if row_cache.register(table) is not None:
+        return managers.RowCacheManager()
+    return managers.PolyjuiceManager()
+
+
+def _build_row_class(
+    django_model: Type["models.Model"], fields: Dict[str, "models.Field"]
+) -> Type[Row]:
+    # Foreign keys are stored by attname in rows, as they cannot load related objects.
+    attnames = [
+        f"{field_name}_id" if field.many_to_one else field_name
+        for field_name, field in fields.items()
+    ]
+    # Methods of the model are shared with its rows, before any initializer is installed.
+    methods = {
+        name: value
+        for name, value in vars(django_model).items()
+        if inspect.isfunction(value)
+    }
+    return build_row_class(
+        django_model.__name__, django_model.__module__, attnames, methods
+    )
+
+
+def _connect_signals(django_model: Type["models.Model"], table: Table) -> None:
+    row_cache.connect_signals(django_model)
+    # Signal receivers prevent fast deletes, so they are only connected when needed.
+    if query_cache.is_enabled():
+        query_cache.connect_signals(django_model)
+
+
 def _get_methods(django_model):
     methods = inspect.getmembers(django_model, predicate=inspect.isfunction)
     return {method_name: method for method_name, method in methods}
+
+
+def _get_model_names(metadata: MetaData, app_label: str) -> Dict[Table, str]:
+    # Names of the models to build, checked before building any of them: the app
+    # prefix of the table names is dropped, which can give two tables the same one.
+    model_names = {}
+    tables_by_model_name: Dict[str, Table] = {}
+    for table in metadata.sorted_tables:
+        if get_model_for_table(table) is not None:
+            continue
+        model_name = _to_model_name(table.name)
+        other_table = tables_by_model_name.setdefault(model_name, table)
+        if other_table is not table:
+            raise DuplicateModelName(table, other_table, model_name, app_label)
+        model_names[table] = model_name
+    return model_names
+
+
+def _to_model_name(table_name: str) -> str:
+    # Example: "potions__magic_potion" -> "MagicPotion"
+    name = table_name.split("__")[-1]
+    return "".join(part.capitalize() for part in name.split("_"))
@@ -0,0 +1,4 @@
+from polyjuice.codegen import main
+import sys
+
+sys.exit(main())
@@ -0,0 +1,133 @@
+from django.utils.functional import cached_property
+from polyjuice import (
+    bulk,
+    errors,
+    hydration,
+    ids,
+    meta,
+    options,
+    pagination,
+    row_cache,
+)
+from sqlalchemy import Column
+from sqlalchemy.sql import ClauseElement
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+
+
+class PolyjuiceAccessor:
+    """
+    Table level operations of a polyjuice model, available as `Model.polyjuice`.
+
+    Example:
+    Potion.polyjuice.bulk_insert({"name": name} for name in potion_names)
+    """
+
+    def __init__(self) -> None:
+        self.model = None
+        self.table = None
+
+    def contribute_to_class(self, model, name: str) -> None:
+        self.model = model
+        self.table = model.__table__
+        setattr(model, name, self)
+
+    def __get__(self, instance, owner):
+        if instance is not None:
+            raise AttributeError(
+                f"`{owner.__name__}.polyjuice` is not accessible via model instances."
+            )
+        return self
+
+    @cached_property
+    def columns_by_name(self) -> Dict[str, Column]:
+        # Columns can be referred to by column key, field name or field attname (ex: `invented_by_id`).
+        columns = {}
+        for column in self.table.columns:
+            field = self.get_field(column)
+            columns[field.attname] = column
+            columns[field.name] = column
+            columns[column.key] = column
+        return columns
+
+    @cached_property
+    def unsupported_indexes(self) -> List[meta.UnsupportedIndex]:
+        # Indexes of the table missing from `Meta.indexes`, with the reason why.
+        return meta.get_unsupported_indexes(self.table)
+
+    @property
+    def row_cache(self) -> Optional[row_cache.RowCache]:
+        # Set when the table defines `django_cache_ttl`, exposes hit and miss counters.
+        return row_cache.get_row_cache(self.table)
+
+    def get_field(self, column: Column):
+        return self.model._meta.get_field(options.get_field_name(column))
+
+    def get_column(self, name: str) -> Column:
+        try:
+            return self.columns_by_name[name]
+        except KeyError:
+            raise errors.UnknownColumn(self.table, name)
+
+    def bulk_insert(
+        self, rows: Iterable[dict], batch_size: int = 1000, using: Optional[str] = None
+    ) -> int:
+        return bulk.bulk_insert(self, rows, batch_size, using)
+
+    def bulk_update(
+        self,
+        rows: Iterable[dict],
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        batch_size: int = 1000,
+        using: Optional[str] = None,
+    ) -> int:
+        return bulk.bulk_update(self, rows, key, columns, batch_size, using)
+
+    def bulk_upsert(
+        self,
+        rows: Iterable[dict],
+        conflict: Optional[List[str]] = None,
+        update: Optional[List[str]] = None,
+        batch_size: int = 1000,
+        using: Optional[str] = None,
+    ) -> int:
+        return bulk.bulk_upsert(self, rows, conflict, update, batch_size, using)
+
+    def allocate_ids(self, count: int, using: Optional[str] = None) -> List[int]:
+        return ids.allocate_ids(self, count, using)
+
+    def bulk_create(
+        self,
+        objs: Iterable,
+        batch_size: Optional[int] = None,
+        using: Optional[str] = None,
+    ) -> List:
+        return ids.bulk_create(self, objs, batch_size, using)
+
+    def from_select(
+        self,
+        statement: ClauseElement,
+        params: Optional[Dict[str, Any]] = None,
+        using: Optional[str] = None,
+        cache_key: Optional[Hashable] = None,
+    ) -> List:
+        return hydration.from_select(self, statement, params, using, cache_key)
+
+    def paginate(
+        self,
+        order_by: List[str],
+        after: Optional[str] = None,
+        limit: int = 100,
+        queryset=None,
+        strict: bool = False,
+    ) -> pagination.Page:
+        return pagination.paginate(self, order_by, after, limit, queryset, strict)
+
+    def chunks(
+        self,
+        order_by: List[str] = (),
+        chunk_size: int = 1000,
+        queryset=None,
+        strict: bool = False,
+    ) -> Iterator[List]:
+        return pagination.chunks(self, order_by, chunk_size, queryset, strict)
@@ -0,0 +1,211 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections
+import functools
+from polyjuice import sql
+from sqlalchemy.sql import ClauseElement
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional
+
+# asyncio API to run SQLAlchemy Core statements through the Django connections.
+#
+# Django database connections are blocking, so statements run on a bounded pool of
+# threads: each thread keeps its own connection, like the thread of a Django request.
+#
+# Example:
+# potions = await polyjuice.aio.fetch_all(select([Potion.__table__]))
+
+
+DEFAULT_MAX_WORKERS = 10
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class _Call:
+    """A function run on the pool, and the connection it uses once it is running."""
+
+    def __init__(self, function: Callable, using: str) -> None:
+        self.function = function
+        self.using = using
+        self.connection = None
+
+    def __call__(self):
+        _close_unusable_connections()
+        self.connection = connections[self.using]
+        try:
+            return self.function()
+        finally:
+            self.connection = None
+            _close_unusable_connections()
+
+    def cancel(self) -> None:
+        connection = self.connection
+        database_connection = getattr(connection, "connection", None)
+        # psycopg2 connections can be cancelled, and SQLite ones interrupted from any thread.
+        cancel = getattr(database_connection, "cancel", None) or getattr(
+            database_connection, "interrupt", None
+        )
+        if cancel is not None:
+            cancel()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = getattr(
+                settings, "POLYJUICE_AIO_MAX_WORKERS", DEFAULT_MAX_WORKERS
+            )
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="polyjuice-aio"
+            )
+        return _executor
+
+
+def shutdown() -> None:
+    """Closes the database connection of every thread of the pool, then stops it."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is None:
+        return
+
+    # Every thread must run one of these tasks: the barrier keeps each one busy
+    # until all of them are running.
+    workers = executor._max_workers
+    barrier = threading.Barrier(workers)
+    for _ in range(workers):
+        executor.submit(_close_connections, barrier)
+    executor.shutdown(wait=True)
+
+
+async def execute(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    cache_key: Optional[Hashable] = None,
+) -> sql.Result:
+    function = functools.partial(sql.execute, statement, params, using, cache_key)
+    return await _run(_Call(function, using))
+
+
+async def fetch_all(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    cache_key: Optional[Hashable] = None,
+) -> List:
+    result = await execute(statement, params, using, cache_key)
+    return result.fetchall()
+
+
+async def fetch_one(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    cache_key: Optional[Hashable] = None,
+):
+    result = await execute(statement, params, using, cache_key)
+    return result.first()
+
+
+async def stream(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    chunk_size: int = 2000,
+    cache_key: Optional[Hashable] = None,
+) -> AsyncIterator:
+    """
+    Yields the rows of a select, fetched `chunk_size` at a time by a thread of the pool.
+
+    The thread fetches at most one chunk ahead of the consumer, and stops as soon as
+    the iteration is stopped or cancelled.
+    """
+    loop = asyncio.get_event_loop()
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=1)
+    stopped = threading.Event()
+
+    def produce():
+        records_chunks = sql.stream_chunks(
+            statement, params, using, chunk_size, cache_key
+        )
+        try:
+            for records in records_chunks:
+                if stopped.is_set():
+                    return
+                _put(loop, chunks, records)
+        except Exception as error:
+            _put(loop, chunks, _Failure(error))
+        finally:
+            records_chunks.close()
+            if not stopped.is_set():
+                _put(loop, chunks, _END)
+
+    call = _Call(produce, using)
+    producer = loop.run_in_executor(get_executor(), call)
+    try:
+        while True:
+            records = await chunks.get()
+            if records is _END:
+                break
+            if isinstance(records, _Failure):
+                raise records.error
+            for record in records:
+                yield record
+    finally:
+        stopped.set()
+        # Makes room for a chunk the producer could be waiting to put.
+        while not chunks.empty():
+            chunks.get_nowait()
+        await asyncio.wait([producer])
+
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+def _put(loop, queue: asyncio.Queue, item) -> None:
+    asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+
+async def _run(call: _Call):
+    loop = asyncio.get_event_loop()
+    future = loop.run_in_executor(get_executor(), call)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        # The statement keeps running in its thread unless the database aborts it.
+        call.cancel()
+        raise
+
+
+def _close_unusable_connections() -> None:
+    # Unlike `close_old_connections`, connections are not closed after each call with the
+    # default `CONN_MAX_AGE` of 0, which would open a connection per statement: they are
+    # kept by their thread until they get unusable, or older than a `CONN_MAX_AGE` set.
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        if connection.settings_dict["CONN_MAX_AGE"] != 0:
+            connection.close_if_unusable_or_obsolete()
+        elif connection.get_autocommit() != connection.settings_dict["AUTOCOMMIT"] or (
+            connection.errors_occurred and not connection.is_usable()
+        ):
+            connection.close()
+        else:
+            connection.errors_occurred = False
+
+
+def _close_connections(barrier: threading.Barrier) -> None:
+    try:
+        barrier.wait(timeout=10)
+    except threading.BrokenBarrierError:
+        pass
+    connections.close_all()
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from .lazy import materialize_all
+
+
+class PolyjuiceConfig(AppConfig):
+    name = "polyjuice"
+
+    def ready(self):
+        # Lazy models must be registered before Django relies on the app registry.
+        materialize_all()
@@ -0,0 +1,185 @@
+from django.db import connections
+from polyjuice import errors, sql
+from sqlalchemy import Column, types
+from sqlalchemy.sql import ClauseElement
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Exports the result of a SQLAlchemy Core select or a queryset as one NumPy array per column,
+# without building a model instance, a dict or a record for each row.
+#
+# Example:
+# arrays = polyjuice.to_arrays(select([potions.c.price, potions.c.brewed_at]))
+# arrays["price"].mean()
+
+# NumPy type of the columns of each SQLAlchemy type, checked in order: the columns
+# of the other types are exported as object arrays.
+NUMPY_TYPES = [
+    (types.Boolean, "bool"),
+    (types.Integer, "int64"),
+    (types.Float, "float64"),
+    (types.Numeric, "float64"),
+    (types.Date, "datetime64[D]"),
+]
+
+# Value stored in the typed arrays for NULL, which are masked.
+NULL_VALUES = {
+    "bool": False,
+    "int64": 0,
+    "float64": float("nan"),
+    "datetime64[D]": None,
+}
+
+
+class ColumnDescription(NamedTuple):
+    name: str
+    numpy_type: Optional[str]
+    nullable: bool
+
+
+def to_arrays(
+    statement_or_queryset,
+    params: Optional[Dict[str, Any]] = None,
+    using: Optional[str] = None,
+    chunk_size: int = 10000,
+) -> Dict[str, Any]:
+    """
+    Returns an array of each column of a select, indexed by column name.
+
+    Boolean, Integer, Float, Numeric and Date columns are exported as typed arrays, as masked
+    arrays when they are nullable. The other columns are exported as object arrays.
+    Rows are fetched `chunk_size` at a time.
+    """
+    numpy = _import_numpy()
+
+    if isinstance(statement_or_queryset, ClauseElement):
+        using = using or "default"
+        sql_string, parameters, columns = _describe_statement(
+            statement_or_queryset, params, using
+        )
+    else:
+        queryset = statement_or_queryset
+        if using is not None:
+            queryset = queryset.using(using)
+        using = queryset.db
+        sql_string, parameters, columns = _describe_queryset(queryset, using)
+
+    buffers = [_ColumnBuffer(numpy, column, chunk_size) for column in columns]
+    size = 0
+    with sql.get_chunked_cursor(connections[using]) as cursor:
+        cursor.execute(sql_string, parameters)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for buffer, values in zip(buffers, zip(*rows)):
+                buffer.extend(values, size)
+            size += len(rows)
+
+    return {buffer.column.name: buffer.to_array(size) for buffer in buffers}
+
+
+class _ColumnBuffer:
+    """A preallocated array, grown when needed, and the validity of its values."""
+
+    def __init__(self, numpy, column: ColumnDescription, capacity: int) -> None:
+        self.numpy = numpy
+        self.column = column
+        self.dtype = numpy.dtype(column.numpy_type or object)
+        self.data = numpy.empty(capacity, self.dtype)
+        self.valid = None
+        if column.numpy_type is not None and column.nullable:
+            self.valid = numpy.empty(capacity, bool)
+
+    def extend(self, values: Tuple, offset: int) -> None:
+        count = len(values)
+        end = offset + count
+        if end > len(self.data):
+            self._grow(end)
+
+        numpy = self.numpy
+        if self.column.numpy_type is None:
+            self.data[offset:end] = values
+            return
+
+        if self.valid is not None:
+            self.valid[offset:end] = numpy.fromiter(
+                (value is not None for value in values), bool, count
+            )
+            null_value = NULL_VALUES[self.column.numpy_type]
+            values = (null_value if value is None else value for value in values)
+        self.data[offset:end] = numpy.fromiter(values, self.dtype, count)
+
+    def to_array(self, size: int):
+        data = self.data[:size]
+        if len(self.data) != size:
+            # Releases the memory allocated for the rows which were never fetched.
+            data = data.copy()
+        if self.valid is None:
+            return data
+        return self.numpy.ma.MaskedArray(data, mask=~self.valid[:size])
+
+    def _grow(self, minimum_capacity: int) -> None:
+        capacity = max(minimum_capacity, 2 * len(self.data))
+        data = self.numpy.empty(capacity, self.dtype)
+        data[: len(self.data)] = self.data
+        self.data = data
+        if self.valid is not None:
+            valid = self.numpy.empty(capacity, bool)
+            valid[: len(self.valid)] = self.valid
+            self.valid = valid
+
+
+def _describe_statement(
+    statement: ClauseElement, params: Optional[Dict[str, Any]], using: str
+) -> Tuple[str, List[Any], List[ColumnDescription]]:
+    compiled = sql.get_compiled(statement, connections[using].vendor)
+    parameters = compiled.get_parameters(statement, params)
+    columns = []
+    for key, (_, _, objects, type_) in zip(
+        compiled.keys, compiled.compiled._result_columns
+    ):
+        table_columns = [obj for obj in objects if isinstance(obj, Column)]
+        # Expressions (ex: `func.max(...)`) can always be NULL.
+        nullable = not table_columns or any(column.nullable for column in table_columns)
+        columns.append(ColumnDescription(key, get_numpy_type(type_), nullable))
+    return compiled.sql, parameters, columns
+
+
+def _describe_queryset(
+    queryset, using: str
+) -> Tuple[str, List[Any], List[ColumnDescription]]:
+    model = queryset.model
+    names = list(queryset._fields or ())
+    if not names:
+        names = [field.attname for field in model._meta.concrete_fields]
+    queryset = queryset.values_list(*names)
+    sql_string, parameters = queryset.query.get_compiler(using=using).as_sql()
+
+    accessor = getattr(model, "polyjuice", None)
+    columns_by_name = accessor.columns_by_name if accessor is not None else {}
+    columns = []
+    for name in names:
+        column = columns_by_name.get(name)
+        if column is None:
+            columns.append(ColumnDescription(name, None, True))
+        else:
+            numpy_type = get_numpy_type(column.type)
+            columns.append(ColumnDescription(name, numpy_type, column.nullable))
+    return sql_string, list(parameters), columns
+
+
+def get_numpy_type(type_: types.TypeEngine) -> Optional[str]:
+    if isinstance(type_, types.TypeDecorator):
+        type_ = type_.impl
+    for type_class, numpy_type in NUMPY_TYPES:
+        if isinstance(type_, type_class):
+            return numpy_type
+    return None
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise errors.MissingDependency("numpy", "polyjuice.to_arrays")
+    return numpy
@@ -0,0 +1,372 @@
+from django.db import connections, router, transaction
+import itertools
+from polyjuice import errors, meta, query_cache, row_cache, sql
+from sqlalchemy import Column, Table
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Bulk operations of polyjuice models, executed with plain SQL through the
+# Django connection: no model instance is built for the rows written.
+
+
+class _WritePlan:
+    """
+    Columns and value conversions of the rows providing the same keys.
+    """
+
+    def __init__(
+        self, accessor, keys: Tuple[str, ...], dialect, with_defaults: bool = True
+    ) -> None:
+        self.keys = keys
+        columns = [accessor.get_column(key) for key in keys]
+        # Like SQLAlchemy, Python side defaults are evaluated for missing columns.
+        self.default_columns = [
+            column
+            for column in accessor.table.columns
+            if with_defaults
+            and column not in columns
+            and column.default is not None
+            and (column.default.is_scalar or column.default.is_callable)
+        ]
+        self.columns: List[Column] = columns + self.default_columns
+        self.fields = [accessor.get_field(column) for column in self.columns]
+        self.related_indexes = [
+            index for index, column in enumerate(columns) if column.foreign_keys
+        ]
+        self.processors = [
+            (index, processor)
+            for index, processor in enumerate(
+                column.type._cached_bind_processor(dialect) for column in self.columns
+            )
+            if processor is not None
+        ]
+
+    def get_values(self, row: dict) -> list:
+        values = [row[key] for key in self.keys]
+        values.extend(sql.get_default_value(column) for column in self.default_columns)
+        for index in self.related_indexes:
+            # Related model instances can be given instead of their primary key.
+            values[index] = getattr(values[index], "pk", values[index])
+        for index, process in self.processors:
+            values[index] = process(values[index])
+        return values
+
+
+def bulk_insert(
+    accessor, rows: Iterable[dict], batch_size: int = 1000, using: Optional[str] = None
+) -> int:
+    if using is None:
+        using = router.db_for_write(accessor.model)
+    connection = connections[using]
+    dialect = sql.get_dialect(connection.vendor)
+
+    inserted = 0
+    with transaction.atomic(using=using, savepoint=False):
+        with connection.cursor() as cursor:
+            for plan, batch in _get_insert_batches(
+                accessor, rows, batch_size, connection, dialect
+            ):
+                cursor.execute(
+                    _get_insert_sql(connection, accessor.table, plan, len(batch)),
+                    [value for values in batch for value in values],
+                )
+                inserted += len(batch)
+        query_cache.invalidate([accessor.table], using)
+
+    return inserted
+
+
+def _get_insert_batches(
+    accessor, rows: Iterable[dict], batch_size: int, connection, dialect
+) -> Iterator[Tuple[_WritePlan, List[list]]]:
+    # Consecutive rows providing the same keys are inserted with the same statement.
+    plans = {}
+    plan = None
+    max_batch_size = batch_size
+    batch: List[list] = []
+    for row in rows:
+        keys = tuple(row)
+        if plan is None or keys != plan.keys:
+            if batch:
+                yield plan, batch
+                batch = []
+            plan = plans.get(keys)
+            if plan is None:
+                plan = plans[keys] = _WritePlan(accessor, keys, dialect)
+            # Some backends limit the number of parameters of a query (ex: SQLite).
+            max_batch_size = min(
+                batch_size,
+                connection.ops.bulk_batch_size(plan.fields, range(batch_size)),
+            )
+
+        batch.append(plan.get_values(row))
+        if len(batch) >= max_batch_size:
+            yield plan, batch
+            batch = []
+
+    if batch:
+        yield plan, batch
+
+
+def _get_insert_sql(connection, table: Table, plan: _WritePlan, row_count: int) -> str:
+    quote_name = connection.ops.quote_name
+    column_names = ", ".join(quote_name(column.name) for column in plan.columns)
+    placeholders = [["%s"] * len(plan.columns)] * row_count
+    values_sql = connection.ops.bulk_insert_sql(plan.fields, placeholders)
+    return (
+        f"INSERT INTO {get_table_name(connection, table)} ({column_names}) {values_sql}"
+    )
+
+
+def bulk_upsert(
+    accessor,
+    rows: Iterable[dict],
+    conflict: Optional[Sequence[str]] = None,
+    update: Optional[Sequence[str]] = None,
+    batch_size: int = 1000,
+    using: Optional[str] = None,
+) -> int:
+    if using is None:
+        using = router.db_for_write(accessor.model)
+    connection = connections[using]
+    if connection.vendor not in ("postgresql", "sqlite"):
+        raise errors.UnsupportedBulkOperation(
+            accessor.table, "bulk_upsert", connection.vendor
+        )
+
+    if conflict is None:
+        conflict_columns = list(accessor.table.primary_key.columns)
+    else:
+        conflict_columns = [accessor.get_column(name) for name in conflict]
+    if frozenset(conflict_columns) not in meta.get_unique_keys(accessor.table):
+        raise errors.InvalidConflictTarget(
+            accessor.table, [column.name for column in conflict_columns]
+        )
+    update_columns = (
+        None if update is None else [accessor.get_column(name) for name in update]
+    )
+
+    rows, pks = _track_primary_keys(accessor, rows, conflict_columns)
+    upserted = 0
+    dialect = sql.get_dialect(connection.vendor)
+    with transaction.atomic(using=using, savepoint=False):
+        with connection.cursor() as cursor:
+            for plan, batch in _get_insert_batches(
+                accessor, rows, batch_size, connection, dialect
+            ):
+                cursor.execute(
+                    _get_upsert_sql(
+                        connection,
+                        accessor.table,
+                        plan,
+                        len(batch),
+                        conflict_columns,
+                        update_columns,
+                    ),
+                    [value for values in batch for value in values],
+                )
+                upserted += cursor.rowcount
+        query_cache.invalidate([accessor.table], using)
+        row_cache.invalidate_table(accessor.table, using, pks)
+
+    return upserted
+
+
+def _get_upsert_sql(
+    connection,
+    table: Table,
+    plan: _WritePlan,
+    row_count: int,
+    conflict_columns: List[Column],
+    update_columns: Optional[List[Column]],
+) -> str:
+    quote_name = connection.ops.quote_name
+    column_names = ", ".join(quote_name(column.name) for column in plan.columns)
+    row_sql = "(%s)" % ", ".join(["%s"] * len(plan.columns))
+    conflict_names = ", ".join(quote_name(column.name) for column in conflict_columns)
+
+    if update_columns is None:
+        # Every column given by the rows, except the conflict target, is updated.
+        given_columns = plan.columns[: len(plan.keys)]
+        update_columns = [
+            column for column in given_columns if column not in conflict_columns
+        ]
+    if update_columns:
+        assignments = ", ".join(
+            f"{quote_name(column.name)} = excluded.{quote_name(column.name)}"
+            for column in update_columns
+        )
+        action = f"DO UPDATE SET {assignments}"
+    else:
+        action = "DO NOTHING"
+
+    return (
+        f"INSERT INTO {get_table_name(connection, table)} ({column_names}) "
+        f"VALUES {', '.join([row_sql] * row_count)} "
+        f"ON CONFLICT ({conflict_names}) {action}"
+    )
+
+
+def bulk_update(
+    accessor,
+    rows: Iterable[dict],
+    key: str = "id",
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = 1000,
+    using: Optional[str] = None,
+) -> int:
+    if using is None:
+        using = router.db_for_write(accessor.model)
+    connection = connections[using]
+    if connection.vendor not in ("postgresql", "sqlite"):
+        raise errors.UnsupportedBulkOperation(
+            accessor.table, "bulk_update", connection.vendor
+        )
+
+    rows = iter(rows)
+    if columns is None:
+        first_row = next(rows, None)
+        if first_row is None:
+            return 0
+        columns = list(first_row)
+        rows = itertools.chain([first_row], rows)
+
+    key_column = accessor.get_column(key)
+    keys = (key,) + tuple(
+        name for name in columns if accessor.get_column(name) is not key_column
+    )
+    if len(keys) == 1:
+        return 0
+
+    rows, pks = _track_primary_keys(accessor, rows, [key_column])
+    plan = _WritePlan(accessor, keys, sql.get_dialect(connection.vendor), False)
+    max_batch_size = min(
+        batch_size, connection.ops.bulk_batch_size(plan.fields, range(batch_size))
+    )
+
+    with transaction.atomic(using=using, savepoint=False):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                updated = _update_from_values(
+                    cursor, connection, accessor.table, plan, rows, max_batch_size
+                )
+            else:
+                updated = _update_from_temporary_table(
+                    cursor, connection, accessor.table, plan, rows, max_batch_size
+                )
+        query_cache.invalidate([accessor.table], using)
+        row_cache.invalidate_table(accessor.table, using, pks)
+
+    return updated
+
+
+def _update_from_values(
+    cursor, connection, table: Table, plan: _WritePlan, rows, batch_size: int
+) -> int:
+    # UPDATE ... FROM (VALUES ...): placeholders are cast to the column types,
+    # otherwise PostgreSQL reads the values of the VALUES list as text.
+    quote_name = connection.ops.quote_name
+    table_name = get_table_name(connection, table)
+    values_name = quote_name("polyjuice_values")
+    key_name, *column_names = [quote_name(column.name) for column in plan.columns]
+    assignments = ", ".join(f"{name} = {values_name}.{name}" for name in column_names)
+    row_sql = "(%s)" % ", ".join(
+        f"CAST(%s AS {field.cast_db_type(connection)})" for field in plan.fields
+    )
+    values_columns = ", ".join([key_name] + column_names)
+
+    updated = 0
+    for batch in _get_batches(plan, rows, batch_size):
+        cursor.execute(
+            f"UPDATE {table_name} SET {assignments} "
+            f"FROM (VALUES {', '.join([row_sql] * len(batch))}) "
+            f"AS {values_name} ({values_columns}) "
+            f"WHERE {table_name}.{key_name} = {values_name}.{key_name}",
+            [value for values in batch for value in values],
+        )
+        updated += cursor.rowcount
+    return updated
+
+
+def _update_from_temporary_table(
+    cursor, connection, table: Table, plan: _WritePlan, rows, batch_size: int
+) -> int:
+    # The rows are inserted in a temporary table, which is then joined by a single UPDATE.
+    quote_name = connection.ops.quote_name
+    table_name = get_table_name(connection, table)
+    temporary_name = quote_name(f"polyjuice_update_{table.name}")
+    key_name, *column_names = [quote_name(column.name) for column in plan.columns]
+    definitions = ", ".join(
+        f"{quote_name(column.name)} {field.cast_db_type(connection)}"
+        + (" PRIMARY KEY" if index == 0 else "")
+        for index, (column, field) in enumerate(zip(plan.columns, plan.fields))
+    )
+
+    # A previous call can leave it behind when its error was caught inside a transaction.
+    cursor.execute(f"DROP TABLE IF EXISTS temp.{temporary_name}")
+    cursor.execute(f"CREATE TEMPORARY TABLE {temporary_name} ({definitions})")
+    for batch in _get_batches(plan, rows, batch_size):
+        placeholders = [["%s"] * len(plan.columns)] * len(batch)
+        # Like on PostgreSQL, a key given several times is updated once.
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {temporary_name} ({', '.join([key_name] + column_names)}) "
+            + connection.ops.bulk_insert_sql(plan.fields, placeholders),
+            [value for values in batch for value in values],
+        )
+
+    assignments = ", ".join(
+        f"{name} = (SELECT {name} FROM {temporary_name} "
+        f"WHERE {temporary_name}.{key_name} = {table_name}.{key_name})"
+        for name in column_names
+    )
+    cursor.execute(
+        f"UPDATE {table_name} SET {assignments} "
+        f"WHERE {key_name} IN (SELECT {key_name} FROM {temporary_name})"
+    )
+    updated = cursor.rowcount
+    cursor.execute(f"DROP TABLE temp.{temporary_name}")
+    return updated
+
+
+def _get_batches(plan: _WritePlan, rows: Iterable[dict], batch_size: int):
+    batch: List[list] = []
+    for row in rows:
+        batch.append(plan.get_values(row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def get_table_name(connection, table: Table) -> str:
+    quote_name = connection.ops.quote_name
+    if table.schema:
+        return f"{quote_name(table.schema)}.{quote_name(table.name)}"
+    return quote_name(table.name)
+
+
+def _track_primary_keys(
+    accessor, rows: Iterable[dict], key_columns: List[Column]
+) -> Tuple[Iterable[dict], Optional[List]]:
+    # Rows shared in a Django cache can only be deleted by primary key: when the rows are
+    # matched by primary key, their keys are collected while they are written.
+    cache = row_cache.get_row_cache(accessor.table)
+    if cache is None or cache.backend is None or len(key_columns) != 1:
+        return rows, None
+    pk_column = key_columns[0]
+    if not pk_column.primary_key:
+        return rows, None
+
+    pks: List = []
+    return _collect_primary_keys(accessor, rows, pk_column, pks), pks
+
+
+def _collect_primary_keys(
+    accessor, rows: Iterable[dict], pk_column: Column, pks: List
+) -> Iterator[dict]:
+    for row in rows:
+        for name, value in row.items():
+            if accessor.get_column(name) is pk_column:
+                pks.append(value)
+                break
+        yield row
@@ -0,0 +1,235 @@
+import argparse
+import ast
+import django
+from django.db import models
+from django.db.migrations.writer import MigrationWriter
+from importlib import import_module
+import importlib.util
+import inspect
+from polyjuice import errors, registry
+from polyjuice.lazy import LazyModel
+from sqlalchemy import MetaData
+from sqlalchemy.sql.schema import ColumnDefault
+import sys
+import textwrap
+from typing import Callable, List, Optional, Set, Tuple, Type
+
+# Writes the source code of the Django models generated from the tables of a
+# SQLAlchemy `MetaData`, so that they can be imported as plain Django models.
+#
+# Example:
+# python -m polyjuice generate hogwarts.tables:metadata --models hogwarts.placeholders -o hogwarts/models_gen.py
+# python -m polyjuice generate hogwarts.tables:metadata --models hogwarts.placeholders -o hogwarts/models_gen.py --check
+
+
+HEADER = "# Generated by `python -m polyjuice generate {source}`, do not edit.\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m polyjuice")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="Write the Django models of a SQLAlchemy MetaData."
+    )
+    generate_parser.add_argument(
+        "source", help="Path to the MetaData, such as `hogwarts.tables:metadata`."
+    )
+    generate_parser.add_argument(
+        "--models",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help=(
+            "Module declaring the placeholder classes of the tables, such as "
+            "`hogwarts.placeholders`. Can be repeated."
+        ),
+    )
+    generate_parser.add_argument("-o", "--output", required=True)
+    generate_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Fail if the output file is not up to date instead of writing it.",
+    )
+    arguments = parser.parse_args(argv)
+
+    django.setup()
+    try:
+        metadata = load_metadata(arguments.source)
+        # The generated module only imports the tables, so the placeholder classes
+        # are declared in other modules, which are imported to register their models.
+        for module_path in arguments.models:
+            import_module(module_path)
+        source_code = generate(metadata, arguments.source)
+    except errors.PolyjuiceError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    if arguments.check:
+        try:
+            with open(arguments.output) as output_file:
+                is_up_to_date = output_file.read() == source_code
+        except FileNotFoundError:
+            is_up_to_date = False
+
+        if not is_up_to_date:
+            print(f"{arguments.output} is out of date.", file=sys.stderr)
+            return 1
+        return 0
+
+    with open(arguments.output, "w") as output_file:
+        output_file.write(source_code)
+    return 0
+
+
+def load_metadata(source: str) -> MetaData:
+    module_path, _, attribute = source.partition(":")
+    module = import_module(module_path)
+    metadata = getattr(module, attribute or "metadata", None)
+    if not isinstance(metadata, MetaData):
+        raise errors.PolyjuiceError(f"`{source}` is not a SQLAlchemy MetaData.")
+    return metadata
+
+
+def generate(metadata: MetaData, source: str) -> str:
+    module_path, _, attribute = source.partition(":")
+    metadata_name = attribute or "metadata"
+    imports = {
+        "from django.db import models",
+        "from polyjuice import setup_model",
+        f"from {module_path} import {metadata_name}",
+    }
+    classes = []
+    for table in metadata.sorted_tables:
+        django_model = registry.get_model_for_table(table)
+        if django_model is None:
+            continue
+        if isinstance(django_model, LazyModel):
+            django_model = django_model.materialize()
+
+        class_code, class_imports = _generate_model(django_model, metadata_name)
+        classes.append(class_code)
+        imports |= class_imports
+
+    if not classes:
+        raise errors.NoModelToGenerate(source)
+
+    import_lines = sorted(imports, key=lambda line: line.split()[1])
+    header = HEADER.format(source=source) + "\n".join(import_lines) + "\n"
+    return "\n\n".join([header] + classes)
+
+
+def _generate_model(
+    django_model: Type[models.Model], metadata_name: str
+) -> Tuple[str, Set[str]]:
+    base_code, imports = _import_class(django_model.__bases__[0])
+    lines = [
+        f"class {django_model.__name__}({base_code}):",
+        f"    __table__ = {metadata_name}.tables[{django_model.__table__.key!r}]",
+    ]
+
+    for field in django_model._meta.local_fields:
+        field_code, field_imports = MigrationWriter.serialize(_clean_field(field))
+        lines.append(f"    {field.name} = {field_code}")
+        imports |= field_imports
+
+    # The accessor class is imported by name, the `polyjuice` attribute shadowing the package.
+    lines.append("")
+    for name, value in [
+        ("objects", django_model._default_manager),
+        ("polyjuice", vars(django_model)["polyjuice"]),
+    ]:
+        class_code, class_imports = _import_class(value.__class__)
+        lines.append(f"    {name} = {class_code}()")
+        imports |= class_imports
+
+    lines.append("")
+    lines.append("    class Meta:")
+    meta_options = dict(django_model._meta.original_attrs)
+    meta_options.setdefault("app_label", django_model._meta.app_label)
+    for name, value in sorted(meta_options.items()):
+        value_code, value_imports = MigrationWriter.serialize(value)
+        lines.append(f"        {name} = {value_code}")
+        imports |= value_imports
+
+    methods = _get_user_defined_methods(django_model)
+    for method in methods:
+        method_code = textwrap.dedent(inspect.getsource(method))
+        lines.append("")
+        lines.append(textwrap.indent(method_code, "    ").rstrip("\n"))
+    imports |= _get_method_imports(methods)
+
+    # `Row`, `from_db`, the foreign key descriptors and the registry entry are
+    # installed once the class exists, as for the models built at runtime.
+    lines.append("")
+    lines.append("")
+    lines.append(f"setup_model({django_model.__name__})")
+    return "\n".join(lines) + "\n", imports
+
+
+def _import_class(cls: type) -> Tuple[str, Set[str]]:
+    if cls is models.Model:
+        return "models.Model", set()
+    return cls.__name__, {f"from {cls.__module__} import {cls.__name__}"}
+
+
+def _get_method_imports(methods: List[Callable]) -> Set[str]:
+    # Copied methods keep using the names imported by the module of their placeholder class.
+    used_names = set()
+    modules = set()
+    for method in methods:
+        method_tree = ast.parse(textwrap.dedent(inspect.getsource(method)))
+        used_names |= {
+            node.id for node in ast.walk(method_tree) if isinstance(node, ast.Name)
+        }
+        modules.add(inspect.getmodule(method))
+
+    imports = set()
+    for module in modules:
+        for node in ast.parse(inspect.getsource(module)).body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if (alias.asname or alias.name.split(".")[0]) in used_names:
+                        imports.add(f"import {_format_alias(alias)}")
+            elif isinstance(node, ast.ImportFrom):
+                module_path = importlib.util.resolve_name(
+                    "." * node.level + (node.module or ""), module.__package__
+                )
+                for alias in node.names:
+                    if (alias.asname or alias.name) in used_names:
+                        imports.add(f"from {module_path} import {_format_alias(alias)}")
+    return imports
+
+
+def _format_alias(alias: ast.alias) -> str:
+    if alias.asname is None:
+        return alias.name
+    return f"{alias.name} as {alias.asname}"
+
+
+def _clean_field(field: models.Field) -> models.Field:
+    # SQLAlchemy column defaults are forwarded as is to the Django field:
+    # they are unwrapped to write the underlying value or callable.
+    _, path, args, kwargs = field.deconstruct()
+    default = kwargs.get("default")
+    if isinstance(default, ColumnDefault):
+        kwargs["default"] = getattr(default.arg, "__wrapped__", default.arg)
+    return field.__class__(*args, **kwargs)
+
+
+def _get_user_defined_methods(django_model: Type[models.Model]):
+    # Methods copied from the placeholder class are the only plain functions of the model
+    # which polyjuice did not build (ex: the fast `__init__` of `django_fast_init` tables):
+    # the ones added by Django are partial methods. Methods wrapped by polyjuice
+    # (ex: `refresh_from_db`) are written as defined, `setup_model` wrapping them again.
+    methods = [
+        inspect.unwrap(value)
+        for value in vars(django_model).values()
+        if inspect.isfunction(value)
+    ]
+    return [
+        method
+        for method in methods
+        if not method.__module__.startswith(("django.", "polyjuice."))
+    ]
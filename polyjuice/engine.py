@@ -0,0 +1,188 @@
+from contextlib import contextmanager
+from django.db import connections
+from polyjuice import errors, query_cache, row_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.pool import QueuePool, StaticPool
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+import weakref
+
+# Pooled SQLAlchemy engines built from the Django `DATABASES` setting, so that Core
+# queries use the same credentials as the ORM, and a pool whose size is known.
+#
+# Example:
+# engine = polyjuice.get_engine("default", pool_size=5, max_overflow=10)
+# with transaction.atomic(), polyjuice.connect("default") as connection:
+#     connection.execute(potions.insert().values(name="Veritaserum"))
+
+
+# SQLAlchemy dialect of each Django database vendor, for the drivers used by Django.
+DRIVERS = {
+    "mysql": "mysql+mysqldb",
+    "oracle": "oracle+cx_oracle",
+    "postgresql": "postgresql+psycopg2",
+    "sqlite": "sqlite+pysqlite",
+}
+
+# The Django SQLite backend already converts dates and datetimes to python objects.
+DIALECT_OPTIONS = {"sqlite": {"native_datetime": True}}
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+# Engine of each Django connection wrapper, with the database connection and the pooled
+# engine it was built for.
+_atomic_block_engines: "weakref.WeakKeyDictionary[Any, Tuple[Any, Engine, Engine]]"
+_atomic_block_engines = weakref.WeakKeyDictionary()
+
+
+def get_engine(
+    using: str = "default",
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+) -> Engine:
+    """
+    Returns the pooled engine of the Django database `using`, created at the first call.
+
+    Connections are opened by the Django backend from `settings.DATABASES`, and recycled
+    after `CONN_MAX_AGE` seconds when it is set.
+    """
+    with _engines_lock:
+        engine = _engines.get(using)
+        if engine is None:
+            engine = _create_engine(
+                using,
+                DEFAULT_POOL_SIZE if pool_size is None else pool_size,
+                DEFAULT_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            )
+            _engines[using] = engine
+        elif (pool_size is not None and pool_size != engine.pool.size()) or (
+            max_overflow is not None and max_overflow != engine.pool._max_overflow
+        ):
+            raise errors.EngineAlreadyConfigured(using)
+        return engine
+
+
+@contextmanager
+def connect(using: str = "default") -> Iterator[Connection]:
+    """
+    Yields a SQLAlchemy connection to the Django database `using`.
+
+    Inside `transaction.atomic()`, it runs on the current Django connection, so that
+    Core statements and the ORM share the same transaction: it is committed or rolled
+    back by Django only. Otherwise, a connection of the pool is used.
+    """
+    django_connection = connections[using]
+    engine = get_engine(using)
+    if not django_connection.in_atomic_block:
+        with engine.connect() as connection:
+            yield connection
+        return
+
+    django_connection.ensure_connection()
+    with _get_atomic_block_engine(django_connection, engine).connect() as connection:
+        yield connection
+
+
+def dispose_engines() -> None:
+    """Closes the connections of every engine pool."""
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+class _AtomicBlockConnection:
+    """A database connection whose transaction is handled by Django."""
+
+    def __init__(self, connection) -> None:
+        self._connection = connection
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _get_atomic_block_engine(django_connection, engine: Engine) -> Engine:
+    # Built once for each database connection opened by Django, which each thread has its own.
+    database_connection = django_connection.connection
+    cached = _atomic_block_engines.get(django_connection)
+    if cached is not None:
+        cached_connection, cached_engine, atomic_block_engine = cached
+        if cached_connection is database_connection and cached_engine is engine:
+            return atomic_block_engine
+
+    wrapped_connection = _AtomicBlockConnection(database_connection)
+    # The pool shares the listeners of the engine pool, such as the dialect setup.
+    pool = StaticPool(
+        lambda: wrapped_connection,
+        reset_on_return=None,
+        dialect=engine.dialect,
+        _dispatch=engine.pool.dispatch,
+    )
+    atomic_block_engine = Engine(pool, engine.dialect, engine.url)
+    _invalidate_caches_on_writes(atomic_block_engine, django_connection.alias)
+    _atomic_block_engines[django_connection] = (
+        database_connection,
+        engine,
+        atomic_block_engine,
+    )
+    return atomic_block_engine
+
+
+def _create_engine(using: str, pool_size: int, max_overflow: int) -> Engine:
+    django_connection = connections[using]
+    vendor = django_connection.vendor
+    if vendor not in DRIVERS:
+        raise errors.UnsupportedDatabaseVendor(vendor)
+
+    def create_connection():
+        # Django builds the driver arguments (credentials, OPTIONS...) of its own connections,
+        # then sets them up (ex: the time zone on PostgreSQL). A wrapper of its own is used
+        # for it, the connection of the current thread being left as is.
+        database_wrapper = django_connection.__class__(
+            django_connection.settings_dict, using
+        )
+        database_wrapper.connection = database_wrapper.get_new_connection(
+            database_wrapper.get_connection_params()
+        )
+        database_wrapper.init_connection_state()
+        return database_wrapper.connection
+
+    conn_max_age = django_connection.settings_dict.get("CONN_MAX_AGE")
+    engine = create_engine(
+        f"{DRIVERS[vendor]}://",
+        creator=create_connection,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=conn_max_age if conn_max_age else -1,
+        **DIALECT_OPTIONS.get(vendor, {}),
+    )
+    _invalidate_caches_on_writes(engine, using)
+    return engine
+
+
+def _invalidate_caches_on_writes(engine: Engine, using: str) -> None:
+    # Core DML statements executed by the engine bump the query and row caches
+    # of their table, like the ones run by `polyjuice.execute`.
+    def after_execute(connection, statement, multiparams, params, result):
+        if isinstance(statement, UpdateBase):
+            query_cache.invalidate([statement.table], using)
+            row_cache.invalidate_table(statement.table, using)
+
+    event.listen(engine, "after_execute", after_execute)
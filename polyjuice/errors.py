@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Index, Table
+from typing import Sequence
 
 
 class PolyjuiceError(Exception):
@@ -21,12 +22,36 @@ class InvalidOnDeleteOption(PolyjuiceError):
         message = (
             f"Table `{table.name}` column `{column.name}`: \n"
             f"The value `{on_delete}` is not valid for the 'django_on_delete' option.\n"
-            "You must use either: CASCADE, PROTECT, SET_NULL, SET_DEFAULT or DO_NOTHING.\n"
+            "You must use either: CASCADE, PROTECT, SET_NULL, SET_DEFAULT, DO_NOTHING, "
+            "DB_CASCADE or DB_SET_NULL.\n"
             "Cf: https://docs.djangoproject.com/en/2.2/ref/models/fields/#django.db.models.ForeignKey.on_delete"
         )
         super().__init__(message)
 
 
+class MissingDatabaseOnDelete(PolyjuiceError):
+    def __init__(self, table: Table, column: Column, on_delete: str) -> None:
+        expected_ondelete = on_delete[len("DB_") :].replace("_", " ")
+        message = (
+            f"Table `{table.name}` column `{column.name}`: \n"
+            f"The 'django_on_delete' value `{on_delete}` relies on the database, so the SQLAlchemy "
+            f"ForeignKey must define `ondelete='{expected_ondelete}'`.\n"
+            f"Example: Column('invented_by', Integer, ForeignKey('myrelatedmodel.id', ondelete='{expected_ondelete}'), django_on_delete='{on_delete}')"
+        )
+        super().__init__(message)
+
+
+class NotNullableDatabaseSetNull(PolyjuiceError):
+    def __init__(self, table: Table, column: Column) -> None:
+        message = (
+            f"Table `{table.name}` column `{column.name}`: \n"
+            "The 'django_on_delete' value `DB_SET_NULL` requires a nullable column, "
+            "as the database sets it to NULL when the related row is deleted.\n"
+            "Example: Column('invented_by', Integer, ForeignKey('myrelatedmodel.id', ondelete='SET NULL'), nullable=True, django_on_delete='DB_SET_NULL')"
+        )
+        super().__init__(message)
+
+
 class MissingStringLength(PolyjuiceError):
     def __init__(self, table: Table, column: Column) -> None:
         message = (
@@ -79,6 +104,36 @@ class MissingDecimalFieldArgument(PolyjuiceError):
         super().__init__(message)
 
 
+class UnsupportedColumnType(PolyjuiceError):
+    def __init__(self, table: Table, column: Column) -> None:
+        message = (
+            f"Table `{table.name}` column `{column.name}`: \n"
+            f"The column type `{column.type.__class__.__name__}` cannot be converted to a Django field yet.\n"
+            "You can register your own converter for this type.\n"
+            "Example: polyjuice.fields.register_converter(MyType, lambda table, column, options: models.TextField(**options))"
+        )
+        super().__init__(message)
+
+
+class UnknownColumn(PolyjuiceError):
+    def __init__(self, table: Table, name: str) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            f"`{name}` is neither a column nor a field of this table."
+        )
+        super().__init__(message)
+
+
+class MissingPrimaryKeyColumn(PolyjuiceError):
+    def __init__(self, table: Table) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            "The select must include the primary key column to build model instances.\n"
+            "Example: Model.polyjuice.from_select(select([table.c.id, table.c.name]))"
+        )
+        super().__init__(message)
+
+
 class InvalidIndexDefinition(PolyjuiceError):
     def __init__(self, table: Table, index: Index) -> None:
         message = (
@@ -110,3 +165,142 @@ class MissingTableDefinition(PolyjuiceError):
             "Cf: https://github.com/ducdetronquito/polyjuice#example"
         )
         super().__init__(message)
+
+
+class DuplicateModelName(PolyjuiceError):
+    def __init__(
+        self, table: Table, other_table: Table, model_name: str, app_label: str
+    ) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            f"Its model would be named `{model_name}`, like the model of the table "
+            f"`{other_table.name}`, in the app `{app_label}`.\n"
+            "Convert them in different apps, or declare one of them with `polyjuice.model` "
+            "and a placeholder class of another name."
+        )
+        super().__init__(message)
+
+
+class NoModelToGenerate(PolyjuiceError):
+    def __init__(self, source: str) -> None:
+        message = (
+            f"MetaData `{source}`: \n"
+            "None of its tables has a polyjuice model, so there is no model to generate.\n"
+            "Import the module declaring their placeholder classes with `--models`.\n"
+            f"Example: python -m polyjuice generate {source} --models myapp.placeholders -o myapp/models_gen.py"
+        )
+        super().__init__(message)
+
+class UnsupportedDatabaseVendor(PolyjuiceError):
+    def __init__(self, vendor: str) -> None:
+        message = (
+            f"The database vendor `{vendor}` is not supported yet.\n"
+            "You must use either: mysql, oracle, postgresql or sqlite."
+        )
+        super().__init__(message)
+
+
+class EngineAlreadyConfigured(PolyjuiceError):
+    def __init__(self, using: str) -> None:
+        message = (
+            f"Database `{using}`: \n"
+            "Its engine was already created with another pool size or overflow.\n"
+            "The pool options must be given at the first call of `polyjuice.get_engine`."
+        )
+        super().__init__(message)
+
+
+class UnsupportedIndexOption(PolyjuiceError):
+    def __init__(self, table: Table, index: Index, option: str) -> None:
+        message = (
+            f"Table `{table.name}` index `{index.name}`: \n"
+            f"The option `{option}` cannot be represented by a Django index.\n"
+            "Supported options are `postgresql_where` and `sqlite_where` made of column comparisons, "
+            "`postgresql_using` with a method of `django.contrib.postgres.indexes` and `postgresql_ops`.\n"
+            "Cf: https://docs.djangoproject.com/en/2.2/ref/models/indexes/"
+        )
+        super().__init__(message)
+
+
+class InvalidRowCacheTable(PolyjuiceError):
+    def __init__(self, table: Table) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            "The 'django_cache_ttl' option requires a table with a single primary key column.\n"
+            "Example: Table('potions', metadata, Column('id', Integer, primary_key=True), django_cache_ttl=60)"
+        )
+        super().__init__(message)
+
+
+class MissingDependency(PolyjuiceError):
+    def __init__(self, package: str, feature: str) -> None:
+        message = (
+            f"`{feature}` requires the `{package}` package.\n"
+            f"Example: pip install {package}"
+        )
+        super().__init__(message)
+
+
+class UnsupportedBulkOperation(PolyjuiceError):
+    def __init__(self, table: Table, operation: str, vendor: str) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            f"`{operation}` is not supported by the database vendor `{vendor}`.\n"
+            "You must use either: postgresql or sqlite."
+        )
+        super().__init__(message)
+
+
+class InvalidConflictTarget(PolyjuiceError):
+    def __init__(self, table: Table, names: Sequence[str]) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            f"The columns {list(names)} are not covered by a unique index of this table.\n"
+            "The conflict target of `bulk_upsert` must be the primary key, a unique column, "
+            "a `UniqueConstraint` or a unique `Index` without condition."
+        )
+        super().__init__(message)
+
+
+class InvalidIdAllocationTable(PolyjuiceError):
+    def __init__(self, table: Table) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            "Primary keys can only be allocated for a table with a single integer primary key column.\n"
+            "Example: Table('potions', metadata, Column('id', Integer, primary_key=True))"
+        )
+        super().__init__(message)
+
+
+class NullableOrderingField(PolyjuiceError):
+    def __init__(self, table: Table, name: str) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            f"Rows cannot be paginated by `{name}`, which is nullable.\n"
+            "Keyset pagination requires an ordering on columns defined with `nullable=False`."
+        )
+        super().__init__(message)
+
+
+class UnindexedOrdering(PolyjuiceError):
+    def __init__(self, table: Table, order_by: Sequence[str]) -> None:
+        message = (
+            f"Table `{table.name}`: \n"
+            f"No index covers the ordering {list(order_by)}.\n"
+            "Keyset pagination requires an index whose first columns are the ordering columns, "
+            "in the same or in the opposite directions."
+        )
+        super().__init__(message)
+
+
+class UnindexedOrderingWarning(UserWarning):
+    pass
+
+
+class InvalidCursor(PolyjuiceError):
+    def __init__(self, cursor: str) -> None:
+        message = (
+            f"`{cursor}` is not a cursor of this ordering.\n"
+            "Cursors must be the `next_cursor` of a page paginated with the same `order_by`."
+        )
+        super().__init__(message)
@@ -3,7 +3,9 @@ from polyjuice import errors, options, related_fields
 from sqlalchemy import Column, Table, types
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql import sqltypes
-from typing import Tuple, Union
+from typing import Callable, Dict, Optional, Tuple, Type, Union
+
+Converter = Callable[[Table, Column, dict], models.Field]
 
 
 def to_django_field(table: Table, column: Column) -> Tuple[str, models.Field]:
@@ -15,29 +17,14 @@ def to_django_field(table: Table, column: Column) -> Tuple[str, models.Field]:
     else:
         column_name = column.name
 
-    column_type = column.type
-    if isinstance(column_type, sqltypes.SmallInteger):
-        field = _to_small_integer_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.BigInteger):
-        field = _to_big_integer_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.Boolean):
-        field = _to_boolean_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.Integer):
-        field = _to_integer_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.Text):
-        field = _to_text_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.String):
-        field = _to_char_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.Float):
-        field = _to_float_field(table, column, _options)
-    elif isinstance(column_type, postgresql.UUID):
-        field = _to_uuid_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.Numeric):
-        field = _to_decimal_field(table, column, _options)
-    elif isinstance(column_type, sqltypes.Date):
-        field = _to_date_field(table, column, _options)
-    else:
-        raise errors.PolyjuiceError("Case not covered yet")
+    # Keep the Django field bound to the table column when Django would name it differently.
+    if column_name != column.name or column.foreign_keys:
+        _options.setdefault("db_column", column.name)
+
+    converter = get_converter(column.type)
+    if converter is None:
+        raise errors.UnsupportedColumnType(table, column)
+    field = converter(table, column, _options)
 
     return (column_name, field)
 
@@ -117,3 +104,51 @@ def _to_decimal_field(table: Table, column: Column, options) -> models.DecimalFi
 
 def _to_date_field(table: Table, column: Column, options) -> models.DateField:
     return models.DateField(**options)
+
+
+# Maps SQLAlchemy types to the function converting their columns to Django fields.
+# The converter of a column is the one registered for the closest class in the MRO of its type.
+CONVERTERS: Dict[Type[types.TypeEngine], Converter] = {
+    sqltypes.SmallInteger: _to_small_integer_field,
+    sqltypes.BigInteger: _to_big_integer_field,
+    sqltypes.Boolean: _to_boolean_field,
+    sqltypes.Integer: _to_integer_field,
+    sqltypes.Text: _to_text_field,
+    sqltypes.String: _to_char_field,
+    sqltypes.Float: _to_float_field,
+    postgresql.UUID: _to_uuid_field,
+    sqltypes.Numeric: _to_decimal_field,
+    sqltypes.Date: _to_date_field,
+}
+
+# Converter resolved for each type class, to walk its MRO only once.
+_resolved_converters: Dict[type, Optional[Converter]] = {}
+
+
+def register_converter(
+    type_class: Type[types.TypeEngine], converter: Converter
+) -> None:
+    CONVERTERS[type_class] = converter
+    _resolved_converters.clear()
+
+
+def get_converter(column_type: types.TypeEngine) -> Optional[Converter]:
+    converter = _resolve_converter(type(column_type))
+    if converter is None and isinstance(column_type, types.TypeDecorator):
+        # Unless registered on its own, a TypeDecorator is converted like the type it decorates.
+        converter = _resolve_converter(type(column_type.impl))
+    return converter
+
+
+def _resolve_converter(type_class: type) -> Optional[Converter]:
+    try:
+        return _resolved_converters[type_class]
+    except KeyError:
+        pass
+
+    converter = next(
+        (CONVERTERS[klass] for klass in type_class.__mro__ if klass in CONVERTERS),
+        None,
+    )
+    _resolved_converters[type_class] = converter
+    return converter
@@ -0,0 +1,104 @@
+from django.db import connections, router
+from django.db.models.base import DEFERRED
+from polyjuice import errors, sql
+from sqlalchemy import Column
+from sqlalchemy.sql import ClauseElement
+from typing import Any, Dict, Hashable, List, Optional
+import weakref
+
+
+class HydrationPlan:
+    """
+    Where to find the value of each model field in the rows of a compiled select.
+
+    It is computed once per compiled statement, so that rows are turned into model
+    instances without matching column names for each row like `RawQuerySet` does.
+    """
+
+    def __init__(self, accessor, compiled: sql.CompiledStatement) -> None:
+        table_columns = set(accessor.table.columns)
+        positions: Dict[Column, int] = {}
+        self.annotations = []
+        for index, (key, _, objects, _) in enumerate(compiled.compiled._result_columns):
+            column = next((item for item in objects if item in table_columns), None)
+            if column is None:
+                column = accessor.columns_by_name.get(key)
+            if column is not None and column not in positions:
+                positions[column] = index
+            else:
+                # Extra columns, such as the result of a window function, are set as attributes.
+                self.annotations.append((key, index))
+
+        self.attnames = []
+        self.positions = []
+        for field in accessor.model._meta.concrete_fields:
+            column = accessor.get_column(field.attname)
+            self.attnames.append(field.attname)
+            self.positions.append(positions.get(column))
+
+        pk_attname = accessor.model._meta.pk.attname
+        if self.positions[self.attnames.index(pk_attname)] is None:
+            raise errors.MissingPrimaryKeyColumn(accessor.table)
+
+
+def from_select(
+    accessor,
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: Optional[str] = None,
+    cache_key: Optional[Hashable] = None,
+) -> List:
+    model = accessor.model
+    if using is None:
+        using = router.db_for_read(model)
+    connection = connections[using]
+    compiled = sql.get_compiled(statement, connection.vendor, cache_key)
+    plan = _get_plan(accessor, compiled)
+    parameters = compiled.get_parameters(statement, params)
+
+    with connection.cursor() as cursor:
+        cursor.execute(compiled.sql, parameters)
+        processors = compiled.get_result_processors(cursor.description)
+        rows = cursor.fetchall()
+
+    positions = plan.positions
+    field_processors = [
+        (index, processors[position])
+        for index, position in enumerate(positions)
+        if position is not None and processors[position] is not None
+    ]
+    annotations = [
+        (name, position, processors[position]) for name, position in plan.annotations
+    ]
+
+    from_db = model.from_db
+    attnames = plan.attnames
+    instances = []
+    for row in rows:
+        values = [
+            DEFERRED if position is None else row[position] for position in positions
+        ]
+        for index, process in field_processors:
+            values[index] = process(values[index])
+
+        instance = from_db(using, attnames, values)
+        for name, position, process in annotations:
+            value = row[position]
+            setattr(instance, name, process(value) if process is not None else value)
+        instances.append(instance)
+
+    return instances
+
+
+# Plans are kept as long as their compiled statement is in the compiled statements cache.
+_plans: "weakref.WeakKeyDictionary[sql.CompiledStatement, Dict[Any, HydrationPlan]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_plan(accessor, compiled: sql.CompiledStatement) -> HydrationPlan:
+    plans = _plans.setdefault(compiled, {})
+    plan = plans.get(accessor.model)
+    if plan is None:
+        plan = plans[accessor.model] = HydrationPlan(accessor, compiled)
+    return plan
@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python 3.6: each thread gets its own identity map.
+
+    class ContextVar:  # type: ignore
+        def __init__(self, name: str, default=None) -> None:
+            self._default = default
+            self._local = threading.local()
+
+        def get(self):
+            return getattr(self._local, "value", self._default)
+
+        def set(self, value):
+            token = self.get()
+            self._local.value = value
+            return token
+
+        def reset(self, token) -> None:
+            self._local.value = token
+
+
+# Within `with polyjuice.identity_map():`, the first instance loaded for each row of a polyjuice
+# table is kept, like in a SQLAlchemy Session: `Model.objects.get(pk=...)` and foreign keys
+# return it without querying the database again.
+#
+# Rows read again while the block is active are not loaded into new instances: querysets
+# return the instance already mapped to each row, with its current values.
+#
+# The identity map is bound to the current context, so each thread or asyncio task entering
+# the context manager gets its own.
+#
+# Example:
+# with polyjuice.identity_map():
+#     potion = Potion.objects.get(pk=1)
+#     assert potion.made_by is Professor.objects.get(pk=potion.made_by_id)
+
+IdentityKey = Tuple[str, Any, Any]
+
+_current_map: ContextVar = ContextVar("polyjuice_identity_map", default=None)
+
+
+@contextmanager
+def identity_map() -> Iterator[Dict[IdentityKey, Any]]:
+    instances = _current_map.get()
+    if instances is not None:
+        # Nested blocks share the identity map of the outermost one.
+        yield instances
+        return
+
+    token = _current_map.set({})
+    try:
+        yield _current_map.get()
+    finally:
+        _current_map.reset(token)
+
+
+def is_active() -> bool:
+    return _current_map.get() is not None
+
+
+def get(using: str, django_model, pk) -> Optional[Any]:
+    instances = _current_map.get()
+    if instances is None:
+        return None
+
+    key = _get_key(using, django_model, pk)
+    instance = instances.get(key)
+    if instance is not None and instance.pk != pk:
+        # The instance was deleted, or its primary key changed.
+        del instances[key]
+        return None
+    return instance
+
+
+def get_loaded(using: str, django_model, field_names, values) -> Optional[Any]:
+    """
+    Instance of the current identity map for a row read from the database, which `from_db`
+    returns instead of a new instance: the values of the row do not overwrite it.
+    """
+    if _current_map.get() is None:
+        return None
+    try:
+        pk = values[field_names.index(django_model._meta.pk.attname)]
+    except ValueError:
+        return None
+    return get(using, django_model, pk)
+
+
+@contextmanager
+def suspended() -> Iterator[None]:
+    # Rows read in the block are loaded as new instances, ex: to refresh a mapped instance.
+    token = _current_map.set(None)
+    try:
+        yield
+    finally:
+        _current_map.reset(token)
+
+
+def add(using: str, instance) -> None:
+    # The instance already loaded for the same row is kept.
+    instances = _current_map.get()
+    if instances is None or instance.pk is None:
+        return
+
+    key = _get_key(using, type(instance), instance.pk)
+    loaded_instance = instances.get(key)
+    if loaded_instance is None or loaded_instance.pk != instance.pk:
+        instances[key] = instance
+
+
+def _get_key(using: str, django_model, pk) -> IdentityKey:
+    return (using, getattr(django_model, "__table__", django_model), pk)
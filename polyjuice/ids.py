@@ -0,0 +1,163 @@
+from django.db import connections, IntegrityError, router, transaction
+from polyjuice import bulk, errors
+from sqlalchemy import Integer, Sequence, Table
+import threading
+from typing import Iterable, List, Optional, Set
+
+# Reserves primary keys of polyjuice models before inserting their rows, so that
+# the rows of related tables can be inserted right after, without reading them back.
+#
+# Example:
+# potions = Potion.polyjuice.bulk_create(Potion(name=name) for name in potion_names)
+# Ingredient.polyjuice.bulk_insert({"potion": potion.id, ...} for potion in potions)
+#
+# On PostgreSQL, ids are taken from the sequence of the primary key column.
+# Other backends have no sequences: the next id of each table is kept in the
+# `polyjuice_id_allocator` table, created on first use (hi/lo allocation).
+
+ALLOCATOR_TABLE = "polyjuice_id_allocator"
+
+_allocator_tables: Set[str] = set()
+_allocator_tables_lock = threading.Lock()
+
+
+def allocate_ids(accessor, count: int, using: Optional[str] = None) -> List[int]:
+    """
+    Reserves `count` primary keys of the table of a polyjuice model, in ascending order.
+    Concurrent allocations never return the same id.
+    """
+    table = accessor.table
+    columns = list(table.primary_key.columns)
+    if len(columns) != 1 or not isinstance(columns[0].type, Integer):
+        raise errors.InvalidIdAllocationTable(table)
+    if count <= 0:
+        return []
+
+    if using is None:
+        using = router.db_for_write(accessor.model)
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        return _allocate_from_sequence(connection, table, count)
+    return _allocate_from_allocator_table(using, table, count)
+
+
+def bulk_create(
+    accessor,
+    objs: Iterable,
+    batch_size: Optional[int] = None,
+    using: Optional[str] = None,
+) -> List:
+    """
+    `QuerySet.bulk_create`, which first assigns the allocated primary keys
+    to the instances without one, on every backend.
+    """
+    objs = list(objs)
+    if using is None:
+        using = router.db_for_write(accessor.model)
+
+    missing_pk = [obj for obj in objs if obj.pk is None]
+    for obj, pk in zip(missing_pk, allocate_ids(accessor, len(missing_pk), using)):
+        obj.pk = pk
+    return accessor.model._default_manager.db_manager(using).bulk_create(
+        objs, batch_size
+    )
+
+
+def _allocate_from_sequence(connection, table: Table, count: int) -> List[int]:
+    (column,) = table.primary_key.columns
+    quote_name = connection.ops.quote_name
+    if isinstance(column.default, Sequence):
+        sequence = column.default
+        sequence_name = quote_name(sequence.name)
+        if sequence.schema:
+            sequence_name = f"{quote_name(sequence.schema)}.{sequence_name}"
+        sequence_sql, params = "%s", [sequence_name]
+    else:
+        sequence_sql = "pg_get_serial_sequence(%s, %s)"
+        params = [bulk.get_table_name(connection, table), column.name]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT nextval({sequence_sql}) FROM generate_series(1, %s)",
+            params + [count],
+        )
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def _allocate_from_allocator_table(using: str, table: Table, count: int) -> List[int]:
+    connection = connections[using]
+    _create_allocator_table(using)
+
+    quote_name = connection.ops.quote_name
+    allocator_name = quote_name(ALLOCATOR_TABLE)
+    (column,) = table.primary_key.columns
+    # Rows inserted without an allocated id move the next id of the table forward.
+    max_id_sql = (
+        f"(SELECT COALESCE(MAX({quote_name(column.name)}), 0) + 1 "
+        f"FROM {bulk.get_table_name(connection, table)})"
+    )
+
+    update_sql = (
+        f"UPDATE {allocator_name} SET next_id = CASE "
+        f"WHEN next_id < {max_id_sql} THEN {max_id_sql} + %s "
+        "ELSE next_id + %s END WHERE table_name = %s"
+    )
+
+    with transaction.atomic(using=using, savepoint=False):
+        with connection.cursor() as cursor:
+            cursor.execute(update_sql, [count, count, table.key])
+            if cursor.rowcount == 0:
+                try:
+                    with transaction.atomic(using=using):
+                        cursor.execute(
+                            f"INSERT INTO {allocator_name} (table_name, next_id) "
+                            f"SELECT %s, {max_id_sql} + %s",
+                            [table.key, count],
+                        )
+                except IntegrityError:
+                    # A concurrent first allocation of the table inserted its row first.
+                    cursor.execute(update_sql, [count, count, table.key])
+            cursor.execute(
+                f"SELECT next_id FROM {allocator_name} WHERE table_name = %s",
+                [table.key],
+            )
+            (next_id,) = cursor.fetchone()
+
+    return list(range(next_id - count, next_id))
+
+
+def _create_allocator_table(using: str) -> None:
+    if using in _allocator_tables:
+        return
+
+    connection = connections[using]
+    with _allocator_tables_lock:
+        if connection.features.can_rollback_ddl:
+            # Created in the transaction of the caller (ex: SQLite), which drops it on rollback.
+            _execute_create_allocator_table(connection)
+            if connection.in_atomic_block:
+                transaction.on_commit(lambda: _allocator_tables.add(using), using=using)
+            else:
+                _allocator_tables.add(using)
+            return
+
+        # DDL statements commit the current transaction on the other backends (ex: MySQL):
+        # the table is created on a connection of its own, the caller's being left as is.
+        database_wrapper = connection.__class__(connection.settings_dict, using)
+        try:
+            _execute_create_allocator_table(database_wrapper)
+        finally:
+            database_wrapper.close()
+        _allocator_tables.add(using)
+
+
+def _execute_create_allocator_table(connection) -> None:
+    with connection.cursor() as cursor:
+        if ALLOCATOR_TABLE in connection.introspection.table_names(cursor):
+            return
+        name_type = connection.data_types["CharField"] % {"max_length": 255}
+        id_type = connection.data_types["BigIntegerField"]
+        cursor.execute(
+            f"CREATE TABLE {connection.ops.quote_name(ALLOCATOR_TABLE)} ("
+            f"table_name {name_type} PRIMARY KEY, next_id {id_type} NOT NULL)"
+        )
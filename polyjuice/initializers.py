@@ -0,0 +1,74 @@
+from django.db import models
+from django.db.models.base import DEFERRED, ModelState
+from django.db.models.signals import post_init, pre_init
+from polyjuice import identity
+from typing import Callable, Type
+
+# Fast paths of `Model.__init__` and `Model.from_db` for the polyjuice models whose table
+# sets `django_fast_init=True`.
+#
+# The columns of a polyjuice model are known when it is built, so an instance created with a
+# value for every concrete field, in order, gets them assigned at once. Any other call, or any
+# `pre_init`/`post_init` receiver of the model, goes through the Django implementation.
+
+
+def build_init(django_model: Type[models.Model]) -> Callable:
+    attnames = [field.attname for field in django_model._meta.concrete_fields]
+    field_count = len(attnames)
+    model_init = models.Model.__init__
+
+    def __init__(self, *args, **kwargs):
+        if (
+            kwargs
+            or len(args) != field_count
+            or any(arg is DEFERRED for arg in args)
+            or _has_init_receivers(type(self))
+        ):
+            model_init(self, *args, **kwargs)
+            return
+
+        self._state = ModelState()
+        self.__dict__.update(zip(attnames, args))
+
+    __init__.__qualname__ = f"{django_model.__qualname__}.__init__"
+    return __init__
+
+
+def build_from_db(django_model: Type[models.Model]) -> classmethod:
+    attnames = [field.attname for field in django_model._meta.concrete_fields]
+    field_count = len(attnames)
+    model_from_db = models.Model.from_db.__func__
+
+    def from_db(cls, db, field_names, values):
+        instance = identity.get_loaded(db, cls, field_names, values)
+        if instance is not None:
+            return instance
+
+        if (
+            cls is not django_model
+            or len(values) != field_count
+            or field_names != attnames
+            or any(value is DEFERRED for value in values)
+            or _has_init_receivers(cls)
+        ):
+            instance = model_from_db(cls, db, field_names, values)
+        else:
+            instance = cls.__new__(cls)
+            state = instance._state = ModelState()
+            state.adding = False
+            state.db = db
+            instance.__dict__.update(zip(attnames, values))
+
+        # Instances loaded from the database are registered in the current identity map.
+        identity.add(db, instance)
+        return instance
+
+    from_db.__qualname__ = f"{django_model.__qualname__}.from_db"
+    return classmethod(from_db)
+
+
+def _has_init_receivers(django_model: Type[models.Model]) -> bool:
+    # Most projects never connect any of these signals, which is cheaper to check first.
+    if not pre_init.receivers and not post_init.receivers:
+        return False
+    return pre_init.has_listeners(django_model) or post_init.has_listeners(django_model)
@@ -0,0 +1,57 @@
+from sqlalchemy import Table
+import threading
+from typing import Callable, List, Type
+
+# Models decorated with `polyjuice.model(lazy=True)` that are not built yet.
+_pending: List["LazyModel"] = []
+
+# Reentrant, as building a model can build the lazy models it is related to.
+_lock = threading.RLock()
+
+
+class LazyModel:
+    """
+    Stands for a Django model until it is actually needed.
+
+    The SQLAlchemy table is available right away as `__table__`, whereas the
+    Django model is built on first attribute access, on instantiation, or when
+    the app registry is ready if `polyjuice` is part of the INSTALLED_APPS.
+    """
+
+    def __init__(self, name: str, table: Table, build: Callable[[], Type]) -> None:
+        self.__name__ = name
+        self.__table__ = table
+        self._build = build
+        self._model = None
+        _pending.append(self)
+
+    def materialize(self) -> Type:
+        with _lock:
+            if self._model is None:
+                self._model = self._build()
+                _pending.remove(self)
+        return self._model
+
+    def __getattr__(self, name: str):
+        # Only called for attributes that are not defined on the proxy itself.
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.materialize()(*args, **kwargs)
+
+    def __instancecheck__(self, instance) -> bool:
+        return isinstance(instance, self.materialize())
+
+    def __subclasscheck__(self, subclass) -> bool:
+        return issubclass(subclass, self.materialize())
+
+    def __repr__(self) -> str:
+        state = "built" if self._model is not None else "not built yet"
+        return f"<LazyModel {self.__name__} ({state})>"
+
+
+def materialize_all() -> None:
+    for lazy_model in list(_pending):
+        lazy_model.materialize()
@@ -0,0 +1,151 @@
+from django.core.exceptions import ValidationError
+from django.db import connections, models, router
+from django.db.models.fields import related_descriptors
+import functools
+from polyjuice import identity, query_cache, row_cache
+from typing import List, Optional
+
+
+class PolyjuiceQuerySet(models.QuerySet):
+    def rows(self) -> List:
+        """
+        Returns the rows of the queryset as `Model.Row` records, built from the values
+        of the cursor without creating any model instance.
+        """
+        row_class = self.model.Row
+        queryset = self.values_list(*row_class._fields)
+        compiler = queryset.query.get_compiler(using=queryset.db)
+        return [row_class(*values) for values in compiler.results_iter()]
+
+    def update(self, **kwargs):
+        using = self._db or router.db_for_write(self.model, **self._hints)
+        pks = self._get_cached_primary_keys(using)
+        rows = super().update(**kwargs)
+        self._invalidate_caches(using, pks)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        objs = super().bulk_create(objs, batch_size, ignore_conflicts)
+        query_cache.invalidate([self.model.__table__], self.db)
+        return objs
+
+    def _raw_delete(self, using):
+        # Used by `delete()` for the rows deleted without sending signals.
+        pks = self._get_cached_primary_keys(using)
+        deleted = super()._raw_delete(using)
+        self._invalidate_caches(using, pks)
+        return deleted
+
+    _raw_delete.alters_data = True
+
+    def _get_cached_primary_keys(self, using: str) -> Optional[List]:
+        # Rows shared in a Django cache can only be deleted by primary key.
+        cache = row_cache.get_row_cache(self.model.__table__)
+        if cache is None or cache.backend is None:
+            return None
+        return list(self.using(using).values_list("pk", flat=True))
+
+    def _invalidate_caches(self, using: str, pks: Optional[List]) -> None:
+        row_cache.invalidate_table(self.model.__table__, using, pks)
+        query_cache.invalidate([self.model.__table__], using)
+
+
+class PolyjuiceManager(models.manager.BaseManager.from_queryset(PolyjuiceQuerySet)):
+    """
+    Default manager of polyjuice models: `get()` lookups by primary key return the
+    instance of the current identity map without querying the database.
+    """
+
+    def get(self, *args, **kwargs):
+        pk = self._get_primary_key(args, kwargs)
+        if pk is None:
+            return super().get(*args, **kwargs)
+
+        using = self._db or router.db_for_read(self.model)
+        instance = identity.get(using, self.model, pk)
+        if instance is not None:
+            return instance
+        return self._get_by_primary_key(using, pk, args, kwargs)
+
+    def _get_by_primary_key(self, using: str, pk, args, kwargs):
+        return super().get(*args, **kwargs)
+
+    def _get_primary_key(self, args, kwargs):
+        if args or len(kwargs) != 1:
+            return None
+
+        pk_field = self.model._meta.pk
+        ((lookup, value),) = kwargs.items()
+        if lookup.endswith("__exact"):
+            lookup = lookup[: -len("__exact")]
+        if lookup not in ("pk", pk_field.name, pk_field.attname):
+            return None
+
+        try:
+            return pk_field.to_python(value)
+        except (ValidationError, TypeError):
+            # Invalid values are reported by the regular lookup.
+            return None
+
+
+class RowCacheManager(PolyjuiceManager):
+    """
+    Default manager of the models whose table sets `django_cache_ttl`:
+    `get()` lookups by primary key are served by the row cache of the table.
+    """
+
+    def _get_by_primary_key(self, using: str, pk, args, kwargs):
+        cache = row_cache.get_row_cache(self.model.__table__)
+        concrete_fields = self.model._meta.concrete_fields
+        values = cache.get(using, pk)
+        if values is not None:
+            attnames = [field.attname for field in concrete_fields]
+            return self.model.from_db(using, attnames, list(values))
+
+        instance = super()._get_by_primary_key(using, pk, args, kwargs)
+        # Rows read inside a transaction could include writes which are rolled back.
+        if not connections[using].in_atomic_block:
+            cache.set(
+                using,
+                pk,
+                [getattr(instance, field.attname) for field in concrete_fields],
+            )
+        return instance
+
+
+class ForwardManyToOneDescriptor(related_descriptors.ForwardManyToOneDescriptor):
+    """Foreign keys of polyjuice models first look for their target in the identity map."""
+
+    def get_object(self, instance):
+        if identity.is_active() and self.field.target_field.primary_key:
+            related_model = self.field.remote_field.model
+            using = instance._state.db or router.db_for_read(
+                related_model, instance=instance
+            )
+            value = getattr(instance, self.field.attname)
+            related_instance = identity.get(using, related_model, value)
+            if related_instance is not None:
+                return related_instance
+        return super().get_object(instance)
+
+
+@classmethod
+def from_db(cls, db, field_names, values):
+    # Instances loaded from the database are registered in the current identity map.
+    instance = identity.get_loaded(db, cls, field_names, values)
+    if instance is None:
+        instance = models.Model.from_db.__func__(cls, db, field_names, values)
+        identity.add(db, instance)
+    return instance
+
+
+def wrap_refresh_from_db(refresh_from_db):
+    # The values are read into a new instance, instead of the mapped instance being refreshed.
+    @functools.wraps(refresh_from_db)
+    def refresh_from_db_outside_of_the_identity_map(self, using=None, fields=None):
+        with identity.suspended():
+            refresh_from_db(self, using, fields)
+
+    return refresh_from_db_outside_of_the_identity_map
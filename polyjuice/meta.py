@@ -1,8 +1,15 @@
 from django.db import models
-from .errors import InvalidIndexDefinition, PolyjuiceError, UnsupportedFunctionalIndex
-from sqlalchemy import Column, Index, Table
+from .errors import (
+    InvalidIndexDefinition,
+    PolyjuiceError,
+    UnsupportedFunctionalIndex,
+    UnsupportedIndexOption,
+)
+from . import options
+from sqlalchemy import Column, Index, Table, UniqueConstraint
+from sqlalchemy.sql import elements, operators
 from sqlalchemy.sql.expression import UnaryExpression
-from typing import List
+from typing import FrozenSet, List, NamedTuple, Set, Type
 
 
 def build_meta_class(table: Table, user_defined_meta=None):
@@ -22,31 +29,231 @@ def build_meta_class(table: Table, user_defined_meta=None):
     if user_defined_meta and hasattr(user_defined_meta, "indexes"):
         raise PolyjuiceError("You cannot override Meta.indexes field.")
 
+    for name, value in vars(user_defined_meta).items():
+        if not name.startswith("__"):
+            setattr(Meta, name, value)
+
     return Meta
 
 
+class UnsupportedIndex(NamedTuple):
+    index: Index
+    reason: str
+
+
+# Django index class of each PostgreSQL index method, ie: `Index(..., postgresql_using="gin")`
+INDEX_CLASSES_BY_METHOD = {
+    "brin": "BrinIndex",
+    "btree": "BTreeIndex",
+    "gin": "GinIndex",
+    "gist": "GistIndex",
+    "hash": "HashIndex",
+    "spgist": "SpGistIndex",
+}
+
+# Django lookup of each SQLAlchemy comparison operator allowed in a partial index condition.
+CONDITION_LOOKUPS = {
+    operators.eq: "exact",
+    operators.lt: "lt",
+    operators.le: "lte",
+    operators.gt: "gt",
+    operators.ge: "gte",
+    operators.in_op: "in",
+}
+
+
 def get_indexes(table: Table) -> List[models.Index]:
-    return [convert_index(table, index) for index in table.indexes]
+    """
+    Converts the indexes of a table which Django can represent.
+    The other ones are listed by `get_unsupported_indexes`.
+    """
+    indexes = []
+    for index in _get_table_indexes(table):
+        try:
+            indexes.append(convert_index(table, index))
+        except (UnsupportedFunctionalIndex, UnsupportedIndexOption):
+            pass
+    return indexes
+
+
+def get_unsupported_indexes(table: Table) -> List[UnsupportedIndex]:
+    unsupported_indexes = []
+    for index in _get_table_indexes(table):
+        try:
+            convert_index(table, index)
+        except (UnsupportedFunctionalIndex, UnsupportedIndexOption) as error:
+            unsupported_indexes.append(UnsupportedIndex(index, error.args[0]))
+    return unsupported_indexes
 
 
 def convert_index(table: Table, index: Index) -> models.Index:
     fields = []
+    columns = []
     for expression in index.expressions:
         if isinstance(expression, Column):
-            field_name = expression.name
-        elif isinstance(expression, UnaryExpression):
-            field_name = expression.element.name
+            column = expression
+            field_name = options.get_field_name(column)
+        elif isinstance(expression, UnaryExpression) and isinstance(
+            expression.element, Column
+        ):
+            column = expression.element
+            field_name = options.get_field_name(column)
             modifier = expression.modifier
 
-            is_descending_index = modifier and modifier.__name__ == "desc_op"
-
-            if is_descending_index:
+            if modifier is operators.desc_op:
                 field_name = f"-{field_name}"
-            else:
+            elif modifier is not operators.asc_op:
                 raise InvalidIndexDefinition(table, index)
         else:
             raise UnsupportedFunctionalIndex(table, index)
 
         fields.append(field_name)
+        columns.append(column)
+
+    dialect_options = index.dialect_kwargs
+    # Covering indexes can only be declared from SQLAlchemy 1.4.
+    if dialect_options.get("postgresql_include"):
+        raise UnsupportedIndexOption(table, index, "postgresql_include")
+
+    index_options = {"fields": fields, "name": index.name}
+
+    operator_classes = dialect_options.get("postgresql_ops")
+    if operator_classes:
+        index_options["opclasses"] = [
+            operator_classes.get(column.key) or operator_classes.get(column.name) or ""
+            for column in columns
+        ]
+
+    for option in ("postgresql_where", "sqlite_where"):
+        condition = dialect_options.get(option)
+        if condition is not None:
+            try:
+                index_options["condition"] = _to_condition(condition)
+            except ValueError:
+                raise UnsupportedIndexOption(table, index, option)
+            break
+
+    index_class = _get_index_class(table, index)
+    return index_class(**index_options)
+
+
+def get_unique_keys(table: Table) -> Set[FrozenSet[Column]]:
+    """
+    Sets of columns whose values are unique in the table: the primary key, unique columns,
+    unique constraints and unique indexes. Partial unique indexes are left out.
+    """
+    unique_keys = set()
+    if table.primary_key.columns:
+        unique_keys.add(frozenset(table.primary_key.columns))
+    for column in table.columns:
+        if column.unique:
+            unique_keys.add(frozenset([column]))
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.columns:
+            unique_keys.add(frozenset(constraint.columns))
+    for index in table.indexes:
+        if not index.unique or any(
+            index.dialect_kwargs.get(option) is not None
+            for option in ("postgresql_where", "sqlite_where")
+        ):
+            continue
+        if all(isinstance(expression, Column) for expression in index.expressions):
+            unique_keys.add(frozenset(index.expressions))
+    return unique_keys
+
+
+def _get_table_indexes(table: Table) -> List[Index]:
+    # Indexes created by `Column(..., index=True)` are declared with `db_index` on the field.
+    return [
+        index
+        for index in sorted(table.indexes, key=lambda index: index.name or "")
+        if not index._column_flag
+    ]
+
+
+def _get_index_class(table: Table, index: Index) -> Type[models.Index]:
+    method = index.dialect_kwargs.get("postgresql_using")
+    if not method:
+        return models.Index
+
+    class_name = INDEX_CLASSES_BY_METHOD.get(method.lower())
+    if class_name is None:
+        raise UnsupportedIndexOption(table, index, "postgresql_using")
+
+    from django.contrib.postgres import indexes as postgres_indexes
+
+    return getattr(postgres_indexes, class_name)
+
+
+def _to_condition(clause) -> models.Q:
+    if isinstance(clause, Column):
+        return models.Q(**{options.get_field_name(clause): True})
+
+    if isinstance(clause, elements.BooleanClauseList):
+        conditions = [_to_condition(element) for element in clause.clauses]
+        combined = conditions[0]
+        for condition in conditions[1:]:
+            if clause.operator is operators.and_:
+                combined &= condition
+            elif clause.operator is operators.or_:
+                combined |= condition
+            else:
+                raise ValueError(clause)
+        return combined
+
+    # Boolean columns used as conditions, ie: `table.c.is_active` or `~table.c.is_active`
+    if isinstance(clause, elements.AsBoolean) and isinstance(clause.element, Column):
+        field_name = options.get_field_name(clause.element)
+        return models.Q(**{field_name: clause.operator is operators.istrue})
+
+    if isinstance(clause, UnaryExpression) and clause.operator is operators.inv:
+        return ~_to_condition(clause.element)
+
+    if isinstance(clause, elements.BinaryExpression) and isinstance(
+        clause.left, Column
+    ):
+        field_name = options.get_field_name(clause.left)
+        value = _to_value(clause.right)
+        if clause.operator in (operators.is_, operators.isnot) and value is None:
+            return models.Q(
+                **{f"{field_name}__isnull": clause.operator is operators.is_}
+            )
+        if clause.operator is operators.isnot:
+            # `IS NOT` is true for NULL, like the negation of Django.
+            return ~models.Q(**{field_name: value})
+        if clause.operator is operators.ne:
+            return _exclude_null(clause.left, ~models.Q(**{field_name: value}))
+        if clause.operator is operators.notin_op:
+            return _exclude_null(clause.left, ~models.Q(**{f"{field_name}__in": value}))
+        if clause.operator is operators.is_:
+            return models.Q(**{field_name: value})
+
+        lookup = CONDITION_LOOKUPS.get(clause.operator)
+        if lookup is not None:
+            return models.Q(**{f"{field_name}__{lookup}": value})
+
+    raise ValueError(clause)
+
+
+def _exclude_null(column: Column, condition: models.Q) -> models.Q:
+    # SQL comparisons are never true for NULL, whereas Django negates them as
+    # `NOT ("name" = 'V' AND "name" IS NOT NULL)`, which is true for NULL.
+    if not column.nullable:
+        return condition
+    return condition & models.Q(**{f"{options.get_field_name(column)}__isnull": False})
+
 
-    return models.Index(fields=fields, name=index.name)
+def _to_value(clause):
+    if isinstance(clause, elements.BindParameter):
+        return clause.effective_value
+    if isinstance(clause, elements.Null):
+        return None
+    if isinstance(clause, elements.True_):
+        return True
+    if isinstance(clause, elements.False_):
+        return False
+    if isinstance(clause, elements.Grouping):
+        return [_to_value(element) for element in clause.element.clauses]
+    if isinstance(clause, elements.ClauseList):
+        return [_to_value(element) for element in clause.clauses]
+    raise ValueError(clause)
@@ -32,6 +32,9 @@ def from_column(table: Table, column: Column):
     if unique is not None:
         options["unique"] = unique
 
+    if column.index:
+        options["db_index"] = True
+
     django_options = _get_django_specific_options(column)
     if not django_options:
         return options
@@ -44,6 +47,10 @@ def from_column(table: Table, column: Column):
     return options
 
 
+def get_field_name(column: Column) -> str:
+    return column.dialect_options["django"].get("field_name") or column.name
+
+
 def _get_django_specific_options(column):
     return {
         name: value
@@ -0,0 +1,210 @@
+import base64
+import datetime
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+import json
+from polyjuice import errors, meta
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import warnings
+
+# Keyset pagination of polyjuice models: each page is read after the ordering values of
+# the last row of the previous page, instead of skipping rows with an OFFSET.
+#
+# Example:
+# page = Potion.polyjuice.paginate(order_by=["-brewed_at"], limit=50)
+# next_page = Potion.polyjuice.paginate(order_by=["-brewed_at"], after=page.next_cursor, limit=50)
+
+
+class Page(NamedTuple):
+    items: List
+    # Cursor of the following page, `None` on the last page.
+    next_cursor: Optional[str]
+
+
+def paginate(
+    accessor,
+    order_by: Sequence[str],
+    after: Optional[str] = None,
+    limit: int = 100,
+    queryset: Optional[models.QuerySet] = None,
+    strict: bool = False,
+) -> Page:
+    # Warnings point at the caller of `Model.polyjuice.paginate`.
+    ordering = get_ordering(accessor, order_by, strict, stacklevel=4)
+    return _get_page(accessor, ordering, after, limit, queryset)
+
+
+def chunks(
+    accessor,
+    order_by: Sequence[str] = (),
+    chunk_size: int = 1000,
+    queryset: Optional[models.QuerySet] = None,
+    strict: bool = False,
+) -> Iterator[List]:
+    """
+    Yields every row of the queryset (all rows by default) as lists of `chunk_size` instances,
+    read by keyset pagination in the given ordering (primary key by default).
+    """
+    # The generator runs from the loop iterating over the chunks, where warnings point.
+    ordering = get_ordering(accessor, order_by, strict, stacklevel=3)
+    cursor = None
+    while True:
+        page = _get_page(accessor, ordering, cursor, chunk_size, queryset)
+        if page.items:
+            yield page.items
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
+
+
+def _get_page(
+    accessor,
+    ordering: List[Tuple[models.Field, bool]],
+    after: Optional[str],
+    limit: int,
+    queryset: Optional[models.QuerySet],
+) -> Page:
+    if queryset is None:
+        queryset = accessor.model._default_manager.all()
+    if after is not None:
+        queryset = queryset.filter(_seek(ordering, decode_cursor(ordering, after)))
+
+    # One more row tells whether there is a following page.
+    items = list(queryset.order_by(*_order_by(ordering))[: limit + 1])
+    if len(items) <= limit:
+        return Page(items, None)
+    items = items[:limit]
+    return Page(items, encode_cursor(ordering, items[-1]))
+
+
+def get_ordering(
+    accessor, order_by: Sequence[str], strict: bool = False, stacklevel: int = 2
+) -> List[Tuple[models.Field, bool]]:
+    """
+    Fields to sort on, with whether they are in descending order. The primary key is added
+    to the ordering when missing, so that the ordering values of each row are unique.
+    `stacklevel` is the one of the warning raised when no index covers the ordering.
+    """
+    ordering = []
+    for name in order_by:
+        descending = name.startswith("-")
+        name = name.lstrip("-")
+        field = (
+            accessor.model._meta.pk
+            if name == "pk"
+            else accessor.get_field(accessor.get_column(name))
+        )
+        if field.null:
+            raise errors.NullableOrderingField(accessor.table, field.name)
+        ordering.append((field, descending))
+
+    pk = accessor.model._meta.pk
+    if not any(field == pk for field, _ in ordering):
+        descending = ordering[-1][1] if ordering else False
+        ordering.append((pk, descending))
+
+    if not _is_indexed(accessor, ordering):
+        names = _order_by(ordering)
+        if strict:
+            raise errors.UnindexedOrdering(accessor.table, names)
+        warnings.warn(
+            f"Table `{accessor.table.name}`: no index covers the ordering {names}.",
+            errors.UnindexedOrderingWarning,
+            stacklevel=stacklevel,
+        )
+    return ordering
+
+
+def encode_cursor(ordering: List[Tuple[models.Field, bool]], instance) -> str:
+    cursor = {
+        "order_by": _order_by(ordering),
+        "values": [getattr(instance, field.attname) for field, _ in ordering],
+    }
+    serialized = json.dumps(cursor, cls=_CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(serialized.encode()).decode().rstrip("=")
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Django truncates microseconds, which would skip rows of the next page.
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def decode_cursor(ordering: List[Tuple[models.Field, bool]], cursor: str) -> List:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if decoded["order_by"] != _order_by(ordering):
+            raise ValueError(cursor)
+        if len(decoded["values"]) != len(ordering):
+            raise ValueError(cursor)
+        values = [
+            field.to_python(value)
+            for (field, _), value in zip(ordering, decoded["values"])
+        ]
+        # Ordering fields are not nullable, see `get_ordering`.
+        if any(value is None for value in values):
+            raise ValueError(cursor)
+        return values
+    except (TypeError, ValueError, KeyError, ValidationError):
+        raise errors.InvalidCursor(cursor)
+
+
+def _seek(ordering: List[Tuple[models.Field, bool]], values: List) -> models.Q:
+    # (a, b) after (x, y) is: a >= x AND (a > x OR (a = x AND b > y)), with < and <= for
+    # descending fields. The leading a >= x bounds the range read from the index.
+    condition = models.Q()
+    for position, (field, descending) in enumerate(ordering):
+        lookups = {
+            previous_field.attname: value
+            for (previous_field, _), value in zip(ordering[:position], values)
+        }
+        lookups[f"{field.attname}__{'lt' if descending else 'gt'}"] = values[position]
+        condition |= models.Q(**lookups)
+
+    if len(ordering) > 1:
+        first_field, descending = ordering[0]
+        bound = {f"{first_field.attname}__{'lte' if descending else 'gte'}": values[0]}
+        condition = models.Q(**bound) & condition
+    return condition
+
+
+def _order_by(ordering: List[Tuple[models.Field, bool]]) -> List[str]:
+    return [
+        f"-{field.attname}" if descending else field.attname
+        for field, descending in ordering
+    ]
+
+
+def _is_indexed(accessor, ordering: List[Tuple[models.Field, bool]]) -> bool:
+    # An index covers the ordering when the ordering fields, without the primary key
+    # appended to them, are the first fields of the index, read forward or backward.
+    pk = accessor.model._meta.pk
+    if ordering[-1][0] == pk:
+        ordering = ordering[:-1]
+    if not ordering:
+        return True
+
+    requested = [(field.name, descending) for field, descending in ordering]
+    reversed_requested = [(name, not descending) for name, descending in requested]
+    for fields in _get_indexed_fields(accessor):
+        prefix = fields[: len(requested)]
+        if prefix == requested or prefix == reversed_requested:
+            return True
+    return False
+
+
+def _get_indexed_fields(accessor) -> List[List[Tuple[str, bool]]]:
+    indexed_fields = [
+        [(name.lstrip("-"), name.startswith("-")) for name in index.fields]
+        for index in meta.get_indexes(accessor.table)
+        if getattr(index, "condition", None) is None
+    ]
+    # `Column(..., index=True)` and unique columns are indexed on their own.
+    for field in accessor.model._meta.concrete_fields:
+        if field.db_index or field.unique:
+            indexed_fields.append([(field.name, False)])
+    return indexed_fields
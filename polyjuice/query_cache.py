@@ -0,0 +1,225 @@
+from django.conf import settings
+from django.db import connections, transaction
+import hashlib
+from polyjuice import registry, sql
+from sqlalchemy import Table
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.sql import ClauseElement, visitors
+from sqlalchemy.sql.dml import UpdateBase
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+# Caches the results of SQLAlchemy Core selects in a Django cache backend.
+#
+# Each result is keyed by its SQL, its parameters and the generation of every table it reads:
+# any write on one of these tables through polyjuice (model save or delete, bulk operations,
+# Core DML statements) bumps the generation of the table, so stale results are never read again.
+#
+# Enabled by the `POLYJUICE_QUERY_CACHE` setting, which names the Django cache to use.
+#
+# Example:
+# POLYJUICE_QUERY_CACHE = "default"
+# result = polyjuice.query_cache.execute(select([potions]).where(potions.c.price > 10))
+
+# Default lifetime of a cached result, in seconds.
+DEFAULT_TIMEOUT = 300
+
+KEY_PREFIX = "polyjuice:query"
+GENERATION_KEY_PREFIX = "polyjuice:generation"
+
+# Referential actions of a foreign key which make the database write the referencing rows,
+# ie: ForeignKey("professors.id", ondelete="CASCADE"), used by `django_on_delete="DB_CASCADE"`.
+REFERENTIAL_ACTIONS = {"CASCADE", "SET NULL", "SET DEFAULT"}
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "POLYJUICE_QUERY_CACHE", None) is not None
+
+
+def get_cache():
+    from django.core.cache import caches
+
+    return caches[settings.POLYJUICE_QUERY_CACHE]
+
+
+def execute(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    cache_key: Optional[Hashable] = None,
+    timeout: Optional[int] = None,
+) -> "sql.Result":
+    """
+    Same as `polyjuice.execute`, but the results of selects are read from the query cache.
+
+    Results read inside a transaction are not stored: they could include uncommitted writes.
+    """
+    if not is_enabled() or isinstance(statement, UpdateBase):
+        return sql.execute(statement, params, using, cache_key)
+
+    connection = connections[using]
+    compiled = sql.get_compiled(statement, connection.vendor, cache_key)
+    parameters = compiled.get_parameters(statement, params)
+    cache = get_cache()
+    generations = _get_generations(cache, using, get_tables(statement))
+    key = _get_result_key(using, compiled.sql, parameters, generations)
+
+    cached = cache.get(key)
+    if cached is not None:
+        keys, rows, rowcount = cached
+        return sql.Result(keys, [compiled.record_class(*row) for row in rows], rowcount)
+
+    result = sql.execute(statement, params, using, cache_key)
+    if not connection.in_atomic_block:
+        rows = [tuple(record) for record in result.records]
+        cache.set(
+            key,
+            (result.keys, rows, result.rowcount),
+            (
+                getattr(settings, "POLYJUICE_QUERY_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+                if timeout is None
+                else timeout
+            ),
+        )
+    return result
+
+
+def invalidate(tables: Iterable[Table], using: str = "default") -> None:
+    """Makes stale every cached result reading one of the `tables` of the database `using`."""
+    if not is_enabled():
+        return
+
+    generation_keys = [
+        _get_generation_key(using, table) for table in get_written_tables(tables)
+    ]
+    _bump(generation_keys)
+    # Results cached by other connections before the commit must not outlive it.
+    if connections[using].in_atomic_block:
+        transaction.on_commit(lambda: _bump(generation_keys), using=using)
+
+
+def connect_signals(django_model) -> None:
+    from django.db.models import signals
+
+    signals.post_save.connect(_invalidate_instance, sender=django_model)
+    signals.post_delete.connect(_invalidate_instance, sender=django_model)
+
+
+def get_tables(statement: ClauseElement) -> List[Table]:
+    tables = {
+        element.key: element
+        for element in visitors.iterate(statement, {})
+        if isinstance(element, Table)
+    }
+    return [tables[key] for key in sorted(tables)]
+
+
+def get_written_tables(tables: Iterable[Table]) -> List[Table]:
+    """
+    The `tables`, and the tables whose rows the database deletes or updates along with
+    theirs through the `ON DELETE`/`ON UPDATE` actions of their foreign keys.
+    """
+    return _walk_tables(tables, _get_referencing_tables)
+
+
+def get_writing_tables(tables: Iterable[Table]) -> List[Table]:
+    """
+    The `tables`, and the tables whose deleted or updated rows make the database write
+    theirs, the reverse of `get_written_tables`.
+    """
+    return _walk_tables(tables, _get_referenced_tables)
+
+
+def _walk_tables(
+    tables: Iterable[Table], get_next_tables: Callable[[Table], List[Table]]
+) -> List[Table]:
+    walked_tables = {}
+    pending = list(tables)
+    while pending:
+        table = pending.pop()
+        if table in walked_tables:
+            continue
+        walked_tables[table] = table
+        pending.extend(get_next_tables(table))
+    return list(walked_tables)
+
+
+def _get_referencing_tables(table: Table) -> List[Table]:
+    if table.metadata is None:
+        return []
+
+    referencing_tables = []
+    for other_table in table.metadata.tables.values():
+        for foreign_key in other_table.foreign_keys:
+            if _get_cascading_table(foreign_key) is table:
+                referencing_tables.append(other_table)
+                break
+    return referencing_tables
+
+
+def _get_referenced_tables(table: Table) -> List[Table]:
+    referenced_tables = [
+        _get_cascading_table(foreign_key) for foreign_key in table.foreign_keys
+    ]
+    return [
+        referenced_table
+        for referenced_table in referenced_tables
+        if referenced_table is not None
+    ]
+
+
+def _get_cascading_table(foreign_key) -> Optional[Table]:
+    # The referenced table, when writing its rows makes the database write the rows
+    # referencing them.
+    actions = {
+        (foreign_key.ondelete or "").upper(),
+        (foreign_key.onupdate or "").upper(),
+    }
+    if not actions & REFERENTIAL_ACTIONS:
+        return None
+    try:
+        return foreign_key.column.table
+    except InvalidRequestError:
+        # The referenced table is not declared yet.
+        return None
+
+
+def _invalidate_instance(sender, using: str, **kwargs) -> None:
+    table = registry.get_table_for_model(sender)
+    if table is not None:
+        invalidate([table], using)
+
+
+def _get_generations(cache, using: str, tables: List[Table]) -> List[int]:
+    generation_keys = [_get_generation_key(using, table) for table in tables]
+    generations = cache.get_many(generation_keys)
+    for generation_key in generation_keys:
+        if generation_key not in generations:
+            cache.add(generation_key, _new_generation(), None)
+            generations[generation_key] = cache.get(generation_key)
+    return [generations[generation_key] for generation_key in generation_keys]
+
+
+def _bump(generation_keys: List[str]) -> None:
+    cache = get_cache()
+    for generation_key in generation_keys:
+        try:
+            cache.incr(generation_key)
+        except ValueError:
+            # The generation is missing: any new one differs from the evicted one.
+            cache.add(generation_key, _new_generation(), None)
+
+
+def _new_generation() -> int:
+    return int(time.time() * 1_000_000)
+
+
+def _get_generation_key(using: str, table: Table) -> str:
+    return f"{GENERATION_KEY_PREFIX}:{using}:{table.key}"
+
+
+def _get_result_key(
+    using: str, sql_string: str, parameters: List[Any], generations: List[int]
+) -> str:
+    description = repr((using, sql_string, parameters, generations))
+    return f"{KEY_PREFIX}:{hashlib.sha256(description.encode()).hexdigest()}"
@@ -0,0 +1,43 @@
+from sqlalchemy import Table
+from typing import Dict, Optional, Type, Union
+
+# Keeps track of the Django model generated for each SQLAlchemy table.
+#
+# Tables are looked up by identity first: two `MetaData` can hold tables with
+# the same key, whereas a table key only identifies the last model registered
+# for it.
+_models_by_table: Dict[Table, Type] = {}
+_models_by_table_key: Dict[str, Type] = {}
+_tables_by_model: Dict[Type, Table] = {}
+
+
+def register(table: Table, django_model: Type) -> None:
+    _models_by_table[table] = django_model
+    _models_by_table_key[table.key] = django_model
+    _tables_by_model[django_model] = table
+
+
+def unregister(table: Table) -> None:
+    django_model = _models_by_table.pop(table, None)
+    if django_model is None:
+        return
+
+    _tables_by_model.pop(django_model, None)
+    if _models_by_table_key.get(table.key) is django_model:
+        del _models_by_table_key[table.key]
+
+
+def get_model_for_table(table: Union[Table, str]) -> Optional[Type]:
+    if isinstance(table, Table):
+        return _models_by_table.get(table)
+    return _models_by_table_key.get(table)
+
+
+def get_table_for_model(django_model: Type) -> Optional[Table]:
+    return _tables_by_model.get(django_model)
+
+
+def clear() -> None:
+    _models_by_table.clear()
+    _models_by_table_key.clear()
+    _tables_by_model.clear()
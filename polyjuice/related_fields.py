@@ -1,7 +1,9 @@
 from django.db import models
-from polyjuice import errors
-from sqlalchemy import Column, Table
-
+from polyjuice import errors, registry
+from polyjuice.lazy import LazyModel
+from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy.exc import InvalidRequestError
+from typing import Optional, Type
 
 # Cf: https://docs.djangoproject.com/en/2.2/ref/models/fields/#django.db.models.ForeignKey.on_delete
 # TODO: Manage 'SET'
@@ -13,22 +15,54 @@ ON_DELETE_MAP = {
     "DO_NOTHING": models.DO_NOTHING,
 }
 
+# Deletions handled by the `ON DELETE` clause of the SQLAlchemy ForeignKey, ie:
+# ForeignKey("professors.id", ondelete="CASCADE"), django_on_delete="DB_CASCADE"
+# Django does not collect the related rows in Python: the database deletes or updates them.
+DB_ON_DELETE_MAP = {
+    "DB_CASCADE": "CASCADE",
+    "DB_SET_NULL": "SET NULL",
+}
+
 
 def to_foreign_key(table: Table, column: Column, options) -> models.ForeignKey:
+    foreign_key = list(column.foreign_keys)[0]
     if "related_model" in options:
-        related_model_path = options.pop("related_model")
+        related_model = options.pop("related_model")
     else:
-        foreign_key = list(column.foreign_keys)[0]
+        related_model = _get_registered_model(foreign_key)
+
+    if related_model is None:
         related_table_name = foreign_key._table_key()
-        related_model_path = related_table_name.replace("__", ".")
+        related_model = related_table_name.replace("__", ".")
 
     if "on_delete" not in options:
         raise errors.MissingOnDeleteOption(table, column)
 
     on_delete = options["on_delete"]
+    if on_delete in DB_ON_DELETE_MAP:
+        expected_ondelete = DB_ON_DELETE_MAP[on_delete]
+        if (foreign_key.ondelete or "").upper() != expected_ondelete:
+            raise errors.MissingDatabaseOnDelete(table, column, on_delete)
+        if on_delete == "DB_SET_NULL" and not column.nullable:
+            raise errors.NotNullableDatabaseSetNull(table, column)
+        options["on_delete"] = models.DO_NOTHING
+        return models.ForeignKey(related_model, **options)
+
     try:
         options["on_delete"] = ON_DELETE_MAP[on_delete]
     except KeyError:
         raise errors.InvalidOnDeleteOption(table, column, on_delete)
 
-    return models.ForeignKey(related_model_path, **options)
+    return models.ForeignKey(related_model, **options)
+
+
+def _get_registered_model(foreign_key: ForeignKey) -> Optional[Type[models.Model]]:
+    try:
+        related_table = foreign_key.column.table
+    except InvalidRequestError:
+        # The related table is not declared yet, or the column is not attached to a table.
+        return None
+    related_model = registry.get_model_for_table(related_table)
+    if isinstance(related_model, LazyModel):
+        related_model = related_model.materialize()
+    return related_model
@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from django.db import connections, transaction
+from polyjuice import errors, query_cache, registry
+from polyjuice.lazy import LazyModel
+from sqlalchemy import Table
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Caches the rows of polyjuice models looked up by primary key, ie: `Potion.objects.get(pk=1)`.
+#
+# Enabled per table with the `django_cache_ttl` option, in seconds:
+# Table("potions", metadata, ..., django_cache_ttl=60, django_cache_backend="default")
+#
+# Rows are kept in a local LRU of `django_cache_size` rows per table, and in the Django cache
+# named by `django_cache_backend` when provided, so that they are shared between processes.
+
+DEFAULT_MAX_SIZE = 1000
+
+KEY_PREFIX = "polyjuice:row"
+
+_row_caches: Dict[Table, "RowCache"] = {}
+
+
+class RowCache:
+    def __init__(
+        self,
+        table: Table,
+        ttl: float,
+        max_size: int = DEFAULT_MAX_SIZE,
+        backend: Optional[str] = None,
+    ) -> None:
+        self.table = table
+        self.ttl = ttl
+        self.max_size = max_size
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._rows: "OrderedDict[Tuple[str, Any], Tuple[float, List]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, using: str, pk) -> Optional[List]:
+        key = (using, pk)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is not None:
+                expires_at, values = entry
+                if expires_at > now:
+                    self._rows.move_to_end(key)
+                    self.hits += 1
+                    return values
+                del self._rows[key]
+
+        if self.backend is not None:
+            values = self._get_backend().get(self._get_backend_key(using, pk))
+            if values is not None:
+                self._store_locally(key, values)
+                with self._lock:
+                    self.hits += 1
+                return values
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, using: str, pk, values: List) -> None:
+        self._store_locally((using, pk), values)
+        if self.backend is not None:
+            self._get_backend().set(self._get_backend_key(using, pk), values, self.ttl)
+
+    def delete(self, using: str, pk) -> None:
+        with self._lock:
+            self._rows.pop((using, pk), None)
+        if self.backend is not None:
+            self._get_backend().delete(self._get_backend_key(using, pk))
+
+    def clear(self) -> None:
+        """Empties the local LRU: rows of the Django cache expire after the TTL."""
+        with self._lock:
+            self._rows.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._rows)}
+
+    def _store_locally(self, key: Tuple[str, Any], values: List) -> None:
+        with self._lock:
+            self._rows[key] = (time.monotonic() + self.ttl, values)
+            self._rows.move_to_end(key)
+            if len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+
+    def _get_backend(self):
+        from django.core.cache import caches
+
+        return caches[self.backend]
+
+    def _get_backend_key(self, using: str, pk) -> str:
+        return f"{KEY_PREFIX}:{using}:{self.table.key}:{pk!r}"
+
+
+def register(table: Table) -> Optional[RowCache]:
+    options = table.dialect_kwargs
+    ttl = options.get("django_cache_ttl")
+    if ttl is None:
+        return None
+
+    if len(table.primary_key.columns) != 1:
+        raise errors.InvalidRowCacheTable(table)
+
+    row_cache = RowCache(
+        table,
+        ttl,
+        options.get("django_cache_size") or DEFAULT_MAX_SIZE,
+        options.get("django_cache_backend"),
+    )
+    _row_caches[table] = row_cache
+    return row_cache
+
+
+def get_row_cache(table: Table) -> Optional[RowCache]:
+    return _row_caches.get(table)
+
+
+def invalidate_table(table: Table, using: str, pks: Optional[List] = None) -> None:
+    """
+    Drops the cached rows of a table written without `save()` or `delete()` (ex: `QuerySet.update()`),
+    and of the tables the database writes along with it (ex: `ON DELETE CASCADE`).
+    The rows of the Django cache can only be deleted when their primary keys are given.
+    """
+    if not _row_caches:
+        return
+
+    for written_table in query_cache.get_written_tables([table]):
+        row_cache = _row_caches.get(written_table)
+        if row_cache is not None:
+            # The primary keys of the rows written by the database are unknown.
+            _invalidate(row_cache, using, pks if written_table is table else None)
+
+
+def connect_signals(django_model) -> None:
+    """
+    Connects the receivers invalidating the rows of the model, and the ones written by the
+    database when a row of the model is deleted (ex: `ON DELETE CASCADE`).
+    Signal receivers prevent fast deletes, so they are only connected when needed.
+    """
+    from django.db.models import signals
+
+    table = django_model.__table__
+    if table in _row_caches:
+        signals.post_save.connect(_invalidate_instance, sender=django_model)
+        # The models of the tables declared before this one are already built.
+        for writing_table in query_cache.get_writing_tables([table]):
+            writing_model = registry.get_model_for_table(writing_table)
+            if writing_model is not None and not isinstance(writing_model, LazyModel):
+                signals.post_delete.connect(
+                    _invalidate_deleted_instance, sender=writing_model
+                )
+
+    written_tables = query_cache.get_written_tables([table])
+    if any(written_table in _row_caches for written_table in written_tables):
+        signals.post_delete.connect(_invalidate_deleted_instance, sender=django_model)
+
+
+def _invalidate_instance(sender, instance, using: str, **kwargs) -> None:
+    row_cache = _row_caches.get(sender.__table__)
+    if row_cache is not None:
+        _invalidate(row_cache, using, [instance.pk], clear=False)
+
+
+def _invalidate_deleted_instance(sender, instance, using: str, **kwargs) -> None:
+    _invalidate_instance(sender, instance, using)
+    for written_table in query_cache.get_written_tables([sender.__table__]):
+        row_cache = _row_caches.get(written_table)
+        if row_cache is not None and written_table is not sender.__table__:
+            _invalidate(row_cache, using)
+
+
+def _invalidate(
+    row_cache: RowCache, using: str, pks: Optional[List] = None, clear: bool = True
+) -> None:
+    def invalidate():
+        if clear:
+            row_cache.clear()
+        for pk in pks or ():
+            row_cache.delete(using, pk)
+
+    invalidate()
+    # A row read by another connection before the commit must not outlive it.
+    if connections[using].in_atomic_block:
+        transaction.on_commit(invalidate, using=using)
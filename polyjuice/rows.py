@@ -0,0 +1,67 @@
+from typing import Any, Callable, Dict, Iterable, Tuple, Type
+
+
+class Row:
+    """
+    Read-only record of a row of a polyjuice table, available as `Model.Row`.
+
+    Rows only store the value of each column in a slot: they do not have the `__dict__`,
+    `_state` and related objects cache of model instances, nor send signals.
+    Foreign keys are exposed by their attname, ie: `invented_by_id`.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, *values) -> None:
+        if len(values) != len(self._fields):
+            raise TypeError(
+                f"{type(self).__qualname__} expects {len(self._fields)} values, "
+                f"got {len(values)}."
+            )
+        for name, value in zip(self._fields, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__qualname__} instances are read-only.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__qualname__} instances are read-only.")
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__qualname__}({values})"
+
+    def __reduce__(self):
+        return (type(self), self._values())
+
+    def _asdict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self._fields)
+
+
+def build_row_class(
+    model_name: str,
+    module: str,
+    attnames: Iterable[str],
+    methods: Dict[str, Callable],
+) -> Type[Row]:
+    attnames = tuple(attnames)
+    attributes = {
+        "__module__": module,
+        "__qualname__": f"{model_name}.Row",
+        "__slots__": attnames,
+        "_fields": attnames,
+    }
+    attributes.update(methods)
+    return type("Row", (Row,), attributes)
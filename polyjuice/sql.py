@@ -0,0 +1,454 @@
+from collections import namedtuple, OrderedDict
+from django.db import connections
+from polyjuice import errors, query_cache, row_cache
+from sqlalchemy import Column, util
+from sqlalchemy.dialects import mysql, oracle, postgresql, sqlite
+from sqlalchemy.engine.default import DefaultDialect
+from sqlalchemy.sql import ClauseElement, operators
+from sqlalchemy.sql.dml import UpdateBase, ValuesBase
+from sqlalchemy.sql.elements import (
+    BindParameter,
+    ColumnClause,
+    ColumnElement,
+    quoted_name,
+)
+from sqlalchemy.sql.selectable import _OffsetLimitParam, TableClause
+from sqlalchemy.types import TypeEngine
+import re
+import threading
+from types import BuiltinFunctionType, FunctionType
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Executes SQLAlchemy Core statements through the Django database connections.
+#
+# Example:
+# polyjuice.execute(select([Professor.__table__]).where(Professor.__table__.c.name == "Severus Snape"))
+
+
+# SQLAlchemy dialect used to compile statements for each Django database vendor.
+# Django cursors all expect the `format` paramstyle, ie: `WHERE id = %s`, and
+# the Django SQLite backend already converts dates and datetimes to python objects.
+DIALECTS = {
+    "mysql": mysql.dialect(paramstyle="format"),
+    "oracle": oracle.dialect(paramstyle="format"),
+    "postgresql": postgresql.dialect(paramstyle="format"),
+    "sqlite": sqlite.dialect(paramstyle="format", native_datetime=True),
+}
+
+# Maximum number of compiled statements kept in cache.
+COMPILED_CACHE_SIZE = 500
+
+# Attributes of the statement elements skipped by `get_signature`: they are derived from
+# the other attributes (ex: column collections, memoized comparators) or never rendered.
+IGNORED_ATTRIBUTES = {
+    "_bind",
+    "_cloned_set",
+    "_columns",
+    "_from_cloned",
+    "_orig",
+    "comparator",
+    "dispatch",
+    "foreign_keys",
+    "primary_key",
+}
+
+_ANONYMOUS_ID = re.compile(r"%\((\d+) ")
+
+
+class CompiledStatement:
+    """
+    A statement compiled for a SQLAlchemy dialect, which can be executed
+    again for any statement of the same structure.
+    """
+
+    def __init__(
+        self,
+        statement: ClauseElement,
+        dialect: DefaultDialect,
+        signature: Optional[Hashable] = None,
+        binds: Sequence[BindParameter] = (),
+    ) -> None:
+        self.dialect = dialect
+        self.compiled = statement.compile(dialect=dialect)
+        self.sql = self.compiled.string
+        self.signature = signature
+        self.binds = list(binds)
+        self.keys = [column[0] for column in self.compiled._result_columns]
+        self.result_types = [column[3] for column in self.compiled._result_columns]
+        self.record_class = namedtuple("Record", self.keys, rename=True)
+        # Only statements which cannot be cached are compiled for themselves alone.
+        self._statement = statement if signature is None else None
+
+    def get_parameters(
+        self, statement: ClauseElement, params: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        if statement is self._statement:
+            values = self.compiled.construct_params(params)
+        else:
+            # Same structure, but bind values can differ from the compiled statement.
+            values = self.compiled.construct_params(params)
+            bind_names = self.compiled.bind_names
+            for bind, new_bind in zip(self.binds, _get_binds(statement)):
+                if bind in bind_names:
+                    values[bind_names[bind]] = new_bind.effective_value
+            if isinstance(statement, ValuesBase) and statement.parameters:
+                for column, value in statement.parameters.items():
+                    # SQL expressions are part of the statement, see `get_signature`.
+                    if not isinstance(value, ClauseElement):
+                        values[getattr(column, "key", column)] = value
+            if params:
+                values.update(params)
+
+        # Python side defaults are evaluated by SQLAlchemy at execution time.
+        for column in self.compiled.insert_prefetch + self.compiled.update_prefetch:
+            if values.get(column.key) is None:
+                values[column.key] = get_default_value(column)
+
+        bind_processors = self.compiled._bind_processors
+        parameters = []
+        for name in self.compiled.positiontup:
+            value = values[name]
+            process = bind_processors.get(name)
+            parameters.append(process(value) if process is not None else value)
+        return parameters
+
+    def get_result_processors(self, description: Sequence) -> List:
+        if len(description) != len(self.result_types):
+            return [None] * len(description)
+        return [
+            type_._cached_result_processor(self.dialect, column[1])
+            for type_, column in zip(self.result_types, description)
+        ]
+
+    def process_rows(self, rows: Sequence[Sequence], processors: List) -> List:
+        record_class = self.record_class
+        if not any(processors):
+            return [record_class(*row) for row in rows]
+
+        indexed_processors = list(enumerate(processors))
+        return [
+            record_class(
+                *(
+                    process(row[index]) if process is not None else row[index]
+                    for index, process in indexed_processors
+                )
+            )
+            for row in rows
+        ]
+
+
+class Result:
+    def __init__(self, keys: List[str], records: List, rowcount: int) -> None:
+        self.keys = keys
+        self.records = records
+        self.rowcount = rowcount
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def fetchall(self) -> List:
+        return self.records
+
+    def first(self):
+        return self.records[0] if self.records else None
+
+    def scalar(self):
+        record = self.first()
+        return record[0] if record is not None else None
+
+
+_compiled_statements: "OrderedDict[Hashable, CompiledStatement]" = OrderedDict()
+_compiled_statements_lock = threading.Lock()
+
+
+def execute(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    cache_key: Optional[Hashable] = None,
+) -> Result:
+    """
+    Compiles a SQLAlchemy Core statement for the Django database `using` and executes it.
+
+    Compiled statements are cached per structure (see `get_signature`): statements built at
+    each call whose only differences are their literal values (ex: a query whose only filter
+    values change) are compiled once.
+    """
+    connection = connections[using]
+    compiled = get_compiled(statement, connection.vendor, cache_key)
+    parameters = compiled.get_parameters(statement, params)
+
+    with connection.cursor() as cursor:
+        cursor.execute(compiled.sql, parameters)
+        if isinstance(statement, UpdateBase):
+            query_cache.invalidate([statement.table], using)
+            row_cache.invalidate_table(statement.table, using)
+        if cursor.description is None:
+            return Result([], [], cursor.rowcount)
+
+        processors = compiled.get_result_processors(cursor.description)
+        records = compiled.process_rows(cursor.fetchall(), processors)
+        return Result(compiled.keys, records, cursor.rowcount)
+
+
+def stream(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    chunk_size: int = 2000,
+    cache_key: Optional[Hashable] = None,
+) -> Iterator:
+    """
+    Executes a SQLAlchemy Core select and yields its rows, fetched `chunk_size` at a time.
+
+    Rows are read with a server-side cursor on the backends supporting it (ex: PostgreSQL),
+    unless `DISABLE_SERVER_SIDE_CURSORS` is set for the database, like `QuerySet.iterator()`.
+    """
+    for records in stream_chunks(statement, params, using, chunk_size, cache_key):
+        yield from records
+
+
+def stream_chunks(
+    statement: ClauseElement,
+    params: Optional[Dict[str, Any]] = None,
+    using: str = "default",
+    chunk_size: int = 2000,
+    cache_key: Optional[Hashable] = None,
+) -> Iterator[List]:
+    connection = connections[using]
+    compiled = get_compiled(statement, connection.vendor, cache_key)
+    parameters = compiled.get_parameters(statement, params)
+
+    with get_chunked_cursor(connection) as cursor:
+        cursor.execute(compiled.sql, parameters)
+        processors = compiled.get_result_processors(cursor.description)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield compiled.process_rows(rows, processors)
+
+
+def get_chunked_cursor(connection):
+    if connection.settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        return connection.cursor()
+    return connection.chunked_cursor()
+
+
+def get_dialect(vendor: str) -> DefaultDialect:
+    try:
+        return DIALECTS[vendor]
+    except KeyError:
+        raise errors.UnsupportedDatabaseVendor(vendor)
+
+
+def get_compiled(
+    statement: ClauseElement, vendor: str, cache_key: Optional[Hashable] = None
+) -> CompiledStatement:
+    dialect = get_dialect(vendor)
+    if isinstance(statement, ValuesBase) and statement._has_multi_parameters:
+        # The values of each row are not bind parameters of the statement.
+        return CompiledStatement(statement, dialect)
+
+    signature, binds = _describe_statement(statement)
+    if signature is None:
+        return CompiledStatement(statement, dialect)
+
+    key = (vendor, cache_key, signature)
+    with _compiled_statements_lock:
+        compiled = _compiled_statements.get(key)
+        if compiled is not None:
+            _compiled_statements.move_to_end(key)
+            return compiled
+
+    compiled = CompiledStatement(statement, dialect, signature, binds)
+    with _compiled_statements_lock:
+        _compiled_statements[key] = compiled
+        if len(_compiled_statements) > COMPILED_CACHE_SIZE:
+            _compiled_statements.popitem(last=False)
+    return compiled
+
+
+def get_signature(statement: ClauseElement) -> Optional[Tuple]:
+    """
+    Describes the structure of a statement: every attribute of its elements, with the slot
+    each child element fills, but not the values of its bind parameters.
+    Statements with the same signature are compiled to the same SQL.
+
+    Returns None when the statement holds objects whose effect on the SQL is unknown:
+    such statements are compiled at each execution.
+    """
+    return _describe_statement(statement)[0]
+
+
+def clear_compiled_cache() -> None:
+    with _compiled_statements_lock:
+        _compiled_statements.clear()
+
+
+class _UnknownStructure(Exception):
+    pass
+
+
+class _Signature:
+    # Builds the signature of a statement, and lists its bind parameters in the order they
+    # are described, so that those of two statements with the same signature can be paired.
+
+    def __init__(self) -> None:
+        self.binds: List[BindParameter] = []
+        # Anonymous names embed the id of their object, ie: `%(140058502099344 anon)s`,
+        # and are numbered in their order of appearance instead.
+        self.anonymous_ids: Dict[str, int] = {}
+        self.visiting: Set[int] = set()
+
+    def describe(self, value) -> Hashable:
+        if isinstance(value, BindParameter):
+            return self.describe_bind(value)
+        if isinstance(value, TableClause):
+            return self.describe_table(value)
+        if isinstance(value, ColumnClause) and value.table is not None:
+            return self.describe_column(value)
+        if isinstance(value, ClauseElement):
+            return self.describe_element(value)
+        if isinstance(value, TypeEngine):
+            # Types choose the bind and result processors, and are written by casts.
+            return repr(value)
+        if isinstance(value, quoted_name):
+            return (self.normalize(value), value.quote)
+        if isinstance(value, str):
+            return self.normalize(value)
+        if value is None or isinstance(value, (int, float, bytes)):
+            return value
+        if isinstance(value, (list, tuple, util.OrderedSet)):
+            return tuple(self.describe(item) for item in value)
+        if isinstance(value, (set, frozenset)):
+            binds = len(self.binds)
+            description = frozenset(self.describe(item) for item in value)
+            if len(self.binds) != binds:
+                # Bind parameters must be listed in the same order for every statement.
+                raise _UnknownStructure
+            return description
+        if isinstance(value, dict):
+            return tuple(
+                (self.describe(key), self.describe(item)) for key, item in value.items()
+            )
+        if isinstance(value, (BuiltinFunctionType, FunctionType)):
+            # Operators are module level functions, ie: `operators.eq` or `operator.ne`.
+            return value
+        if isinstance(value, operators.custom_op):
+            return (type(value), self.describe(vars(value)))
+        raise _UnknownStructure
+
+    def describe_element(self, element: ClauseElement) -> Hashable:
+        if id(element) in self.visiting:
+            raise _UnknownStructure
+        self.visiting.add(id(element))
+
+        element_class = type(element)
+        description = [element_class]
+        for name, value in sorted(vars(element).items()):
+            if name in IGNORED_ATTRIBUTES or isinstance(
+                getattr(element_class, name, None), util.memoized_property
+            ):
+                continue
+            if name == "parameters" and isinstance(element, ValuesBase):
+                description.append((name, self.describe_values(value)))
+            else:
+                description.append((name, self.describe(value)))
+
+        if isinstance(element, ColumnElement):
+            # Memoized by most elements, but set by others, ie: `BinaryExpression`.
+            description.append(("type", self.describe(element.type)))
+
+        self.visiting.remove(id(element))
+        return tuple(description)
+
+    def describe_values(self, parameters: Optional[Dict]) -> Hashable:
+        # Literal values become bind parameters named after their column, see
+        # `CompiledStatement.get_parameters`, but SQL expressions are part of the statement.
+        return tuple(
+            (
+                self.describe(getattr(key, "key", key)),
+                self.describe(value) if isinstance(value, ClauseElement) else None,
+            )
+            for key, value in (parameters or {}).items()
+        )
+
+    def describe_bind(self, bind: BindParameter) -> Hashable:
+        self.binds.append(bind)
+        description = (
+            type(bind),
+            self.normalize(bind.key),
+            bind.unique,
+            bind.expanding,
+            bind.isoutparam,
+            bind.callable is not None,
+            repr(bind.type),
+        )
+        if isinstance(bind, _OffsetLimitParam):
+            # Dialects without LIMIT write the value in the SQL, ie: `ROWNUM <= 10`.
+            return description + (bind.effective_value,)
+        return description
+
+    def describe_table(self, table: TableClause) -> Hashable:
+        # Selecting a table selects each of its columns.
+        return (
+            type(table),
+            self.describe(table.schema),
+            self.describe(table.name),
+            tuple(
+                (
+                    self.describe(column.key),
+                    self.describe(column.name),
+                    repr(column.type),
+                )
+                for column in table.columns
+            ),
+        )
+
+    def describe_column(self, column: ColumnClause) -> Hashable:
+        return (
+            type(column),
+            self.describe(column.table),
+            self.describe(column.key),
+            self.describe(column.name),
+            column.is_literal,
+            repr(column.type),
+        )
+
+    def normalize(self, name: str) -> str:
+        if "%(" not in name:
+            return name
+        return _ANONYMOUS_ID.sub(
+            lambda match: "%({} ".format(
+                self.anonymous_ids.setdefault(match.group(1), len(self.anonymous_ids))
+            ),
+            name,
+        )
+
+
+def _describe_statement(
+    statement: ClauseElement,
+) -> Tuple[Optional[Tuple], List[BindParameter]]:
+    signature = _Signature()
+    try:
+        return signature.describe(statement), signature.binds
+    except _UnknownStructure:
+        return None, []
+
+
+def _get_binds(statement: ClauseElement) -> List[BindParameter]:
+    return _describe_statement(statement)[1]
+
+
+def get_default_value(column: Column):
+    default = column.default
+    if default is None or not (default.is_scalar or default.is_callable):
+        return None
+    if default.is_scalar:
+        return default.arg
+    # Callable defaults are wrapped by SQLAlchemy to receive an execution context.
+    return default.arg(None)
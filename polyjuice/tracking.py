@@ -0,0 +1,84 @@
+from django.db import models
+from polyjuice import identity
+from typing import Iterable, List, Optional
+
+# Dirty fields tracking of the polyjuice models whose table sets `django_track_changes=True`.
+#
+# The value of each column is recorded when an instance is loaded or saved, so that `save()`
+# only updates the columns which changed since, and does not query the database when none did.
+#
+# Values are compared with `!=`: in-place changes of mutable values are not detected.
+
+
+class ChangeTrackingModel(models.Model):
+    class Meta:
+        abstract = True
+
+    def polyjuice_changed_fields(self) -> List[str]:
+        """Returns the name of the fields whose value changed since the instance was loaded."""
+        original_values = self.__dict__.get("_polyjuice_original_values", {})
+        changed_fields = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                # Deferred fields cannot have changed.
+                continue
+            original_value = original_values.get(field.attname, _MISSING)
+            if original_value is _MISSING or original_value != getattr(
+                self, field.attname
+            ):
+                changed_fields.append(field.name)
+        return changed_fields
+
+    def save(
+        self, force_insert=False, force_update=False, using=None, update_fields=None
+    ):
+        original_values = self.__dict__.get("_polyjuice_original_values")
+        if (
+            original_values is not None
+            and update_fields is None
+            and not force_insert
+            and not self._state.adding
+            and using in (None, self._state.db)
+            and original_values.get(self._meta.pk.attname) == self.pk
+        ):
+            # Django does not run any query when `update_fields` is empty.
+            update_fields = self.polyjuice_changed_fields()
+
+        super().save(force_insert, force_update, using, update_fields)
+        record_original_values(self, update_fields)
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        record_original_values(self, fields)
+
+
+def wrap_from_db(from_db) -> classmethod:
+    def tracked_from_db(cls, db, field_names, values):
+        # The changes of an instance of the identity map are kept.
+        instance = identity.get_loaded(db, cls, field_names, values)
+        if instance is not None:
+            return instance
+
+        instance = from_db.__func__(cls, db, field_names, values)
+        record_original_values(instance)
+        return instance
+
+    return classmethod(tracked_from_db)
+
+
+def record_original_values(
+    instance: models.Model, field_names: Optional[Iterable[str]] = None
+) -> None:
+    original_values = instance.__dict__.setdefault("_polyjuice_original_values", {})
+    if field_names is None:
+        fields = instance._meta.concrete_fields
+    else:
+        fields = [instance._meta.get_field(name) for name in field_names]
+
+    instance_values = instance.__dict__
+    for field in fields:
+        if field.attname in instance_values:
+            original_values[field.attname] = instance_values[field.attname]
+
+
+_MISSING = object()
@@ -0,0 +1,49 @@
+import django
+import pytest
+from django.conf import settings
+
+
+def pytest_configure():
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                # Shared by the connections of every thread, as used by `polyjuice.aio`.
+                "NAME": "file:polyjuice?mode=memory&cache=shared",
+            }
+        },
+        INSTALLED_APPS=[],
+    )
+    django.setup()
+
+
+@pytest.fixture
+def create_models():
+    from django.db import connection
+
+    created_models = []
+
+    def create(*django_models):
+        with connection.schema_editor() as editor:
+            for django_model in django_models:
+                editor.create_model(django_model)
+                created_models.append(django_model)
+
+    yield create
+
+    with connection.schema_editor() as editor:
+        for django_model in reversed(created_models):
+            editor.delete_model(django_model)
+
+
+@pytest.fixture
+def count_queries():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def count(function):
+        with CaptureQueriesContext(connection) as queries:
+            result = function()
+        return result, len(queries)
+
+    return count
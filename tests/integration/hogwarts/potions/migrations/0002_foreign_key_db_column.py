@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("potions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="potion",
+            name="invented_by",
+            field=models.ForeignKey(
+                db_column="invented_by",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="invented_potions",
+                to="professors.Professor",
+            ),
+        ),
+    ]
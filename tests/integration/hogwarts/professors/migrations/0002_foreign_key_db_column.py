@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("professors", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="professor",
+            name="favourite_house",
+            field=models.ForeignKey(
+                db_column="favourite_house",
+                on_delete=django.db.models.deletion.CASCADE,
+                to="houses.House",
+            ),
+        ),
+    ]
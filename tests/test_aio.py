@@ -0,0 +1,182 @@
+import asyncio
+from django.db import connection, connections
+from django.test.utils import override_settings
+from polyjuice import aio, sql
+import pytest
+from sqlalchemy import Column, Integer, MetaData, select, String, Table
+from sqlalchemy.schema import CreateTable, DropTable
+import threading
+
+metadata = MetaData()
+Potion = Table(
+    "aio__potion",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False),
+)
+
+
+@pytest.fixture(autouse=True)
+def potion_table():
+    dialect = sql.get_dialect(connection.vendor)
+    with connection.cursor() as cursor:
+        cursor.execute(str(CreateTable(Potion).compile(dialect=dialect)))
+    yield
+    aio.shutdown()
+    with connection.cursor() as cursor:
+        cursor.execute(str(DropTable(Potion).compile(dialect=dialect)))
+    sql.clear_compiled_cache()
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def insert_potions(count):
+    for potion_id in range(1, count + 1):
+        sql.execute(Potion.insert().values(id=potion_id, name=f"Potion {potion_id}"))
+
+
+async def consume(iterator, limit=None):
+    records = []
+    async for record in iterator:
+        records.append(record)
+        if len(records) == limit:
+            break
+    return records
+
+
+class TestQueries:
+    def test_fetch_all(self):
+        insert_potions(2)
+
+        records = run(aio.fetch_all(select([Potion]).order_by(Potion.c.id)))
+
+        assert records == [(1, "Potion 1"), (2, "Potion 2")]
+
+    def test_fetch_one(self):
+        insert_potions(2)
+
+        record = run(aio.fetch_one(select([Potion.c.name]).where(Potion.c.id == 2)))
+
+        assert record.name == "Potion 2"
+
+    def test_fetch_one_without_rows(self):
+        assert run(aio.fetch_one(select([Potion]))) is None
+
+    def test_execute(self):
+        result = run(aio.execute(Potion.insert().values(id=1, name="Veritaserum")))
+
+        assert result.rowcount == 1
+        assert sql.execute(select([Potion.c.name])).scalar() == "Veritaserum"
+
+    def test_threads_use_their_own_connection(self):
+        call = aio._Call(lambda: connections["default"], "default")
+
+        pool_connection = run(aio._run(call))
+
+        assert pool_connection is not connections["default"]
+
+    def test_connections_are_kept_between_calls(self):
+        closed = []
+
+        def get_connection():
+            pool_connection = connections["default"]
+            pool_connection.ensure_connection()
+            # SQLite in-memory connections are never closed by Django.
+            pool_connection.close = lambda: closed.append(pool_connection)
+            return pool_connection
+
+        with override_settings(POLYJUICE_AIO_MAX_WORKERS=1):
+            first = run(aio._run(aio._Call(get_connection, "default")))
+            second = run(aio._run(aio._Call(get_connection, "default")))
+        del first.close
+
+        assert second is first
+        assert closed == []
+
+    def test_unusable_connections_are_closed(self):
+        closed = threading.Event()
+
+        def break_connection():
+            pool_connection = connections["default"]
+            pool_connection.ensure_connection()
+            pool_connection.errors_occurred = True
+            pool_connection.is_usable = lambda: False
+            # SQLite in-memory connections are never closed by Django.
+            pool_connection.close = closed.set
+            return pool_connection
+
+        pool_connection = run(aio._run(aio._Call(break_connection, "default")))
+        del pool_connection.is_usable, pool_connection.close
+
+        assert closed.is_set()
+
+    def test_concurrent_queries(self):
+        insert_potions(3)
+
+        async def fetch_all_potions():
+            statements = [
+                select([Potion.c.name]).where(Potion.c.id == potion_id)
+                for potion_id in range(1, 4)
+            ]
+            return await asyncio.gather(
+                *(aio.fetch_one(statement) for statement in statements)
+            )
+
+        records = run(fetch_all_potions())
+
+        assert [record.name for record in records] == [
+            "Potion 1",
+            "Potion 2",
+            "Potion 3",
+        ]
+
+
+class TestStream:
+    def test_yields_every_row(self):
+        insert_potions(5)
+
+        records = run(consume(aio.stream(select([Potion]), chunk_size=2)))
+
+        assert [record.id for record in records] == [1, 2, 3, 4, 5]
+
+    def test_stops_the_producer(self):
+        insert_potions(10)
+        iterator = aio.stream(select([Potion]), chunk_size=1)
+
+        records = run(consume(iterator, limit=2))
+        run(iterator.aclose())
+
+        assert [record.id for record in records] == [1, 2]
+
+    def test_raises_errors(self):
+        broken = Table("aio__missing", MetaData(), Column("id", Integer))
+
+        with pytest.raises(Exception, match="no such table"):
+            run(consume(aio.stream(select([broken]))))
+
+
+class TestCancellation:
+    def test_cancel_interrupts_the_query(self):
+        started = threading.Event()
+
+        class BlockingCall(aio._Call):
+            interrupted = False
+
+            def cancel(self):
+                BlockingCall.interrupted = True
+                super().cancel()
+
+        async def cancel_query():
+            call = BlockingCall(lambda: started.wait(5), "default")
+            task = asyncio.ensure_future(aio._run(call))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        run(cancel_query())
+        started.set()
+
+        assert BlockingCall.interrupted
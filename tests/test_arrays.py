@@ -0,0 +1,154 @@
+from datetime import date
+import polyjuice
+from polyjuice import arrays
+import pytest
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Float,
+    func,
+    Integer,
+    MetaData,
+    Numeric,
+    select,
+    String,
+    Table,
+)
+
+numpy = pytest.importorskip("numpy")
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "arrays__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        Column("price", Numeric(precision=10, scale=2), nullable=True),
+        Column("weight", Float, nullable=False),
+        Column("is_legal", Boolean, nullable=False),
+        Column("brewed_at", Date, nullable=True),
+    )
+
+    class Meta:
+        app_label = "arrays"
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(create_models):
+    create_models(Potion)
+    Potion.polyjuice.bulk_insert(
+        [
+            {
+                "id": 1,
+                "name": "Veritaserum",
+                "price": "12.50",
+                "weight": 0.5,
+                "is_legal": False,
+                "brewed_at": date(1998, 5, 2),
+            },
+            {
+                "id": 2,
+                "name": "Polyjuice",
+                "price": None,
+                "weight": 1.5,
+                "is_legal": True,
+                "brewed_at": None,
+            },
+            {
+                "id": 3,
+                "name": "Felix Felicis",
+                "price": "100",
+                "weight": 0.1,
+                "is_legal": True,
+                "brewed_at": date(1996, 1, 1),
+            },
+        ]
+    )
+
+
+class TestToArrays:
+    def test_typed_arrays(self):
+        table = Potion.__table__
+
+        result = polyjuice.to_arrays(select([table]).order_by(table.c.id))
+
+        assert list(result) == [
+            "id",
+            "name",
+            "price",
+            "weight",
+            "is_legal",
+            "brewed_at",
+        ]
+        assert result["id"].dtype == numpy.int64
+        assert result["id"].tolist() == [1, 2, 3]
+        assert result["name"].dtype == object
+        assert result["name"].tolist() == ["Veritaserum", "Polyjuice", "Felix Felicis"]
+        assert result["weight"].dtype == numpy.float64
+        assert result["is_legal"].tolist() == [False, True, True]
+
+    def test_nullable_columns_are_masked(self):
+        table = Potion.__table__
+
+        result = polyjuice.to_arrays(select([table]).order_by(table.c.id))
+
+        assert isinstance(result["price"], numpy.ma.MaskedArray)
+        assert result["price"].mask.tolist() == [False, True, False]
+        assert result["price"].sum() == 112.5
+        assert result["brewed_at"].dtype == numpy.dtype("datetime64[D]")
+        assert result["brewed_at"].compressed().tolist() == [
+            date(1998, 5, 2),
+            date(1996, 1, 1),
+        ]
+        assert not isinstance(result["weight"], numpy.ma.MaskedArray)
+
+    def test_arrays_grow_across_chunks(self):
+        table = Potion.__table__
+
+        result = polyjuice.to_arrays(
+            select([table.c.id, table.c.price]).order_by(table.c.id), chunk_size=1
+        )
+
+        assert result["id"].tolist() == [1, 2, 3]
+        assert result["price"].mask.tolist() == [False, True, False]
+
+    def test_expressions(self):
+        table = Potion.__table__
+
+        result = polyjuice.to_arrays(select([func.count(table.c.id).label("count")]))
+
+        assert result["count"].tolist() == [3]
+
+    def test_empty_result(self):
+        table = Potion.__table__
+
+        result = polyjuice.to_arrays(select([table.c.id]).where(table.c.id > 10))
+
+        assert result["id"].tolist() == []
+
+    def test_queryset(self):
+        result = polyjuice.to_arrays(
+            Potion.objects.filter(is_legal=True).order_by("id")
+        )
+
+        assert result["id"].tolist() == [2, 3]
+        assert result["price"].mask.tolist() == [True, False]
+
+    def test_values_list_queryset(self):
+        result = polyjuice.to_arrays(
+            Potion.objects.order_by("id").values_list("name", "weight")
+        )
+
+        assert list(result) == ["name", "weight"]
+        assert result["weight"].tolist() == [0.5, 1.5, 0.1]
+
+
+def test_numpy_types():
+    assert arrays.get_numpy_type(Integer()) == "int64"
+    assert arrays.get_numpy_type(Numeric()) == "float64"
+    assert arrays.get_numpy_type(String(10)) is None
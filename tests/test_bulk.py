@@ -0,0 +1,336 @@
+from datetime import date
+from django.db import connection, transaction
+import polyjuice
+from polyjuice import errors
+import pytest
+from sqlalchemy import (
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+)
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Professor:
+    __table__ = Table(
+        "bulk_insert__professor",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(30), nullable=False),
+    )
+
+    class Meta:
+        app_label = "bulk_insert"
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "bulk_insert__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False, django_field_name="title"),
+        Column("stock", Integer, nullable=False, default=10),
+        Column("brewed_at", Date, nullable=True),
+        Column(
+            "invented_by",
+            Integer,
+            ForeignKey(Professor.__table__.c.id),
+            django_on_delete="CASCADE",
+            nullable=True,
+        ),
+    )
+
+    class Meta:
+        app_label = "bulk_insert"
+
+
+@polyjuice.model
+class Ingredient:
+    __table__ = Table(
+        "bulk_insert__ingredient",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False, unique=True),
+        Column("shop", String(50), nullable=False),
+        Column("reference", Integer, nullable=False),
+        Column("barcode", String(13), nullable=True),
+        Column("stock", Integer, nullable=False, default=0),
+        UniqueConstraint("shop", "reference"),
+        Index("ingredient_barcode", "barcode", unique=True, sqlite_where=True),
+    )
+
+    class Meta:
+        app_label = "bulk_insert"
+
+
+@pytest.fixture(autouse=True)
+def tables(create_models):
+    create_models(Professor, Potion, Ingredient)
+
+
+class TestBulkInsert:
+    def test_insert_rows(self):
+        inserted = Potion.polyjuice.bulk_insert(
+            [
+                {"name": "Veritaserum", "stock": 2, "brewed_at": date(1998, 5, 2)},
+                {"name": "Polyjuice", "stock": 3, "brewed_at": None},
+            ]
+        )
+
+        assert inserted == 2
+        assert list(Potion.objects.order_by("id").values_list("title", "stock")) == [
+            ("Veritaserum", 2),
+            ("Polyjuice", 3),
+        ]
+        assert Potion.objects.get(title="Veritaserum").brewed_at == date(1998, 5, 2)
+
+    def test_field_names_are_translated_to_column_names(self):
+        Potion.polyjuice.bulk_insert([{"title": "Veritaserum"}])
+
+        assert Potion.objects.get().title == "Veritaserum"
+
+    def test_python_side_defaults_are_applied(self):
+        Potion.polyjuice.bulk_insert([{"name": "Veritaserum"}])
+
+        assert Potion.objects.get().stock == 10
+
+    def test_related_instances_and_ids(self):
+        snape = Professor.objects.create(name="Severus Snape")
+
+        Potion.polyjuice.bulk_insert(
+            [
+                {"name": "Veritaserum", "invented_by": snape},
+                {"name": "Polyjuice", "invented_by_id": snape.id},
+            ]
+        )
+
+        assert snape.potion_set.count() == 2
+
+    def test_generator_in_several_batches(self):
+        rows = ({"name": f"Potion {number}"} for number in range(25))
+
+        inserted = Potion.polyjuice.bulk_insert(rows, batch_size=10)
+
+        assert inserted == 25
+        assert Potion.objects.count() == 25
+
+    def test_rows_providing_different_keys(self):
+        Potion.polyjuice.bulk_insert(
+            [{"name": "Veritaserum"}, {"name": "Polyjuice", "stock": 1}]
+        )
+
+        assert sorted(Potion.objects.values_list("stock", flat=True)) == [1, 10]
+
+    def test_fail_when_column_is_unknown(self):
+        with pytest.raises(errors.UnknownColumn) as err:
+            Potion.polyjuice.bulk_insert([{"color": "green"}])
+
+        assert err.value.args[0] == (
+            "Table `bulk_insert__potion`: \n"
+            "`color` is neither a column nor a field of this table."
+        )
+
+    def test_not_accessible_via_instances(self):
+        with pytest.raises(AttributeError):
+            Potion(title="Veritaserum").polyjuice
+
+
+class TestBulkUpdate:
+    def setup(self):
+        Potion.polyjuice.bulk_insert(
+            {"id": number, "name": f"Potion {number}", "stock": number}
+            for number in range(1, 6)
+        )
+
+    def test_update_rows(self):
+        updated = Potion.polyjuice.bulk_update(
+            [{"id": 1, "name": "Veritaserum", "stock": 0}, {"id": 3, "stock": 30}],
+            columns=["stock"],
+        )
+
+        assert updated == 2
+        assert list(Potion.objects.order_by("id").values_list("title", "stock")) == [
+            ("Potion 1", 0),
+            ("Potion 2", 2),
+            ("Potion 3", 30),
+            ("Potion 4", 4),
+            ("Potion 5", 5),
+        ]
+
+    def test_columns_default_to_the_keys_of_the_first_row(self):
+        Potion.polyjuice.bulk_update(
+            [{"id": 2, "title": "Veritaserum", "brewed_at": date(1998, 5, 2)}]
+        )
+
+        potion = Potion.objects.get(pk=2)
+        assert (potion.title, potion.stock, potion.brewed_at) == (
+            "Veritaserum",
+            2,
+            date(1998, 5, 2),
+        )
+
+    def test_generator_in_several_batches(self):
+        rows = ({"id": number, "stock": number * 10} for number in range(1, 6))
+
+        updated = Potion.polyjuice.bulk_update(rows, batch_size=2)
+
+        assert updated == 5
+        assert list(Potion.objects.order_by("id").values_list("stock", flat=True)) == [
+            10,
+            20,
+            30,
+            40,
+            50,
+        ]
+
+    def test_unknown_keys_are_ignored(self):
+        updated = Potion.polyjuice.bulk_update([{"id": 42, "stock": 0}])
+
+        assert updated == 0
+        assert Potion.objects.filter(stock=0).count() == 0
+
+    def test_other_key(self):
+        updated = Potion.polyjuice.bulk_update(
+            [{"title": "Potion 4", "stock": 0}], key="title"
+        )
+
+        assert updated == 1
+        assert Potion.objects.get(stock=0).id == 4
+
+    def test_related_instances(self):
+        snape = Professor.objects.create(name="Severus Snape")
+
+        Potion.polyjuice.bulk_update([{"id": 1, "invented_by": snape}])
+
+        assert Potion.objects.get(pk=1).invented_by == snape
+
+    def test_can_be_called_again_in_the_same_transaction(self):
+        with transaction.atomic():
+            Potion.polyjuice.bulk_update([{"id": 1, "stock": 0}])
+            Potion.polyjuice.bulk_update([{"id": 2, "stock": 0}])
+
+        assert Potion.objects.filter(stock=0).count() == 2
+
+    def test_nothing_to_update(self):
+        assert Potion.polyjuice.bulk_update([]) == 0
+        assert Potion.polyjuice.bulk_update([{"id": 1}]) == 0
+
+    def test_fail_when_column_is_unknown(self):
+        with pytest.raises(errors.UnknownColumn):
+            Potion.polyjuice.bulk_update([{"id": 1, "color": "green"}])
+
+
+class TestBulkUpsert:
+    def setup(self):
+        # Unique constraints are not part of the Django model, which created the table.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE UNIQUE INDEX ingredient_shop_reference "
+                "ON bulk_insert__ingredient (shop, reference)"
+            )
+        Ingredient.objects.create(
+            id=1, name="Lacewing fly", shop="Slug & Jiggers", reference=1, stock=5
+        )
+
+    def get_ingredients(self):
+        return list(
+            Ingredient.objects.order_by("id").values_list("id", "name", "stock")
+        )
+
+    def test_insert_and_update_on_primary_key(self):
+        upserted = Ingredient.polyjuice.bulk_upsert(
+            [
+                {
+                    "id": 1,
+                    "name": "Lacewing flies",
+                    "shop": "Slug & Jiggers",
+                    "reference": 1,
+                },
+                {"id": 2, "name": "Leech", "shop": "Slug & Jiggers", "reference": 2},
+            ]
+        )
+
+        assert upserted == 2
+        assert self.get_ingredients() == [(1, "Lacewing flies", 5), (2, "Leech", 0)]
+
+    def test_only_the_given_columns_are_updated(self):
+        Ingredient.polyjuice.bulk_upsert(
+            [{"id": 1, "name": "Lacewing flies", "shop": "Hogsmeade", "reference": 1}],
+            update=["name"],
+        )
+
+        ingredient = Ingredient.objects.get(pk=1)
+        assert (ingredient.name, ingredient.shop) == (
+            "Lacewing flies",
+            "Slug & Jiggers",
+        )
+
+    def test_do_nothing(self):
+        upserted = Ingredient.polyjuice.bulk_upsert(
+            [
+                {"name": "Lacewing fly", "shop": "Hogsmeade", "reference": 1},
+                {"name": "Leech", "shop": "Hogsmeade", "reference": 2},
+            ],
+            conflict=["name"],
+            update=[],
+        )
+
+        assert upserted == 1
+        assert sorted(Ingredient.objects.values_list("name", "shop")) == [
+            ("Lacewing fly", "Slug & Jiggers"),
+            ("Leech", "Hogsmeade"),
+        ]
+
+    def test_unique_constraint(self):
+        Ingredient.polyjuice.bulk_upsert(
+            [
+                {
+                    "name": "Fluxweed",
+                    "shop": "Slug & Jiggers",
+                    "reference": 1,
+                    "stock": 3,
+                }
+            ],
+            conflict=["shop", "reference"],
+            update=["name", "stock"],
+        )
+
+        assert self.get_ingredients() == [(1, "Fluxweed", 3)]
+
+    def test_several_batches(self):
+        rows = (
+            {
+                "id": number,
+                "name": f"Ingredient {number}",
+                "shop": "Hogsmeade",
+                "reference": number,
+            }
+            for number in range(1, 26)
+        )
+
+        upserted = Ingredient.polyjuice.bulk_upsert(rows, batch_size=10)
+
+        assert upserted == 25
+        assert Ingredient.objects.get(pk=1).name == "Ingredient 1"
+        assert Ingredient.objects.count() == 25
+
+    @pytest.mark.parametrize("conflict", [["shop"], ["barcode"], ["name", "shop"]])
+    def test_fail_when_conflict_target_is_not_unique(self, conflict):
+        with pytest.raises(errors.InvalidConflictTarget) as err:
+            Ingredient.polyjuice.bulk_upsert([{"name": "Leech"}], conflict=conflict)
+
+        assert err.value.args[0] == (
+            "Table `bulk_insert__ingredient`: \n"
+            f"The columns {conflict} are not covered by a unique index of this table.\n"
+            "The conflict target of `bulk_upsert` must be the primary key, a unique column, "
+            "a `UniqueConstraint` or a unique `Index` without condition."
+        )
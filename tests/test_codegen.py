@@ -0,0 +1,289 @@
+from django.test.utils import isolate_apps
+from importlib import import_module
+import polyjuice
+from polyjuice import codegen, registry, row_cache
+from polyjuice.managers import PolyjuiceManager
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table
+import textwrap
+
+metadata = MetaData()
+unmodeled_metadata = MetaData()
+Table("codegen__cauldron", unmodeled_metadata, Column("id", Integer, primary_key=True))
+
+
+@polyjuice.model
+class Professor:
+    __table__ = Table(
+        "codegen__professor",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(30), nullable=False),
+    )
+
+    class Meta:
+        app_label = "codegen"
+        ordering = ["name"]
+
+    def welcome(self):
+        return f"Welcome to my class, I am Pr. {self.name}."
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "codegen__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column(
+            "invented_by",
+            Integer,
+            ForeignKey(Professor.__table__.c.id),
+            django_on_delete="CASCADE",
+        ),
+        Index("invented_by_index", "invented_by"),
+    )
+
+    class Meta:
+        app_label = "codegen"
+
+
+class TestGenerate:
+    def test_models_source_code(self):
+        source_code = codegen.generate(metadata, "test_codegen:metadata")
+
+        assert source_code == (
+            "# Generated by `python -m polyjuice generate test_codegen:metadata`, do not edit.\n"
+            "from django.db import models\n"
+            "import django.db.models.deletion\n"
+            "from polyjuice import setup_model\n"
+            "from polyjuice.accessor import PolyjuiceAccessor\n"
+            "from polyjuice.managers import PolyjuiceManager\n"
+            "from test_codegen import metadata\n"
+            "\n"
+            "\n"
+            "class Professor(models.Model):\n"
+            "    __table__ = metadata.tables['codegen__professor']\n"
+            "    id = models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')\n"
+            "    name = models.CharField(max_length=30)\n"
+            "\n"
+            "    objects = PolyjuiceManager()\n"
+            "    polyjuice = PolyjuiceAccessor()\n"
+            "\n"
+            "    class Meta:\n"
+            "        app_label = 'codegen'\n"
+            "        db_table = 'codegen__professor'\n"
+            "        indexes = []\n"
+            "        ordering = ['name']\n"
+            "\n"
+            "    def welcome(self):\n"
+            '        return f"Welcome to my class, I am Pr. {self.name}."\n'
+            "\n"
+            "\n"
+            "setup_model(Professor)\n"
+            "\n"
+            "\n"
+            "class Potion(models.Model):\n"
+            "    __table__ = metadata.tables['codegen__potion']\n"
+            "    id = models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')\n"
+            "    invented_by = models.ForeignKey(db_column='invented_by', null=True, on_delete=django.db.models.deletion.CASCADE, to='codegen.Professor')\n"
+            "\n"
+            "    objects = PolyjuiceManager()\n"
+            "    polyjuice = PolyjuiceAccessor()\n"
+            "\n"
+            "    class Meta:\n"
+            "        app_label = 'codegen'\n"
+            "        db_table = 'codegen__potion'\n"
+            "        indexes = [models.Index(fields=['invented_by'], name='invented_by_index')]\n"
+            "\n"
+            "\n"
+            "setup_model(Potion)\n"
+        )
+
+    def test_source_code_is_valid_python(self):
+        source_code = codegen.generate(metadata, "test_codegen:metadata")
+
+        compile(source_code, "models_gen.py", "exec")
+
+    def test_generated_models_are_polyjuice_models(self):
+        source_code = codegen.generate(metadata, "test_codegen:metadata")
+        namespace = {"__name__": "codegen_models_gen"}
+
+        try:
+            with isolate_apps():
+                exec(compile(source_code, "models_gen.py", "exec"), namespace)
+        finally:
+            for django_model in [Professor, Potion]:
+                registry.register(django_model.__table__, django_model)
+
+        GeneratedPotion = namespace["Potion"]
+        assert GeneratedPotion.__table__ is Potion.__table__
+        assert GeneratedPotion.polyjuice.table is Potion.__table__
+        assert isinstance(GeneratedPotion.objects, PolyjuiceManager)
+        assert GeneratedPotion.Row._fields == ("id", "invented_by_id")
+        assert GeneratedPotion.from_db.__func__ is Potion.from_db.__func__
+
+    def test_tracking_base_and_row_cache_manager(self):
+        other_metadata = MetaData()
+
+        @polyjuice.model
+        class Wand:
+            __table__ = Table(
+                "codegen__wand",
+                other_metadata,
+                Column("id", Integer, primary_key=True),
+                django_track_changes=True,
+                django_cache_ttl=60,
+            )
+
+            class Meta:
+                app_label = "codegen"
+
+        source_code = codegen.generate(other_metadata, "test_codegen")
+
+        assert "from test_codegen import metadata\n" in source_code
+        assert "from polyjuice.tracking import ChangeTrackingModel\n" in source_code
+        assert "class Wand(ChangeTrackingModel):\n" in source_code
+        assert "    objects = RowCacheManager()\n" in source_code
+
+    def test_generated_row_cache_is_registered(self):
+        source_code = codegen.generate(metadata, "test_codegen:metadata")
+        table = Professor.__table__
+        table.dialect_kwargs["django_cache_ttl"] = 60
+
+        try:
+            with isolate_apps():
+                exec(compile(source_code, "models_gen.py", "exec"), {})
+            assert row_cache.get_row_cache(table) is not None
+        finally:
+            del table.dialect_kwargs["django_cache_ttl"]
+            row_cache._row_caches.pop(table, None)
+            for django_model in [Professor, Potion]:
+                registry.register(django_model.__table__, django_model)
+
+    def test_imports_used_by_methods(self):
+        other_metadata = MetaData()
+
+        @polyjuice.model
+        class SpellBook:
+            __table__ = Table(
+                "codegen__spell_book",
+                other_metadata,
+                Column("id", Integer, primary_key=True),
+                Column("title", String(30), nullable=False),
+            )
+
+            class Meta:
+                app_label = "codegen"
+
+            def summary(self):
+                return textwrap.shorten(self.title, 10)
+
+        source_code = codegen.generate(other_metadata, "test_codegen:other_metadata")
+
+        assert "import textwrap\n" in source_code
+        assert "import polyjuice\n" not in source_code
+
+
+class TestMain:
+    def test_write_output(self, tmp_path):
+        output = tmp_path / "models_gen.py"
+
+        exit_code = codegen.main(
+            ["generate", "test_codegen:metadata", "-o", str(output)]
+        )
+
+        assert exit_code == 0
+        assert output.read_text() == codegen.generate(metadata, "test_codegen:metadata")
+
+    def test_check_up_to_date_output(self, tmp_path):
+        output = tmp_path / "models_gen.py"
+        output.write_text(codegen.generate(metadata, "test_codegen:metadata"))
+
+        exit_code = codegen.main(
+            ["generate", "test_codegen:metadata", "-o", str(output), "--check"]
+        )
+
+        assert exit_code == 0
+
+    def test_check_out_of_date_output(self, tmp_path):
+        output = tmp_path / "models_gen.py"
+        output.write_text("# Outdated")
+
+        exit_code = codegen.main(
+            ["generate", "test_codegen:metadata", "-o", str(output), "--check"]
+        )
+
+        assert exit_code == 1
+        assert output.read_text() == "# Outdated"
+
+    def test_import_placeholder_modules(self, tmp_path, monkeypatch):
+        (tmp_path / "codegen_cli_tables.py").write_text(
+            "from sqlalchemy import Column, Integer, MetaData, Table\n"
+            "metadata = MetaData()\n"
+            "wizard = Table('codegen__wizard', metadata, Column('id', Integer, primary_key=True))\n"
+        )
+        (tmp_path / "codegen_cli_placeholders.py").write_text(
+            "import polyjuice\n"
+            "from codegen_cli_tables import wizard\n"
+            "@polyjuice.model\n"
+            "class Wizard:\n"
+            "    __table__ = wizard\n"
+            "    class Meta:\n"
+            "        app_label = 'codegen'\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        output = tmp_path / "codegen_cli_models_gen.py"
+
+        exit_code = codegen.main(
+            [
+                "generate",
+                "codegen_cli_tables:metadata",
+                "--models",
+                "codegen_cli_placeholders",
+                "-o",
+                str(output),
+            ]
+        )
+
+        assert exit_code == 0
+        assert "class Wizard(models.Model):\n" in output.read_text()
+        with isolate_apps():
+            generated = import_module("codegen_cli_models_gen")
+        assert generated.Wizard.__table__ is import_module("codegen_cli_tables").wizard
+
+    def test_fail_when_no_table_has_a_model(self, tmp_path, capsys):
+        output = tmp_path / "models_gen.py"
+
+        exit_code = codegen.main(
+            ["generate", "test_codegen:unmodeled_metadata", "-o", str(output)]
+        )
+
+        assert exit_code == 1
+        assert not output.exists()
+        assert "--models" in capsys.readouterr().err
+
+
+class TestFastInit:
+    def test_generated_initializers_are_not_copied(self):
+        fast_metadata = MetaData()
+
+        @polyjuice.model
+        class Spell:
+            __table__ = Table(
+                "codegen__spell",
+                fast_metadata,
+                Column("id", Integer, primary_key=True),
+                Column("name", String(30), nullable=False),
+                django_fast_init=True,
+            )
+
+            class Meta:
+                app_label = "codegen"
+
+            def cast(self):
+                return f"{self.name}!"
+
+        source_code = codegen.generate(fast_metadata, "test_codegen:fast_metadata")
+
+        assert "def __init__" not in source_code
+        assert "def cast(self):" in source_code
@@ -0,0 +1,114 @@
+from django.db import connection, connections, transaction
+from polyjuice import engine as polyjuice_engine, errors, sql
+import pytest
+from sqlalchemy import Column, Integer, MetaData, select, String, Table
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateTable, DropTable
+from unittest.mock import patch
+
+metadata = MetaData()
+Potion = Table(
+    "engine__potion",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False),
+)
+
+
+@pytest.fixture(autouse=True)
+def potion_table():
+    dialect = sql.get_dialect(connection.vendor)
+    with connection.cursor() as cursor:
+        cursor.execute(str(CreateTable(Potion).compile(dialect=dialect)))
+    yield
+    polyjuice_engine.dispose_engines()
+    with connection.cursor() as cursor:
+        cursor.execute(str(DropTable(Potion).compile(dialect=dialect)))
+    sql.clear_compiled_cache()
+
+
+class TestGetEngine:
+    def test_engine_is_cached_per_database(self):
+        engine = polyjuice_engine.get_engine("default")
+
+        assert polyjuice_engine.get_engine("default") is engine
+        assert engine.dialect.name == "sqlite"
+
+    def test_pool_options(self):
+        engine = polyjuice_engine.get_engine("default", pool_size=2, max_overflow=3)
+
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == 2
+        assert engine.pool._max_overflow == 3
+
+    def test_pool_options_cannot_change(self):
+        polyjuice_engine.get_engine("default", pool_size=2)
+
+        with pytest.raises(errors.EngineAlreadyConfigured):
+            polyjuice_engine.get_engine("default", pool_size=4)
+
+    def test_new_connections_are_set_up_by_django(self):
+        database_wrapper_class = type(connections["default"])
+        with patch.object(
+            database_wrapper_class,
+            "init_connection_state",
+            autospec=True,
+        ) as init_connection_state:
+            with polyjuice_engine.get_engine("default").connect():
+                pass
+
+        init_connection_state.assert_called_once()
+        assert init_connection_state.call_args[0][0] is not connections["default"]
+
+    def test_uses_the_django_database(self):
+        sql.execute(Potion.insert().values(id=1, name="Veritaserum"))
+
+        with polyjuice_engine.get_engine("default").connect() as sqlalchemy_connection:
+            names = [
+                row.name for row in sqlalchemy_connection.execute(select([Potion]))
+            ]
+
+        assert names == ["Veritaserum"]
+
+
+class TestConnect:
+    def test_shares_the_atomic_block_transaction(self):
+        with transaction.atomic():
+            with polyjuice_engine.connect() as sqlalchemy_connection:
+                sqlalchemy_connection.execute(
+                    Potion.insert().values(id=1, name="Veritaserum")
+                )
+                assert sqlalchemy_connection.connection.connection._connection is (
+                    connection.connection
+                )
+
+            assert len(sql.execute(select([Potion]))) == 1
+
+    def test_rollback_is_handled_by_django(self):
+        with pytest.raises(ZeroDivisionError):
+            with transaction.atomic():
+                with polyjuice_engine.connect() as sqlalchemy_connection:
+                    sqlalchemy_connection.execute(
+                        Potion.insert().values(id=1, name="Veritaserum")
+                    )
+                1 / 0
+
+        assert len(sql.execute(select([Potion]))) == 0
+
+    def test_engine_is_built_once_per_connection(self):
+        with transaction.atomic():
+            with polyjuice_engine.connect() as first_connection:
+                pass
+            with polyjuice_engine.connect() as second_connection:
+                pass
+
+        assert second_connection.engine is first_connection.engine
+
+    def test_uses_the_pool_outside_atomic_blocks(self):
+        with polyjuice_engine.connect() as sqlalchemy_connection:
+            sqlalchemy_connection.execute(
+                Potion.insert().values(id=1, name="Veritaserum")
+            )
+
+        assert polyjuice_engine.get_engine().pool.checkedin() == 1
+        assert len(sql.execute(select([Potion]))) == 1
@@ -1,7 +1,7 @@
 from django.db import models
 from polyjuice import errors, fields
 import pytest
-from sqlalchemy import Column, MetaData, Table
+from sqlalchemy import Column, MetaData, Table, types
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql import sqltypes
 
@@ -188,3 +188,51 @@ def test_date_field():
     assert isinstance(django_field, models.DateField)
     assert django_field.auto_now is True
     assert django_field.auto_now_add is True
+
+
+class TestConverters:
+    def teardown(self):
+        fields.CONVERTERS.pop(postgresql.INET, None)
+        fields._resolved_converters.clear()
+
+    def test_subclass_uses_the_converter_of_its_closest_parent(self):
+        column = Column("size", postgresql.DOUBLE_PRECISION)
+
+        _, django_field = fields.to_django_field(TestTable, column)
+
+        assert isinstance(django_field, models.FloatField)
+
+    def test_type_decorator_uses_the_converter_of_its_implementation(self):
+        class LowerCaseString(types.TypeDecorator):
+            impl = sqltypes.String
+
+        column = Column("name", LowerCaseString(50))
+
+        _, django_field = fields.to_django_field(TestTable, column)
+
+        assert isinstance(django_field, models.CharField)
+        assert django_field.max_length == 50
+
+    def test_register_converter(self):
+        def to_ip_address_field(table, column, options):
+            return models.GenericIPAddressField(**options)
+
+        fields.register_converter(postgresql.INET, to_ip_address_field)
+        column = Column("ip_address", postgresql.INET)
+
+        _, django_field = fields.to_django_field(TestTable, column)
+
+        assert isinstance(django_field, models.GenericIPAddressField)
+
+    def test_fail_when_type_is_not_supported(self):
+        column = Column("ip_address", postgresql.INET)
+
+        with pytest.raises(errors.UnsupportedColumnType) as err:
+            fields.to_django_field(TestTable, column)
+
+        assert err.value.args[0] == (
+            "Table `test_table` column `ip_address`: \n"
+            "The column type `INET` cannot be converted to a Django field yet.\n"
+            "You can register your own converter for this type.\n"
+            "Example: polyjuice.fields.register_converter(MyType, lambda table, column, options: models.TextField(**options))"
+        )
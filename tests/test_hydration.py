@@ -0,0 +1,104 @@
+from decimal import Decimal
+import polyjuice
+from polyjuice import errors
+import pytest
+from sqlalchemy import (
+    Column,
+    func,
+    Integer,
+    MetaData,
+    Numeric,
+    select,
+    String,
+    Table,
+)
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "hydration__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False, django_field_name="title"),
+        Column("price", Numeric(precision=10, scale=2), nullable=True),
+    )
+
+    class Meta:
+        app_label = "hydration"
+
+    def describe(self):
+        return f"{self.title} ({self.price})"
+
+
+potions = Potion.__table__
+
+
+@pytest.fixture(autouse=True)
+def tables(create_models):
+    create_models(Potion)
+    Potion.polyjuice.bulk_insert(
+        [
+            {"id": 1, "name": "Veritaserum", "price": Decimal("12.50")},
+            {"id": 2, "name": "Polyjuice", "price": Decimal("30.00")},
+        ]
+    )
+
+
+class TestFromSelect:
+    def test_build_model_instances(self):
+        instances = Potion.polyjuice.from_select(
+            select([potions]).order_by(potions.c.id)
+        )
+
+        assert [potion.describe() for potion in instances] == [
+            "Veritaserum (12.50)",
+            "Polyjuice (30.00)",
+        ]
+        assert all(isinstance(potion, Potion) for potion in instances)
+        assert instances[0]._state.adding is False
+        assert instances[0]._state.db == "default"
+        assert instances[0] == Potion.objects.get(id=1)
+
+    def test_missing_columns_are_deferred(self):
+        [potion] = Potion.polyjuice.from_select(
+            select([potions.c.id, potions.c.name]).where(potions.c.id == 1)
+        )
+
+        assert potion.get_deferred_fields() == {"price"}
+        assert potion.price == Decimal("12.50")
+
+    def test_extra_columns_are_set_as_attributes(self):
+        statement = select(
+            [
+                potions.c.id,
+                potions.c.name,
+                func.count().over().label("potion_count"),
+            ]
+        ).order_by(potions.c.id)
+
+        instances = Potion.polyjuice.from_select(statement)
+
+        assert [potion.potion_count for potion in instances] == [2, 2]
+
+    def test_instances_can_be_saved(self):
+        [potion] = Potion.polyjuice.from_select(
+            select([potions]).where(potions.c.id == 2)
+        )
+
+        potion.title = "Felix Felicis"
+        potion.save()
+
+        assert Potion.objects.get(id=2).title == "Felix Felicis"
+
+    def test_fail_when_primary_key_is_missing(self):
+        with pytest.raises(errors.MissingPrimaryKeyColumn) as err:
+            Potion.polyjuice.from_select(select([potions.c.name]))
+
+        assert err.value.args[0] == (
+            "Table `hydration__potion`: \n"
+            "The select must include the primary key column to build model instances.\n"
+            "Example: Model.polyjuice.from_select(select([table.c.id, table.c.name]))"
+        )
@@ -0,0 +1,168 @@
+import polyjuice
+from polyjuice import identity
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+import threading
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Professor:
+    __table__ = Table(
+        "identity__professor",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(30), nullable=False),
+    )
+
+    class Meta:
+        app_label = "identity"
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "identity__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        Column(
+            "invented_by",
+            Integer,
+            ForeignKey(Professor.__table__.c.id),
+            django_on_delete="CASCADE",
+        ),
+    )
+
+    class Meta:
+        app_label = "identity"
+
+
+@polyjuice.model
+class Wand:
+    __table__ = Table(
+        "identity__wand",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("wood", String(30), nullable=False),
+        django_fast_init=True,
+        django_track_changes=True,
+    )
+
+    class Meta:
+        app_label = "identity"
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(create_models):
+    create_models(Professor, Potion, Wand)
+    Wand.objects.create(id=1, wood="Holly")
+    professor = Professor.objects.create(id=1, name="Severus Snape")
+    Potion.objects.create(id=1, name="Veritaserum", invented_by=professor)
+    Potion.objects.create(id=2, name="Polyjuice", invented_by=professor)
+
+
+class TestIdentityMap:
+    def test_get_by_primary_key(self, count_queries):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+            same_professor, queries = count_queries(lambda: Professor.objects.get(id=1))
+
+        assert same_professor is professor
+        assert queries == 0
+
+    def test_foreign_keys(self, count_queries):
+        with polyjuice.identity_map():
+            potions = list(Potion.objects.order_by("id"))
+            first_professor, first_queries = count_queries(
+                lambda: potions[0].invented_by
+            )
+            second_professor, second_queries = count_queries(
+                lambda: potions[1].invented_by
+            )
+
+        assert second_professor is first_professor
+        assert (first_queries, second_queries) == (1, 0)
+
+    def test_instances_of_querysets_are_registered(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.filter(name="Severus Snape").first()
+
+            assert Professor.objects.get(pk=1) is professor
+
+    def test_first_loaded_instance_is_kept(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+            Professor.objects.all()[0]
+
+            assert Professor.objects.get(pk=1) is professor
+
+    def test_querysets_return_the_mapped_instance(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+
+            assert list(Professor.objects.all())[0] is professor
+            assert Professor.objects.filter(name="Severus Snape").first() is professor
+
+    def test_mapped_instance_keeps_its_changes(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+            professor.name = "Horace Slughorn"
+
+            assert Professor.objects.all()[0].name == "Horace Slughorn"
+
+    def test_fast_init_and_tracked_models(self):
+        with polyjuice.identity_map():
+            wand = Wand.objects.get(pk=1)
+            wand.wood = "Elder"
+
+            assert Wand.objects.all()[0] is wand
+            assert wand.polyjuice_changed_fields() == ["wood"]
+
+            wand.refresh_from_db()
+
+            assert wand.wood == "Holly"
+            assert wand.polyjuice_changed_fields() == []
+
+    def test_nested_blocks_share_the_identity_map(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+            with polyjuice.identity_map():
+                assert Professor.objects.get(pk=1) is professor
+
+    def test_deleted_instances_are_forgotten(self):
+        with polyjuice.identity_map():
+            potion = Potion.objects.get(pk=1)
+            potion.delete()
+
+            with pytest.raises(Potion.DoesNotExist):
+                Potion.objects.get(pk=1)
+
+    def test_refresh_from_db(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+            Professor.objects.filter(pk=1).update(name="Horace Slughorn")
+            professor.refresh_from_db()
+
+            assert professor.name == "Horace Slughorn"
+
+    def test_inactive_outside_of_the_block(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+
+        assert not identity.is_active()
+        assert Professor.objects.get(pk=1) is not professor
+
+    def test_each_thread_gets_its_own_identity_map(self):
+        loaded = []
+
+        def load_professor():
+            loaded.append(identity.is_active())
+
+        with polyjuice.identity_map():
+            thread = threading.Thread(target=load_professor)
+            thread.start()
+            thread.join()
+
+        assert loaded == [False]
@@ -0,0 +1,181 @@
+from django.db import connection, transaction
+import polyjuice
+from polyjuice import errors, ids
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "ids__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+    )
+
+    class Meta:
+        app_label = "ids"
+
+
+@polyjuice.model
+class Ingredient:
+    __table__ = Table(
+        "ids__ingredient",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        Column(
+            "potion",
+            Integer,
+            ForeignKey(Potion.__table__.c.id),
+            django_on_delete="CASCADE",
+            nullable=False,
+        ),
+    )
+
+    class Meta:
+        app_label = "ids"
+
+
+@polyjuice.model
+class Spell:
+    __table__ = Table(
+        "ids__spell",
+        metadata,
+        Column("name", String(50), primary_key=True),
+    )
+
+    class Meta:
+        app_label = "ids"
+
+
+class Rollback(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def tables(create_models):
+    create_models(Potion, Ingredient)
+    yield
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {ids.ALLOCATOR_TABLE}")
+
+
+class TestAllocateIds:
+    def test_allocate_from_the_first_id(self):
+        assert Potion.polyjuice.allocate_ids(3) == [1, 2, 3]
+
+    def test_allocations_never_overlap(self):
+        first_ids = Potion.polyjuice.allocate_ids(3)
+
+        assert Potion.polyjuice.allocate_ids(2) == [4, 5]
+        assert first_ids == [1, 2, 3]
+
+    def test_tables_have_their_own_ids(self):
+        Potion.polyjuice.allocate_ids(3)
+
+        assert Ingredient.polyjuice.allocate_ids(1) == [1]
+
+    def test_rows_inserted_without_allocated_ids_are_skipped(self):
+        Potion.polyjuice.allocate_ids(3)
+        Potion.objects.create(id=10, name="Veritaserum")
+
+        assert Potion.polyjuice.allocate_ids(2) == [11, 12]
+
+    def test_allocator_table_created_in_a_rolled_back_transaction(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {ids.ALLOCATOR_TABLE}")
+        ids._allocator_tables.discard(connection.alias)
+
+        with pytest.raises(Rollback):
+            with transaction.atomic():
+                Potion.polyjuice.allocate_ids(1)
+                raise Rollback
+
+        assert Potion.polyjuice.allocate_ids(2) == [1, 2]
+
+    def test_allocator_table_created_on_its_own_connection(self, monkeypatch):
+        # Backends without transactional DDL commit the current transaction on `CREATE TABLE`.
+        monkeypatch.setattr(connection.features, "can_rollback_ddl", False)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {ids.ALLOCATOR_TABLE}")
+        ids._allocator_tables.discard(connection.alias)
+
+        with pytest.raises(Rollback):
+            with transaction.atomic():
+                assert Potion.polyjuice.allocate_ids(1) == [1]
+                raise Rollback
+
+        assert ids.ALLOCATOR_TABLE in connection.introspection.table_names()
+        assert connection.alias in ids._allocator_tables
+        assert Potion.polyjuice.allocate_ids(2) == [1, 2]
+
+    def test_concurrent_first_allocations(self):
+        concurrent_ids = []
+
+        def allocate_concurrently(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if sql.startswith("UPDATE") and not concurrent_ids:
+                concurrent_ids.append(None)
+                concurrent_ids[:] = Potion.polyjuice.allocate_ids(3)
+            return result
+
+        with connection.execute_wrapper(allocate_concurrently):
+            allocated_ids = Potion.polyjuice.allocate_ids(2)
+
+        assert concurrent_ids == [1, 2, 3]
+        assert allocated_ids == [4, 5]
+
+    def test_nothing_to_allocate(self):
+        assert Potion.polyjuice.allocate_ids(0) == []
+
+    def test_fail_without_an_integer_primary_key(self):
+        with pytest.raises(errors.InvalidIdAllocationTable) as err:
+            Spell.polyjuice.allocate_ids(1)
+
+        assert err.value.args[0] == (
+            "Table `ids__spell`: \n"
+            "Primary keys can only be allocated for a table with a single integer primary key column.\n"
+            "Example: Table('potions', metadata, Column('id', Integer, primary_key=True))"
+        )
+
+
+class TestBulkCreate:
+    def test_instances_get_their_primary_key(self):
+        potions = Potion.polyjuice.bulk_create(
+            [Potion(name="Veritaserum"), Potion(name="Polyjuice")]
+        )
+
+        assert [potion.id for potion in potions] == [1, 2]
+        assert not potions[0]._state.adding
+        assert list(Potion.objects.order_by("id").values_list("id", "name")) == [
+            (1, "Veritaserum"),
+            (2, "Polyjuice"),
+        ]
+
+    def test_children_can_be_inserted_right_after(self):
+        potions = Potion.polyjuice.bulk_create(
+            Potion(name=name) for name in ["Veritaserum", "Polyjuice"]
+        )
+        Ingredient.polyjuice.bulk_create(
+            [
+                Ingredient(name="Lacewing fly", potion=potions[1]),
+                Ingredient(name="Leech", potion=potions[1]),
+            ]
+        )
+
+        assert list(
+            Potion.objects.get(name="Polyjuice")
+            .ingredient_set.order_by("id")
+            .values_list("name", flat=True)
+        ) == ["Lacewing fly", "Leech"]
+
+    def test_primary_keys_already_set_are_kept(self):
+        potions = Potion.polyjuice.bulk_create(
+            [Potion(id=7, name="Veritaserum"), Potion(name="Polyjuice")]
+        )
+
+        assert [potion.id for potion in potions] == [7, 1]
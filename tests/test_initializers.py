@@ -0,0 +1,151 @@
+from datetime import date
+from django.db import models
+from django.db.models.signals import post_init
+import polyjuice
+import pytest
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Professor:
+    __table__ = Table(
+        "initializers__professor",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(30), nullable=False),
+        django_fast_init=True,
+    )
+
+    class Meta:
+        app_label = "initializers"
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "initializers__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False, django_field_name="title"),
+        Column("brewed_at", Date, nullable=True),
+        Column(
+            "invented_by",
+            Integer,
+            ForeignKey(Professor.__table__.c.id),
+            django_on_delete="CASCADE",
+            nullable=True,
+        ),
+        django_fast_init=True,
+    )
+
+    class Meta:
+        app_label = "initializers"
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(create_models):
+    create_models(Professor, Potion)
+    professor = Professor.objects.create(id=1, name="Severus Snape")
+    Potion.objects.create(
+        id=1, title="Veritaserum", brewed_at=date(1998, 5, 2), invented_by=professor
+    )
+
+
+def standard_instance(django_model, *args, **kwargs):
+    # Instance built by the Django implementation, for comparison.
+    instance = django_model.__new__(django_model)
+    models.Model.__init__(instance, *args, **kwargs)
+    return instance
+
+
+def get_state(instance):
+    state = dict(instance.__dict__)
+    model_state = state.pop("_state")
+    return state, model_state.adding, model_state.db
+
+
+class TestInit:
+    def test_positional_arguments(self):
+        values = (1, "Veritaserum", date(1998, 5, 2), 1)
+
+        potion = Potion(*values)
+
+        assert get_state(potion) == get_state(standard_instance(Potion, *values))
+        assert list(potion.__dict__) == [
+            "_state",
+            "id",
+            "title",
+            "brewed_at",
+            "invented_by_id",
+        ]
+
+    def test_keyword_arguments_use_django_implementation(self):
+        potion = Potion(title="Veritaserum")
+
+        assert get_state(potion) == get_state(
+            standard_instance(Potion, title="Veritaserum")
+        )
+        assert potion.id is None
+
+    def test_values_are_compared_to_deferred_by_identity(self):
+        class ArrayLike:
+            def __eq__(self, other):
+                raise ValueError("The truth value of an array is ambiguous.")
+
+        value = ArrayLike()
+        potion = Potion(1, value, None, None)
+
+        assert potion.title is value
+
+    def test_instances_can_be_saved(self):
+        Potion(2, "Polyjuice", None, 1).save()
+
+        assert Potion.objects.get(pk=2).title == "Polyjuice"
+
+
+class TestFromDb:
+    def test_same_instance_as_django(self):
+        potion = Potion.objects.get(pk=1)
+        values = [1, "Veritaserum", date(1998, 5, 2), 1]
+        standard = standard_instance(Potion, *values)
+        standard._state.adding = False
+        standard._state.db = "default"
+
+        assert get_state(potion) == get_state(standard)
+        assert potion.invented_by.name == "Severus Snape"
+
+    def test_deferred_fields(self):
+        potion = Potion.objects.only("id", "title").get(pk=1)
+
+        assert potion.get_deferred_fields() == {"brewed_at", "invented_by_id"}
+        assert potion.brewed_at == date(1998, 5, 2)
+
+    def test_refresh_from_db(self):
+        potion = Potion.objects.get(pk=1)
+        Potion.objects.filter(pk=1).update(title="Polyjuice")
+
+        potion.refresh_from_db()
+
+        assert potion.title == "Polyjuice"
+
+    def test_identity_map(self):
+        with polyjuice.identity_map():
+            professor = Professor.objects.get(pk=1)
+
+            assert Potion.objects.get(pk=1).invented_by is professor
+
+    def test_init_receivers_use_django_implementation(self):
+        initialized = []
+
+        def on_post_init(sender, instance, **kwargs):
+            initialized.append(instance)
+
+        post_init.connect(on_post_init, sender=Professor)
+        try:
+            professor = Professor.objects.get(pk=1)
+        finally:
+            post_init.disconnect(on_post_init, sender=Professor)
+
+        assert initialized == [professor]
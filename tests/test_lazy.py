@@ -0,0 +1,90 @@
+from django.db import models
+import itertools
+import polyjuice
+from polyjuice import lazy
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+
+app_labels = (f"lazy_{number}" for number in itertools.count())
+
+
+class TestLazyModel:
+    def setup(self):
+        self.metadata = MetaData()
+        app_label = next(app_labels)
+
+        @polyjuice.model(lazy=True)
+        class Professor:
+            __table__ = Table(
+                "lazy__professor",
+                self.metadata,
+                Column("id", Integer, primary_key=True),
+                Column("name", String(30), nullable=False),
+            )
+
+            class Meta:
+                pass
+
+            Meta.app_label = app_label
+
+            def welcome(self):
+                return f"Welcome to my class, I am Pr. {self.name}."
+
+        self.Professor = Professor
+
+    def teardown(self):
+        self.Professor.materialize()
+
+    def test_table_is_available_without_building_the_model(self):
+        assert self.Professor.__table__ is self.metadata.tables["lazy__professor"]
+        assert self.Professor._model is None
+        assert self.Professor in lazy._pending
+
+    def test_built_on_attribute_access(self):
+        meta = self.Professor._meta
+
+        assert meta.db_table == "lazy__professor"
+        assert issubclass(self.Professor._model, models.Model)
+        assert self.Professor not in lazy._pending
+
+    def test_built_on_instantiation(self):
+        professor = self.Professor(name="Severus Snape")
+
+        assert professor.welcome() == "Welcome to my class, I am Pr. Severus Snape."
+        assert isinstance(professor, self.Professor)
+
+    def test_decorating_the_same_table_returns_the_proxy(self):
+        table = self.Professor.__table__
+
+        @polyjuice.model
+        class ProfessorReloaded:
+            __table__ = table
+
+        assert ProfessorReloaded is self.Professor
+
+    def test_materialize_all(self):
+        lazy.materialize_all()
+
+        assert self.Professor._model is not None
+        assert lazy._pending == []
+
+    def test_related_lazy_model_is_built_with_its_foreign_key(self):
+        @polyjuice.model
+        class Potion:
+            __table__ = Table(
+                "lazy__potion",
+                self.metadata,
+                Column("id", Integer, primary_key=True),
+                Column(
+                    "invented_by",
+                    Integer,
+                    ForeignKey("lazy__professor.id"),
+                    django_on_delete="CASCADE",
+                ),
+            )
+
+            class Meta:
+                app_label = next(app_labels)
+
+        invented_by = Potion._meta.get_field("invented_by")
+
+        assert invented_by.remote_field.model is self.Professor._model
@@ -1,14 +1,59 @@
-from django.db import models
+from django.db import connection, models
+import polyjuice
 from polyjuice import errors, meta
 import pytest
-from sqlalchemy import Column, func, Index, Integer, MetaData, String, Table
+from sqlalchemy import (
+    and_,
+    Boolean,
+    Column,
+    func,
+    Index,
+    Integer,
+    MetaData,
+    or_,
+    String,
+    Table,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Wizard:
+    __table__ = Table(
+        "meta__wizard",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50)),
+        Column("house", String(50)),
+        Column("age", Integer),
+        Index(
+            "meta__wizard_name",
+            "name",
+            sqlite_where=and_(
+                Column("name") != "Voldemort",
+                Column("house").notin_(["Slytherin"]),
+                Column("age").isnot(17),
+            ),
+        ),
+    )
+
+    class Meta:
+        app_label = "meta"
 
 
 class TestConvertIndex:
     def setup(self):
         metadata = MetaData()
         self.table = Table(
-            "test_table", metadata, Column("name", String(50)), Column("age", Integer),
+            "test_table",
+            metadata,
+            Column("name", String(50)),
+            Column("age", Integer),
+            Column("wizard_id", Integer, django_field_name="wizard"),
+            Column("is_brewed", Boolean),
         )
 
     def test_single_field(self):
@@ -35,6 +80,120 @@ class TestConvertIndex:
         assert django_index.name == "my_super_index"
         assert django_index.fields == ["-name"]
 
+    def test_ascending_index(self):
+        index = Index("my_super_index", self.table.c.name.asc())
+
+        django_index = meta.convert_index(self.table, index)
+
+        assert django_index.fields == ["name"]
+
+    def test_uses_field_names(self):
+        index = Index("my_super_index", self.table.c.wizard_id.desc())
+
+        django_index = meta.convert_index(self.table, index)
+
+        assert django_index.fields == ["-wizard"]
+
+    def test_partial_index(self):
+        index = Index(
+            "my_super_index",
+            self.table.c.name,
+            postgresql_where=(self.table.c.age >= 17) & self.table.c.is_brewed,
+        )
+
+        django_index = meta.convert_index(self.table, index)
+
+        assert django_index.condition == models.Q(age__gte=17) & models.Q(
+            is_brewed=True
+        )
+
+    def test_partial_index_conditions(self):
+        index = Index(
+            "my_super_index",
+            self.table.c.name,
+            sqlite_where=or_(
+                self.table.c.wizard_id.is_(None),
+                self.table.c.age.in_([1, 2]),
+                self.table.c.name != "Voldemort",
+            ),
+        )
+
+        django_index = meta.convert_index(self.table, index)
+
+        assert django_index.condition == (
+            models.Q(wizard__isnull=True)
+            | models.Q(age__in=[1, 2])
+            | (~models.Q(name="Voldemort") & models.Q(name__isnull=False))
+        )
+
+    def test_negated_conditions_exclude_null(self, create_models):
+        create_models(Wizard)
+        Wizard.objects.bulk_create(
+            [
+                Wizard(name=name, house=house, age=age)
+                for name in ["Harry", "Voldemort", None]
+                for house in ["Gryffindor", "Slytherin", None]
+                for age in [11, 17, None]
+            ]
+        )
+        (index,) = Wizard.__table__.indexes
+        (django_index,) = Wizard._meta.indexes
+
+        with connection.schema_editor(collect_sql=True) as editor:
+            editor.add_index(Wizard, django_index)
+        django_sql = editor.collected_sql[0]
+        sqlalchemy_sql = str(CreateIndex(index).compile(dialect=sqlite.dialect()))
+
+        with connection.cursor() as cursor:
+            selected = []
+            for create_sql in [django_sql, sqlalchemy_sql]:
+                condition = create_sql.rstrip(";").split(" WHERE ", 1)[1]
+                cursor.execute(f"SELECT id FROM meta__wizard WHERE {condition}")
+                selected.append(sorted(row[0] for row in cursor.fetchall()))
+
+        assert selected[0] == selected[1]
+        assert len(selected[0]) == 2
+
+    def test_index_method(self):
+        from django.contrib.postgres.indexes import GinIndex
+
+        index = Index("my_super_index", self.table.c.name, postgresql_using="gin")
+
+        django_index = meta.convert_index(self.table, index)
+
+        assert type(django_index) is GinIndex
+        assert django_index.fields == ["name"]
+
+    def test_operator_classes(self):
+        index = Index(
+            "my_super_index",
+            self.table.c.name,
+            self.table.c.age,
+            postgresql_ops={"name": "varchar_pattern_ops"},
+        )
+
+        django_index = meta.convert_index(self.table, index)
+
+        assert django_index.opclasses == ["varchar_pattern_ops", ""]
+
+    def test_fail_when_using_unsupported_index_method(self):
+        index = Index("my_super_index", self.table.c.name, postgresql_using="bloom")
+
+        with pytest.raises(errors.UnsupportedIndexOption) as err:
+            meta.convert_index(self.table, index)
+
+        assert "The option `postgresql_using` cannot be represented" in str(err.value)
+
+    def test_fail_when_using_unsupported_condition(self):
+        index = Index(
+            "my_super_index",
+            self.table.c.name,
+            postgresql_where=func.length(self.table.c.name) > 3,
+        )
+
+        with pytest.raises(errors.UnsupportedIndexOption):
+            meta.convert_index(self.table, index)
+
     def test_fail_when_using_unsupported_functional_index(self):
         index = Index("my_super_index", func.lower(self.table.c.name))
 
@@ -65,7 +224,11 @@ class TestConvertIndex:
 class TestBuildMetaClass:
     def setup(self):
         metadata = MetaData()
-        self.table = Table("test_table", metadata, Column("name", String(50)),)
+        self.table = Table(
+            "test_table",
+            metadata,
+            Column("name", String(50)),
+        )
 
         class Meta:
             pass
@@ -84,6 +247,29 @@ class TestBuildMetaClass:
 
         assert len(Meta.indexes) == 1
 
+    def test_unsupported_indexes_are_listed(self):
+        functional_index = Index("my_functional_index", func.lower(self.table.c.name))
+        Index("my_super_index", self.table.c.name)
+
+        Meta = meta.build_meta_class(self.table, self.user_defined_meta)
+        unsupported_indexes = meta.get_unsupported_indexes(self.table)
+
+        assert [index.name for index in Meta.indexes] == ["my_super_index"]
+        assert len(unsupported_indexes) == 1
+        assert unsupported_indexes[0].index is functional_index
+        assert (
+            "Only descending index is supported yet." in unsupported_indexes[0].reason
+        )
+
+    def test_column_indexes_are_declared_on_fields(self):
+        table = Table(
+            "test_column_index", MetaData(), Column("name", String(50), index=True)
+        )
+
+        Meta = meta.build_meta_class(table, self.user_defined_meta)
+
+        assert Meta.indexes == []
+
     def test_fail_when_indexes_field_is_overriden(self):
         class Meta:
             indexes = [models.Index(name="bad_index", fields=["some_field"])]
@@ -112,3 +298,13 @@ class TestBuildMetaClass:
             meta.build_meta_class(self.table, Meta)
 
         assert err.value.args[0] == "You cannot mimic an abstract model."
+
+    def test_user_defined_options_are_kept(self):
+        class Meta:
+            app_label = "hogwarts"
+            ordering = ["name"]
+
+        Meta = meta.build_meta_class(self.table, Meta)
+
+        assert Meta.app_label == "hogwarts"
+        assert Meta.ordering == ["name"]
@@ -2,14 +2,15 @@ from django.db import models
 import polyjuice
 from polyjuice import errors
 import pytest
-from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
 from unittest.mock import Mock, patch
 
 
 class TestModel:
     def test_success(self):
         class ModelMock:
-            pass
+            def refresh_from_db(self, using=None, fields=None):
+                pass
 
         with patch("polyjuice.models") as model_module:
             model_module.Model = ModelMock
@@ -33,6 +34,26 @@ class TestModel:
         assert hasattr(Professor, "welcome")
         # TODO: Assert `Professor` inherits from models.Model
 
+    def test_same_table_returns_the_cached_model(self):
+        table = Table(
+            "registry__professor", MetaData(), Column("id", Integer, primary_key=True)
+        )
+
+        @polyjuice.model
+        class Professor:
+            __table__ = table
+
+            class Meta:
+                app_label = "registry"
+
+        @polyjuice.model
+        class ProfessorReloaded:
+            __table__ = table
+
+        assert ProfessorReloaded is Professor
+        assert polyjuice.get_model_for_table(table) is Professor
+        assert polyjuice.get_table_for_model(Professor) is table
+
     def test_fail_when_table_definition_is_missing(self):
 
         with pytest.raises(errors.MissingTableDefinition) as err:
@@ -62,3 +83,62 @@ class TestModel:
             "which corresponds to its table schema.\n"
             "Cf: https://github.com/ducdetronquito/polyjuice#example"
         )
+
+
+class TestModelsFromMetadata:
+    def setup(self):
+        self.metadata = MetaData()
+        # Declared before its related table to check the dependency ordering.
+        Table(
+            "bulk__potion",
+            self.metadata,
+            Column("id", Integer, primary_key=True),
+            Column(
+                "invented_by",
+                Integer,
+                ForeignKey("bulk__professor.id"),
+                django_on_delete="CASCADE",
+            ),
+        )
+        Table(
+            "bulk__professor",
+            self.metadata,
+            Column("id", Integer, primary_key=True),
+            Column("name", String(30), nullable=False),
+        )
+
+    def test_success(self):
+        django_models = polyjuice.models_from_metadata(self.metadata, "bulk")
+
+        Professor = django_models["bulk__professor"]
+        Potion = django_models["bulk__potion"]
+        assert issubclass(Professor, models.Model)
+        assert Professor.__name__ == "Professor"
+        assert Professor.__table__ is self.metadata.tables["bulk__professor"]
+        assert Professor._meta.app_label == "bulk"
+        assert Professor._meta.db_table == "bulk__professor"
+        assert Potion.__module__ == "bulk.models"
+
+    def test_foreign_keys_point_at_model_classes(self):
+        django_models = polyjuice.models_from_metadata(self.metadata, "bulk_fk")
+
+        invented_by = django_models["bulk__potion"]._meta.get_field("invented_by")
+
+        assert invented_by.remote_field.model is django_models["bulk__professor"]
+
+    def test_fail_when_two_tables_give_the_same_model_name(self):
+        Table("shop__potion", self.metadata, Column("id", Integer, primary_key=True))
+
+        with pytest.raises(errors.DuplicateModelName) as err:
+            polyjuice.models_from_metadata(self.metadata, "bulk_duplicate")
+
+        assert err.value.args[0] == (
+            "Table `bulk__potion`: \n"
+            "Its model would be named `Potion`, like the model of the table "
+            "`shop__potion`, in the app `bulk_duplicate`.\n"
+            "Convert them in different apps, or declare one of them with `polyjuice.model` "
+            "and a placeholder class of another name."
+        )
+        assert (
+            polyjuice.get_model_for_table(self.metadata.tables["bulk__potion"]) is None
+        )
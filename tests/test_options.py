@@ -5,7 +5,6 @@ import pytest
 from sqlalchemy import Column, MetaData, Table
 from sqlalchemy.sql.sqltypes import Integer, Date
 
-
 metadata = MetaData()
 TestTable = Table("test_table", metadata)
 
@@ -18,6 +17,14 @@ def test_blank():
     assert django_field.blank is True
 
 
+def test_db_index():
+    column = Column("age", Integer, index=True)
+
+    _, django_field = fields.to_django_field(TestTable, column)
+
+    assert django_field.db_index is True
+
+
 def test_editable():
     column = Column("age", Integer, django_editable=False)
 
@@ -84,9 +91,10 @@ class TestDbColumn:
     def test_success(self):
         column = Column("age", Integer, django_field_name="my_age")
 
-        name, _ = fields.to_django_field(TestTable, column)
+        name, django_field = fields.to_django_field(TestTable, column)
 
         assert name == "my_age"
+        assert django_field.db_column == "age"
 
     def test_fail_when_field_name_is_empty(self):
         column = Column("age", Integer, django_field_name="")
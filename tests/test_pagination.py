@@ -0,0 +1,177 @@
+import base64
+from datetime import date, timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import json
+import polyjuice
+from polyjuice import errors
+import pytest
+from sqlalchemy import Column, Date, Index, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+START = date(1998, 5, 2)
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "pagination__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False, django_field_name="title"),
+        Column("price", Integer, nullable=False),
+        Column("brewed_at", Date, nullable=False, index=True),
+        Column("color", String(20), nullable=True),
+        Index("potion_price_name", "price", "name"),
+    )
+
+    class Meta:
+        app_label = "pagination"
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(create_models):
+    create_models(Potion)
+    Potion.polyjuice.bulk_insert(
+        {
+            "id": number,
+            "name": f"Potion {number}",
+            "price": number % 3,
+            "brewed_at": START - timedelta(days=number),
+        }
+        for number in range(1, 11)
+    )
+
+
+def make_cursor(order_by, values):
+    serialized = json.dumps({"order_by": order_by, "values": values})
+    return base64.urlsafe_b64encode(serialized.encode()).decode()
+
+
+def read_pages(order_by, limit):
+    ids = []
+    cursor = None
+    while True:
+        page = Potion.polyjuice.paginate(order_by, after=cursor, limit=limit)
+        ids.append([potion.id for potion in page.items])
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+
+class TestPaginate:
+    def test_primary_key(self):
+        assert read_pages([], limit=4) == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+
+    def test_descending(self):
+        assert read_pages(["-id"], limit=4) == [[10, 9, 8, 7], [6, 5, 4, 3], [2, 1]]
+
+    def test_rows_with_the_same_values_are_ordered_by_primary_key(self):
+        assert read_pages(["price"], limit=3) == [
+            [3, 6, 9],
+            [1, 4, 7],
+            [10, 2, 5],
+            [8],
+        ]
+
+    def test_several_fields_in_opposite_directions(self):
+        assert read_pages(["-price", "-title"], limit=4) == [
+            [8, 5, 2, 7],
+            [4, 10, 1, 9],
+            [6, 3],
+        ]
+
+    def test_dates(self):
+        assert read_pages(["brewed_at"], limit=5) == [[10, 9, 8, 7, 6], [5, 4, 3, 2, 1]]
+
+    def test_last_page_has_no_cursor(self):
+        page = Potion.polyjuice.paginate(["id"], limit=10)
+
+        assert len(page.items) == 10
+        assert page.next_cursor is None
+
+    def test_queryset(self):
+        page = Potion.polyjuice.paginate(
+            ["id"], limit=2, queryset=Potion.objects.filter(price=0)
+        )
+        next_page = Potion.polyjuice.paginate(
+            ["id"],
+            after=page.next_cursor,
+            limit=2,
+            queryset=Potion.objects.filter(price=0),
+        )
+
+        assert [potion.id for potion in page.items] == [3, 6]
+        assert [potion.id for potion in next_page.items] == [9]
+
+    def test_warn_when_no_index_covers_the_ordering(self):
+        with pytest.warns(errors.UnindexedOrderingWarning) as record:
+            Potion.polyjuice.paginate(["title"], limit=2)
+
+        assert record[0].filename == __file__
+
+    def test_chunks_warn_when_no_index_covers_the_ordering(self):
+        with pytest.warns(errors.UnindexedOrderingWarning) as record:
+            list(Potion.polyjuice.chunks(["title"], chunk_size=2))
+
+        assert record[0].filename == __file__
+
+    def test_refuse_when_no_index_covers_the_ordering_in_strict_mode(self):
+        with pytest.raises(errors.UnindexedOrdering) as err:
+            Potion.polyjuice.paginate(["price", "-title"], limit=2, strict=True)
+
+        assert err.value.args[0] == (
+            "Table `pagination__potion`: \n"
+            "No index covers the ordering ['price', '-title', '-id'].\n"
+            "Keyset pagination requires an index whose first columns are the ordering columns, "
+            "in the same or in the opposite directions."
+        )
+
+    def test_fail_on_nullable_fields(self):
+        with pytest.raises(errors.NullableOrderingField):
+            Potion.polyjuice.paginate(["color"])
+
+    @pytest.mark.parametrize("cursor", ["garbage", "e30"])
+    def test_fail_on_invalid_cursors(self, cursor):
+        with pytest.raises(errors.InvalidCursor):
+            Potion.polyjuice.paginate(["id"], after=cursor)
+
+    @pytest.mark.parametrize("values", [[1], [1, 2, 3], [None, 2], [1, None]])
+    def test_fail_on_cursors_of_invalid_values(self, values):
+        cursor = make_cursor(["price", "id"], values)
+
+        with pytest.raises(errors.InvalidCursor):
+            Potion.polyjuice.paginate(["price"], after=cursor)
+
+    def test_range_is_bounded_by_the_first_field(self):
+        page = Potion.polyjuice.paginate(["-price"], limit=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            Potion.polyjuice.paginate(["-price"], after=page.next_cursor, limit=3)
+
+        assert '"pagination__potion"."price" <= 2 AND (' in queries[0]["sql"]
+
+    def test_fail_on_cursors_of_another_ordering(self):
+        page = Potion.polyjuice.paginate(["id"], limit=2)
+
+        with pytest.raises(errors.InvalidCursor):
+            Potion.polyjuice.paginate(["-id"], after=page.next_cursor)
+
+
+class TestChunks:
+    def test_every_row_is_read_once(self):
+        chunks = list(Potion.polyjuice.chunks(chunk_size=4))
+
+        assert [[potion.id for potion in chunk] for chunk in chunks] == [
+            [1, 2, 3, 4],
+            [5, 6, 7, 8],
+            [9, 10],
+        ]
+
+    def test_ordering_and_queryset(self):
+        chunks = Potion.polyjuice.chunks(
+            ["price"], chunk_size=2, queryset=Potion.objects.exclude(price=1)
+        )
+
+        assert [potion.id for chunk in chunks for potion in chunk] == [3, 6, 9, 2, 5, 8]
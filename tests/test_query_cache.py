@@ -0,0 +1,208 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test.utils import override_settings
+import polyjuice
+from polyjuice import engine, query_cache, registry, sql
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, select, String, Table
+
+metadata = MetaData()
+Professor = Table(
+    "query_cache__professor",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(30), nullable=False),
+)
+Potion = Table(
+    "query_cache__potion",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False),
+    Column(
+        "invented_by",
+        Integer,
+        ForeignKey(Professor.c.id),
+        django_on_delete="CASCADE",
+        nullable=True,
+    ),
+)
+Wand = Table(
+    "query_cache__wand",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column(
+        "owner",
+        Integer,
+        ForeignKey(Professor.c.id, ondelete="CASCADE"),
+        django_on_delete="DB_CASCADE",
+        nullable=False,
+    ),
+)
+
+
+@pytest.fixture(scope="module")
+def django_models():
+    with override_settings(POLYJUICE_QUERY_CACHE="default"):
+        django_models = polyjuice.models_from_metadata(metadata, "query_cache")
+        yield django_models
+    for table in metadata.sorted_tables:
+        registry.unregister(table)
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(django_models, create_models):
+    create_models(*django_models.values())
+    yield
+    cache.clear()
+    sql.clear_compiled_cache()
+
+
+class TestExecute:
+    def test_results_are_cached(self, count_queries):
+        sql.execute(Potion.insert().values(id=1, name="Veritaserum"))
+        statement = select([Potion.c.name])
+
+        first, first_queries = count_queries(lambda: query_cache.execute(statement))
+        second, second_queries = count_queries(lambda: query_cache.execute(statement))
+
+        assert first_queries == 1
+        assert second_queries == 0
+        assert second.fetchall() == [("Veritaserum",)]
+        assert second.first().name == "Veritaserum"
+
+    def test_keyed_by_parameters(self):
+        sql.execute(Potion.insert().values(id=1, name="Veritaserum"))
+        sql.execute(Potion.insert().values(id=2, name="Polyjuice"))
+
+        def get_name(potion_id):
+            statement = select([Potion.c.name]).where(Potion.c.id == potion_id)
+            return query_cache.execute(statement, cache_key="get_name").scalar()
+
+        assert get_name(1) == "Veritaserum"
+        assert get_name(2) == "Polyjuice"
+
+    def test_disabled_without_setting(self, count_queries):
+        statement = select([Potion.c.name])
+
+        with override_settings(POLYJUICE_QUERY_CACHE=None):
+            query_cache.execute(statement)
+            _, queries = count_queries(lambda: query_cache.execute(statement))
+
+        assert queries == 1
+
+    def test_not_stored_inside_transactions(self, count_queries):
+        statement = select([Potion.c.name])
+
+        with transaction.atomic():
+            query_cache.execute(statement)
+        _, queries = count_queries(lambda: query_cache.execute(statement))
+
+        assert queries == 1
+
+
+class TestInvalidation:
+    def test_core_dml(self):
+        statement = select([Potion.c.name])
+        assert query_cache.execute(statement).fetchall() == []
+
+        sql.execute(Potion.insert().values(id=1, name="Veritaserum"))
+
+        assert query_cache.execute(statement).fetchall() == [("Veritaserum",)]
+
+    def test_model_save_and_delete(self, django_models):
+        ProfessorModel = django_models["query_cache__professor"]
+        statement = select([Professor.c.name])
+        assert query_cache.execute(statement).fetchall() == []
+
+        professor = ProfessorModel.objects.create(name="Severus Snape")
+        assert query_cache.execute(statement).fetchall() == [("Severus Snape",)]
+
+        professor.delete()
+        assert query_cache.execute(statement).fetchall() == []
+
+    def test_bulk_insert(self, django_models):
+        PotionModel = django_models["query_cache__potion"]
+        statement = select([Potion.c.name])
+        assert query_cache.execute(statement).fetchall() == []
+
+        PotionModel.polyjuice.bulk_insert([{"id": 1, "name": "Veritaserum"}])
+
+        assert query_cache.execute(statement).fetchall() == [("Veritaserum",)]
+
+    def test_joined_tables(self):
+        statement = select([Potion.c.name, Professor.c.name]).select_from(
+            Potion.join(Professor)
+        )
+        sql.execute(Professor.insert().values(id=1, name="Severus Snape"))
+        sql.execute(Potion.insert().values(id=1, name="Veritaserum", invented_by=1))
+        query_cache.execute(statement)
+
+        sql.execute(Professor.update().values(name="Horace Slughorn"))
+
+        assert query_cache.execute(statement).fetchall() == [
+            ("Veritaserum", "Horace Slughorn")
+        ]
+
+    def test_other_tables_are_kept(self, count_queries):
+        statement = select([Potion.c.name])
+        query_cache.execute(statement)
+
+        sql.execute(Professor.insert().values(id=1, name="Severus Snape"))
+        _, queries = count_queries(lambda: query_cache.execute(statement))
+
+        assert queries == 0
+
+    def test_evicted_generation(self, count_queries):
+        statement = select([Potion.c.name])
+        query_cache.execute(statement)
+
+        cache.delete_many(
+            [key for key in cache._cache if query_cache.GENERATION_KEY_PREFIX in key]
+        )
+        query_cache.invalidate([Potion])
+        _, queries = count_queries(lambda: query_cache.execute(statement))
+
+        assert queries == 1
+
+    def test_queryset_update_and_bulk_create(self, django_models):
+        PotionModel = django_models["query_cache__potion"]
+        statement = select([Potion.c.name])
+
+        PotionModel.objects.bulk_create([PotionModel(id=1, name="Veritaserum")])
+        assert query_cache.execute(statement).fetchall() == [("Veritaserum",)]
+
+        PotionModel.objects.filter(pk=1).update(name="Polyjuice")
+        assert query_cache.execute(statement).fetchall() == [("Polyjuice",)]
+
+    def test_queryset_raw_delete(self, django_models):
+        PotionModel = django_models["query_cache__potion"]
+        statement = select([Potion.c.name])
+        sql.execute(Potion.insert().values(id=1, name="Veritaserum"))
+        query_cache.execute(statement)
+
+        PotionModel.objects.all()._raw_delete("default")
+
+        assert query_cache.execute(statement).fetchall() == []
+
+    def test_tables_written_by_database_cascades(self, count_queries):
+        statement = select([Wand.c.id])
+        query_cache.execute(statement)
+
+        sql.execute(Professor.delete())
+        _, queries = count_queries(lambda: query_cache.execute(statement))
+
+        assert queries == 1
+
+    def test_engine_connections(self):
+        statement = select([Potion.c.name])
+        query_cache.execute(statement)
+
+        with engine.connect() as connection:
+            connection.execute(Potion.insert().values(id=1, name="Veritaserum"))
+
+        assert query_cache.execute(statement).fetchall() == [("Veritaserum",)]
+
+
+def test_written_tables():
+    assert set(query_cache.get_written_tables([Professor])) == {Professor, Wand}
+    assert query_cache.get_written_tables([Potion]) == [Potion]
@@ -0,0 +1,38 @@
+from polyjuice import registry
+from sqlalchemy import Column, Integer, MetaData, Table
+
+
+class TestRegistry:
+    def setup(self):
+        metadata = MetaData()
+        self.table = Table("test_table", metadata, Column("id", Integer))
+
+        class MyModel:
+            pass
+
+        self.model = MyModel
+        registry.register(self.table, self.model)
+
+    def teardown(self):
+        registry.unregister(self.table)
+
+    def test_get_model_for_table(self):
+        assert registry.get_model_for_table(self.table) is self.model
+
+    def test_get_model_for_table_key(self):
+        assert registry.get_model_for_table("test_table") is self.model
+
+    def test_get_table_for_model(self):
+        assert registry.get_table_for_model(self.model) is self.table
+
+    def test_tables_with_the_same_key_are_not_mixed_up(self):
+        other_table = Table("test_table", MetaData(), Column("id", Integer))
+
+        assert registry.get_model_for_table(other_table) is None
+
+    def test_unregister(self):
+        registry.unregister(self.table)
+
+        assert registry.get_model_for_table(self.table) is None
+        assert registry.get_model_for_table("test_table") is None
+        assert registry.get_table_for_model(self.model) is None
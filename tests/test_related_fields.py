@@ -1,5 +1,6 @@
 from django.db import models
-from polyjuice import errors, fields
+from django.test.utils import CaptureQueriesContext
+from polyjuice import errors, fields, registry, sql
 import pytest
 from sqlalchemy import Column, ForeignKey, MetaData, Table
 from sqlalchemy.sql.sqltypes import Integer
@@ -33,6 +34,32 @@ class TestForeignKey:
 
         assert django_field.remote_field.model == "myshinyapp.mymodel"
 
+    def test_related_model_is_resolved_from_the_registry(self):
+        metadata = MetaData()
+        related_table = Table("professors", metadata, Column("id", Integer))
+        table = Table(
+            "potions",
+            metadata,
+            Column(
+                "invented_by",
+                Integer,
+                ForeignKey("professors.id"),
+                django_on_delete="CASCADE",
+            ),
+        )
+
+        class Professor(models.Model):
+            class Meta:
+                app_label = "registry_fk"
+
+        registry.register(related_table, Professor)
+        try:
+            _, django_field = fields.to_django_field(table, table.c.invented_by)
+        finally:
+            registry.unregister(related_table)
+
+        assert django_field.remote_field.model is Professor
+
     def test_django_related_name_option(self):
         column = Column(
             "invented_by",
@@ -69,6 +96,118 @@ class TestForeignKey:
         assert err.value.args[0] == (
             "Table `test_table` column `invented_by`: \n"
             "The value `lmfao` is not valid for the 'django_on_delete' option.\n"
-            "You must use either: CASCADE, PROTECT, SET_NULL, SET_DEFAULT or DO_NOTHING.\n"
+            "You must use either: CASCADE, PROTECT, SET_NULL, SET_DEFAULT, DO_NOTHING, "
+            "DB_CASCADE or DB_SET_NULL.\n"
             "Cf: https://docs.djangoproject.com/en/2.2/ref/models/fields/#django.db.models.ForeignKey.on_delete"
         )
+
+    def test_database_cascade(self):
+        column = Column(
+            "invented_by",
+            Integer,
+            ForeignKey("mymodel.id", ondelete="CASCADE"),
+            django_on_delete="DB_CASCADE",
+        )
+
+        _, django_field = fields.to_django_field(TestTable, column)
+
+        assert django_field.remote_field.on_delete == models.DO_NOTHING
+
+    def test_database_set_null(self):
+        column = Column(
+            "invented_by",
+            Integer,
+            ForeignKey("mymodel.id", ondelete="set null"),
+            django_on_delete="DB_SET_NULL",
+        )
+
+        _, django_field = fields.to_django_field(TestTable, column)
+
+        assert django_field.remote_field.on_delete == models.DO_NOTHING
+
+    def test_fail_if_database_on_delete_is_missing(self):
+        column = Column(
+            "invented_by",
+            Integer,
+            ForeignKey("mymodel.id"),
+            django_on_delete="DB_CASCADE",
+        )
+
+        with pytest.raises(errors.MissingDatabaseOnDelete) as err:
+            fields.to_django_field(TestTable, column)
+
+        assert err.value.args[0] == (
+            "Table `test_table` column `invented_by`: \n"
+            "The 'django_on_delete' value `DB_CASCADE` relies on the database, so the SQLAlchemy "
+            "ForeignKey must define `ondelete='CASCADE'`.\n"
+            "Example: Column('invented_by', Integer, ForeignKey('myrelatedmodel.id', ondelete='CASCADE'), django_on_delete='DB_CASCADE')"
+        )
+
+    def test_fail_if_database_set_null_column_is_not_nullable(self):
+        column = Column(
+            "invented_by",
+            Integer,
+            ForeignKey("mymodel.id", ondelete="SET NULL"),
+            nullable=False,
+            django_on_delete="DB_SET_NULL",
+        )
+
+        with pytest.raises(errors.NotNullableDatabaseSetNull) as err:
+            fields.to_django_field(TestTable, column)
+
+        assert err.value.args[0] == (
+            "Table `test_table` column `invented_by`: \n"
+            "The 'django_on_delete' value `DB_SET_NULL` requires a nullable column, "
+            "as the database sets it to NULL when the related row is deleted.\n"
+            "Example: Column('invented_by', Integer, ForeignKey('myrelatedmodel.id', ondelete='SET NULL'), nullable=True, django_on_delete='DB_SET_NULL')"
+        )
+
+
+class TestDatabaseCascade:
+    def setup(self):
+        metadata = MetaData()
+        self.professors = Table(
+            "db_cascade__professor", metadata, Column("id", Integer, primary_key=True)
+        )
+        self.potions = Table(
+            "db_cascade__potion",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column(
+                "invented_by",
+                Integer,
+                ForeignKey("db_cascade__professor.id", ondelete="CASCADE"),
+                django_on_delete="DB_CASCADE",
+            ),
+        )
+        self.metadata = metadata
+
+    def test_deleted_by_the_database(self):
+        # The tables are created by SQLAlchemy, which declares the `ON DELETE` clause.
+        from django.db import connection
+        from polyjuice import models_from_metadata
+        from sqlalchemy.schema import CreateTable, DropTable
+
+        django_models = models_from_metadata(self.metadata, app_label="db_cascade")
+        Professor = django_models["db_cascade__professor"]
+        Potion = django_models["db_cascade__potion"]
+        dialect = sql.get_dialect(connection.vendor)
+        with connection.cursor() as cursor:
+            for table in self.metadata.sorted_tables:
+                cursor.execute(str(CreateTable(table).compile(dialect=dialect)))
+
+        try:
+            professor = Professor.objects.create(id=1)
+            Potion.objects.create(id=1, invented_by=professor)
+
+            with CaptureQueriesContext(connection) as queries:
+                professor.delete()
+
+            assert Potion.objects.count() == 0
+            assert len(queries) == 1
+        finally:
+            with connection.cursor() as cursor:
+                for table in reversed(self.metadata.sorted_tables):
+                    cursor.execute(str(DropTable(table).compile(dialect=dialect)))
+            for table in self.metadata.sorted_tables:
+                registry.unregister(table)
@@ -0,0 +1,309 @@
+from django.db import connection, transaction
+import polyjuice
+from polyjuice import errors, managers, row_cache, sql
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.schema import CreateTable, DropTable
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "row_cache__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        django_cache_ttl=60,
+        django_cache_size=2,
+    )
+
+    class Meta:
+        app_label = "row_cache"
+
+
+@polyjuice.model
+class Professor:
+    __table__ = Table(
+        "row_cache__professor",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        django_cache_ttl=60,
+        django_cache_backend="default",
+    )
+
+    class Meta:
+        app_label = "row_cache"
+
+
+# Declared before the cached table whose rows the database deletes along with its own.
+@polyjuice.model
+class Headmaster:
+    __table__ = Table(
+        "row_cache__headmaster",
+        metadata,
+        Column("id", Integer, primary_key=True),
+    )
+
+    class Meta:
+        app_label = "row_cache"
+
+
+@polyjuice.model
+class Wand:
+    __table__ = Table(
+        "row_cache__wand",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column(
+            "owner",
+            Integer,
+            ForeignKey("row_cache__headmaster.id", ondelete="CASCADE"),
+            django_on_delete="DB_CASCADE",
+        ),
+        django_cache_ttl=60,
+    )
+
+    class Meta:
+        app_label = "row_cache"
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(create_models):
+    from django.core.cache import cache
+
+    create_models(Potion, Professor)
+    yield
+    for django_model in (Potion, Professor):
+        row_cache.get_row_cache(django_model.__table__).clear()
+        django_model.polyjuice.row_cache.hits = 0
+        django_model.polyjuice.row_cache.misses = 0
+    cache.clear()
+
+
+class TestRowCache:
+    def test_manager(self):
+        assert isinstance(Potion.objects, managers.RowCacheManager)
+
+    def test_get_by_primary_key(self, count_queries):
+        Potion.objects.create(id=1, name="Veritaserum")
+
+        first, first_queries = count_queries(lambda: Potion.objects.get(pk=1))
+        second, second_queries = count_queries(lambda: Potion.objects.get(id=1))
+
+        assert (first_queries, second_queries) == (1, 0)
+        assert second.name == "Veritaserum"
+        assert second is not first
+        assert not second._state.adding
+        assert Potion.polyjuice.row_cache.get_stats() == {
+            "hits": 1,
+            "misses": 1,
+            "size": 1,
+        }
+
+    def test_primary_key_values_are_normalized(self, count_queries):
+        Potion.objects.create(id=1, name="Veritaserum")
+        Potion.objects.get(pk=1)
+
+        _, queries = count_queries(lambda: Potion.objects.get(id__exact="1"))
+
+        assert queries == 0
+
+    def test_other_lookups_are_not_cached(self, count_queries):
+        Potion.objects.create(id=1, name="Veritaserum")
+        Potion.objects.get(pk=1)
+
+        _, queries = count_queries(lambda: Potion.objects.get(name="Veritaserum"))
+
+        assert queries == 1
+
+    def test_missing_rows_are_not_cached(self):
+        with pytest.raises(Potion.DoesNotExist):
+            Potion.objects.get(pk=1)
+
+        Potion.objects.create(id=1, name="Veritaserum")
+
+        assert Potion.objects.get(pk=1).name == "Veritaserum"
+
+    def test_least_recently_used_rows_are_evicted(self, count_queries):
+        for potion_id in (1, 2, 3):
+            Potion.objects.create(id=potion_id, name=f"Potion {potion_id}")
+            Potion.objects.get(pk=potion_id)
+
+        _, queries = count_queries(lambda: Potion.objects.get(pk=1))
+
+        assert queries == 1
+
+    def test_rows_expire(self, count_queries):
+        Potion.objects.create(id=1, name="Veritaserum")
+        Potion.polyjuice.row_cache.ttl = -1
+        try:
+            Potion.objects.get(pk=1)
+            _, queries = count_queries(lambda: Potion.objects.get(pk=1))
+        finally:
+            Potion.polyjuice.row_cache.ttl = 60
+
+        assert queries == 1
+
+    def test_invalidated_on_save(self):
+        potion = Potion.objects.create(id=1, name="Veritaserum")
+        Potion.objects.get(pk=1)
+
+        potion.name = "Polyjuice"
+        potion.save()
+
+        assert Potion.objects.get(pk=1).name == "Polyjuice"
+
+    def test_invalidated_on_delete(self):
+        potion = Potion.objects.create(id=1, name="Veritaserum")
+        Potion.objects.get(pk=1)
+
+        potion.delete()
+
+        with pytest.raises(Potion.DoesNotExist):
+            Potion.objects.get(pk=1)
+
+    def test_invalidated_by_core_statements(self):
+        Potion.objects.create(id=1, name="Veritaserum")
+        Potion.objects.get(pk=1)
+
+        sql.execute(Potion.__table__.update().values(name="Polyjuice"))
+
+        assert Potion.objects.get(pk=1).name == "Polyjuice"
+
+    def test_invalidated_on_commit(self):
+        potion = Potion.objects.create(id=1, name="Veritaserum")
+
+        with transaction.atomic():
+            potion.name = "Polyjuice"
+            potion.save()
+            Potion.objects.get(pk=1)
+
+        assert Potion.objects.get(pk=1).name == "Polyjuice"
+        assert Potion.polyjuice.row_cache.hits == 0
+
+    def test_rows_read_in_a_transaction_are_not_cached(self):
+        potion = Potion.objects.create(id=1, name="Veritaserum")
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                potion.name = "Rolled back"
+                potion.save()
+                Potion.objects.get(pk=1)
+                raise RuntimeError
+
+        assert Potion.objects.get(pk=1).name == "Veritaserum"
+
+    def test_invalidated_by_queryset_updates(self):
+        Potion.objects.create(id=1, name="Veritaserum")
+        Potion.objects.get(pk=1)
+
+        Potion.objects.filter(pk=1).update(name="Polyjuice")
+
+        assert Potion.objects.get(pk=1).name == "Polyjuice"
+
+    def test_invalidated_by_queryset_deletes(self):
+        Potion.objects.create(id=1, name="Veritaserum")
+        Potion.objects.get(pk=1)
+
+        # Without signal receivers, the rows are deleted with `_raw_delete`.
+        Potion.objects.filter(pk=1)._raw_delete("default")
+
+        with pytest.raises(Potion.DoesNotExist):
+            Potion.objects.get(pk=1)
+
+
+class TestDjangoCacheBackend:
+    def test_shared_between_processes(self, count_queries):
+        Professor.objects.create(id=1, name="Severus Snape")
+        Professor.objects.get(pk=1)
+
+        # Another process starts with an empty local cache.
+        Professor.polyjuice.row_cache.clear()
+        professor, queries = count_queries(lambda: Professor.objects.get(pk=1))
+
+        assert queries == 0
+        assert professor.name == "Severus Snape"
+
+    def test_invalidated_on_save(self):
+        professor = Professor.objects.create(id=1, name="Severus Snape")
+        Professor.objects.get(pk=1)
+
+        professor.name = "Horace Slughorn"
+        professor.save()
+        Professor.polyjuice.row_cache.clear()
+
+        assert Professor.objects.get(pk=1).name == "Horace Slughorn"
+
+    def test_invalidated_by_queryset_updates(self):
+        Professor.objects.create(id=1, name="Severus Snape")
+        Professor.objects.get(pk=1)
+
+        Professor.objects.filter(pk=1).update(name="Horace Slughorn")
+        Professor.polyjuice.row_cache.clear()
+
+        assert Professor.objects.get(pk=1).name == "Horace Slughorn"
+
+    def test_invalidated_by_bulk_update(self):
+        Professor.objects.create(id=1, name="Severus Snape")
+        Professor.objects.get(pk=1)
+
+        Professor.polyjuice.bulk_update([{"id": 1, "name": "Horace Slughorn"}])
+        Professor.polyjuice.row_cache.clear()
+
+        assert Professor.objects.get(pk=1).name == "Horace Slughorn"
+
+    def test_invalidated_by_bulk_upsert(self):
+        Professor.objects.create(id=1, name="Severus Snape")
+        Professor.objects.get(pk=1)
+
+        Professor.polyjuice.bulk_upsert([{"id": 1, "name": "Horace Slughorn"}])
+        Professor.polyjuice.row_cache.clear()
+
+        assert Professor.objects.get(pk=1).name == "Horace Slughorn"
+
+
+class TestDatabaseCascades:
+    @pytest.fixture(autouse=True)
+    def cascading_tables(self):
+        # The tables are created by SQLAlchemy, which declares the `ON DELETE` clause.
+        dialect = sql.get_dialect(connection.vendor)
+        tables = [Headmaster.__table__, Wand.__table__]
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(str(CreateTable(table).compile(dialect=dialect)))
+        headmaster = Headmaster.objects.create(id=1)
+        Wand.objects.create(id=5, owner=headmaster)
+        Wand.objects.get(pk=5)
+        yield
+        with connection.cursor() as cursor:
+            for table in reversed(tables):
+                cursor.execute(str(DropTable(table).compile(dialect=dialect)))
+        Wand.polyjuice.row_cache.clear()
+
+    def test_invalidated_on_delete(self):
+        Headmaster.objects.get(pk=1).delete()
+
+        with pytest.raises(Wand.DoesNotExist):
+            Wand.objects.get(pk=5)
+
+    def test_invalidated_by_core_statements(self):
+        sql.execute(Headmaster.__table__.delete())
+
+        with pytest.raises(Wand.DoesNotExist):
+            Wand.objects.get(pk=5)
+
+
+def test_fail_without_single_primary_key():
+    table = Table(
+        "row_cache__ingredient",
+        MetaData(),
+        Column("potion_id", Integer, primary_key=True),
+        Column("name", String(50), primary_key=True),
+        django_cache_ttl=60,
+    )
+
+    with pytest.raises(errors.InvalidRowCacheTable):
+        row_cache.register(table)
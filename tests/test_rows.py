@@ -0,0 +1,116 @@
+from datetime import date
+from django.test.utils import CaptureQueriesContext
+import pickle
+import polyjuice
+import pytest
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Professor:
+    __table__ = Table(
+        "rows__professor",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(30), nullable=False),
+    )
+
+    class Meta:
+        app_label = "rows"
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "rows__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False, django_field_name="title"),
+        Column("brewed_at", Date, nullable=True),
+        Column(
+            "invented_by",
+            Integer,
+            ForeignKey(Professor.__table__.c.id),
+            django_on_delete="CASCADE",
+        ),
+    )
+
+    class Meta:
+        app_label = "rows"
+
+    def describe(self):
+        return f"{self.title} ({self.brewed_at.year})"
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(create_models):
+    create_models(Professor, Potion)
+    professor = Professor.objects.create(id=1, name="Severus Snape")
+    Potion.objects.create(
+        id=1, title="Veritaserum", brewed_at=date(1998, 5, 2), invented_by=professor
+    )
+    Potion.objects.create(
+        id=2, title="Polyjuice", brewed_at=date(1992, 12, 1), invented_by=professor
+    )
+
+
+class TestRowClass:
+    def test_fields(self):
+        assert Potion.Row._fields == ("id", "title", "brewed_at", "invented_by_id")
+        assert Potion.Row.__qualname__ == "Potion.Row"
+
+    def test_slots(self):
+        row = Potion.Row(1, "Veritaserum", None, 1)
+
+        assert not hasattr(row, "__dict__")
+        assert row.title == "Veritaserum"
+
+    def test_read_only(self):
+        row = Potion.Row(1, "Veritaserum", None, 1)
+
+        with pytest.raises(AttributeError):
+            row.title = "Polyjuice"
+
+    def test_methods(self):
+        row = Potion.Row(1, "Veritaserum", date(1998, 5, 2), 1)
+
+        assert row.describe() == "Veritaserum (1998)"
+
+    def test_wrong_number_of_values(self):
+        with pytest.raises(TypeError):
+            Potion.Row(1, "Veritaserum")
+
+    def test_equality_and_pickle(self):
+        row = Potion.Row(1, "Veritaserum", None, 1)
+
+        assert pickle.loads(pickle.dumps(row)) == row
+        assert row._asdict() == {
+            "id": 1,
+            "title": "Veritaserum",
+            "brewed_at": None,
+            "invented_by_id": 1,
+        }
+
+
+class TestRows:
+    def test_rows(self):
+        from django.db import connection
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = Potion.objects.order_by("id").rows()
+
+        assert len(queries) == 1
+        assert rows == [
+            Potion.Row(1, "Veritaserum", date(1998, 5, 2), 1),
+            Potion.Row(2, "Polyjuice", date(1992, 12, 1), 1),
+        ]
+
+    def test_filtered_queryset(self):
+        rows = Potion.objects.filter(brewed_at__year=1992).rows()
+
+        assert [row.describe() for row in rows] == ["Polyjuice (1992)"]
+
+    def test_empty_queryset(self):
+        assert Potion.objects.none().rows() == []
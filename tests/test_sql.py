@@ -0,0 +1,288 @@
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from polyjuice import errors, sql
+import pytest
+from sqlalchemy import (
+    Column,
+    Date,
+    delete,
+    extract,
+    func,
+    Integer,
+    MetaData,
+    Numeric,
+    bindparam as sql_bindparam,
+    select,
+    String,
+    Table,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable, DropTable
+
+metadata = MetaData()
+Potion = Table(
+    "sql__potion",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False),
+    Column("price", Numeric(precision=10, scale=2)),
+    Column("brewed_at", Date),
+    Column("stock", Integer, default=10),
+)
+
+
+@pytest.fixture(autouse=True)
+def potion_table():
+    dialect = sql.get_dialect(connection.vendor)
+    with connection.cursor() as cursor:
+        cursor.execute(str(CreateTable(Potion).compile(dialect=dialect)))
+    yield
+    with connection.cursor() as cursor:
+        cursor.execute(str(DropTable(Potion).compile(dialect=dialect)))
+    sql.clear_compiled_cache()
+
+
+def insert_potion(**values):
+    return sql.execute(Potion.insert().values(**values))
+
+
+class TestExecute:
+    def test_insert_and_select(self):
+        insert_potion(id=1, name="Veritaserum", brewed_at=date(1998, 5, 2))
+
+        result = sql.execute(select([Potion]))
+
+        assert result.keys == ["id", "name", "price", "brewed_at", "stock"]
+        assert result.fetchall() == [(1, "Veritaserum", None, date(1998, 5, 2), 10)]
+
+    def test_records_expose_columns_as_attributes(self):
+        insert_potion(id=1, name="Veritaserum")
+
+        record = sql.execute(select([Potion.c.name])).first()
+
+        assert record.name == "Veritaserum"
+
+    def test_result_processors_are_applied(self):
+        insert_potion(id=1, name="Veritaserum", price=Decimal("10.50"))
+
+        price = sql.execute(select([Potion.c.price])).scalar()
+
+        assert price == Decimal("10.50")
+        assert isinstance(price, Decimal)
+
+    def test_update_and_delete_rowcount(self):
+        insert_potion(id=1, name="Veritaserum")
+        insert_potion(id=2, name="Polyjuice")
+
+        updated = sql.execute(update(Potion).values(stock=0))
+        deleted = sql.execute(delete(Potion).where(Potion.c.id == 1))
+
+        assert updated.rowcount == 2
+        assert deleted.rowcount == 1
+
+    def test_params(self):
+        insert_potion(id=1, name="Veritaserum")
+        statement = select([Potion.c.id]).where(Potion.c.name == sql_bindparam("name"))
+
+        result = sql.execute(statement, {"name": "Veritaserum"})
+
+        assert result.scalar() == 1
+
+
+class TestCompiledCache:
+    def test_same_statement_is_compiled_once(self):
+        statement = select([Potion.c.id])
+
+        first = sql.get_compiled(statement, "sqlite")
+        second = sql.get_compiled(statement, "sqlite")
+
+        assert first is second
+
+    def test_statements_sharing_a_cache_key_are_compiled_once(self):
+        insert_potion(id=1, name="Veritaserum")
+        insert_potion(id=2, name="Polyjuice")
+        sql.clear_compiled_cache()
+
+        def get_potion_name(potion_id):
+            statement = select([Potion.c.name]).where(Potion.c.id == potion_id)
+            return sql.execute(statement, cache_key="potion-name").scalar()
+
+        assert get_potion_name(1) == "Veritaserum"
+        assert get_potion_name(2) == "Polyjuice"
+        assert len(sql._compiled_statements) == 1
+
+    def test_statement_of_another_shape_is_recompiled(self):
+        first = sql.get_compiled(
+            select([Potion.c.id]).where(Potion.c.id == 1), "sqlite", "potion"
+        )
+        second = sql.get_compiled(
+            select([Potion.c.id]).where(Potion.c.name == "Veritaserum"),
+            "sqlite",
+            "potion",
+        )
+
+        assert first is not second
+
+    def test_rebuilt_statements_are_compiled_once(self):
+        def build(potion_id):
+            return select([Potion.c.name.label("title")]).where(
+                Potion.c.id == potion_id
+            )
+
+        compiled = [
+            sql.get_compiled(build(potion_id), "sqlite") for potion_id in (1, 2, 3)
+        ]
+
+        assert compiled[0] is compiled[1] is compiled[2]
+        assert len(sql._compiled_statements) == 1
+
+    def test_statements_of_another_shape_sharing_a_cache_key(self):
+        insert_potion(id=1, name="Veritaserum", stock=1)
+        insert_potion(id=2, name="Polyjuice", stock=2)
+
+        by_name = select([Potion.c.id]).where(Potion.c.name == "Polyjuice")
+        by_stock = select([Potion.c.id]).where(Potion.c.stock == 1)
+        names = select([Potion.c.name]).where(Potion.c.stock == 1)
+
+        assert sql.execute(by_name, cache_key="potion").fetchall() == [(2,)]
+        assert sql.execute(by_stock, cache_key="potion").fetchall() == [(1,)]
+        assert sql.execute(names, cache_key="potion").fetchall() == [("Veritaserum",)]
+
+    def test_operators_labels_and_limits_are_part_of_the_shape(self):
+        insert_potion(id=1, name="Veritaserum")
+        insert_potion(id=2, name="Polyjuice")
+
+        assert sql.execute(select([Potion.c.id]).where(Potion.c.id > 1)).scalar() == 2
+        assert sql.execute(select([Potion.c.id]).where(Potion.c.id < 2)).scalar() == 1
+        assert sql.execute(select([Potion.c.id.label("a")])).keys == ["a"]
+        assert sql.execute(select([Potion.c.id.label("b")])).keys == ["b"]
+        assert len(sql.execute(select([Potion.c.id]).limit(1))) == 1
+        assert len(sql.execute(select([Potion.c.id]).limit(2))) == 2
+
+
+class TestCompiledStructure:
+    def select_ids(self, where):
+        return [
+            row.id
+            for row in sql.execute(
+                select([Potion.c.id]).where(where).order_by(Potion.c.id)
+            )
+        ]
+
+    def test_extract_field(self):
+        insert_potion(id=1, name="Veritaserum", brewed_at=date(1998, 5, 2))
+
+        day = sql.execute(select([extract("day", Potion.c.brewed_at)])).scalar()
+        month = sql.execute(select([extract("month", Potion.c.brewed_at)])).scalar()
+
+        assert (day, month) == (2, 5)
+
+    def test_collation(self):
+        insert_potion(id=1, name="Veritaserum")
+
+        assert self.select_ids(Potion.c.name.collate("NOCASE") == "VERITASERUM") == [1]
+        assert self.select_ids(Potion.c.name.collate("BINARY") == "VERITASERUM") == []
+
+    def test_like_escape(self):
+        insert_potion(id=1, name="10%")
+        insert_potion(id=2, name="10!x")
+
+        assert self.select_ids(Potion.c.name.like("10!%", escape="!")) == [1]
+        assert self.select_ids(Potion.c.name.like("10!%", escape="/")) == [2]
+
+    def test_contains_autoescape(self):
+        insert_potion(id=1, name="10%")
+        insert_potion(id=2, name="100")
+
+        assert self.select_ids(Potion.c.name.contains("0%")) == [1, 2]
+        assert self.select_ids(Potion.c.name.contains("0%", autoescape=True)) == [1]
+
+    def test_window_clauses(self):
+        insert_potion(id=1, name="Veritaserum", stock=1)
+        insert_potion(id=2, name="Polyjuice", stock=2)
+
+        def row_numbers(**window):
+            row_number = func.row_number().over(**window)
+            statement = select([row_number]).order_by(Potion.c.id)
+            return [row[0] for row in sql.execute(statement)]
+
+        assert row_numbers(partition_by=Potion.c.stock) == [1, 1]
+        assert row_numbers(order_by=Potion.c.stock) == [1, 2]
+
+    def test_locking_clauses(self):
+        statement = select([Potion.c.id])
+
+        compiled = {
+            sql.get_compiled(locked, "postgresql").sql
+            for locked in (
+                statement.with_for_update(),
+                statement.with_for_update(of=Potion.c.id),
+                statement.with_for_update(key_share=True),
+            )
+        }
+
+        assert len(compiled) == 3
+
+    def test_on_conflict_clause(self):
+        values = {"id": 1, "name": "Veritaserum"}
+
+        plain = sql.get_compiled(postgresql.insert(Potion).values(values), "postgresql")
+        ignored = sql.get_compiled(
+            postgresql.insert(Potion).values(values).on_conflict_do_nothing(),
+            "postgresql",
+        )
+
+        assert "ON CONFLICT DO NOTHING" in ignored.sql
+        assert "ON CONFLICT" not in plain.sql
+
+    def test_update_with_sql_expression(self):
+        insert_potion(id=1, name="Veritaserum")
+
+        sql.execute(update(Potion).values(stock=5))
+        sql.execute(update(Potion).values(stock=Potion.c.stock + 10))
+        sql.execute(update(Potion).values(stock=Potion.c.stock + 20))
+
+        assert sql.execute(select([Potion.c.stock])).scalar() == 35
+
+    def test_insert_with_sql_expression(self):
+        insert_potion(id=1, name="a")
+        insert_potion(id=2, name=func.upper("b"))
+        insert_potion(id=3, name=func.upper("c"))
+
+        names = sql.execute(select([Potion.c.name]).order_by(Potion.c.id))
+
+        assert [row.name for row in names] == ["a", "B", "C"]
+
+
+def test_fail_when_database_vendor_is_not_supported():
+    with pytest.raises(errors.UnsupportedDatabaseVendor) as err:
+        sql.get_dialect("microsoft")
+
+    assert err.value.args[0] == (
+        "The database vendor `microsoft` is not supported yet.\n"
+        "You must use either: mysql, oracle, postgresql or sqlite."
+    )
+
+
+class TestStream:
+    def setup(self):
+        for potion_id in range(1, 6):
+            insert_potion(id=potion_id, name=f"Potion {potion_id}")
+
+    def test_yield_every_row(self):
+        records = list(sql.stream(select([Potion.c.id]), chunk_size=2))
+
+        assert records == [(1,), (2,), (3,), (4,), (5,)]
+
+    def test_rows_are_fetched_by_chunks(self):
+        chunks = list(sql.stream_chunks(select([Potion.c.id]), chunk_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    def test_stop_iterating_early(self):
+        records = sql.stream(select([Potion.c.name]), chunk_size=2)
+
+        assert next(records).name == "Potion 1"
+        records.close()
@@ -0,0 +1,176 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import polyjuice
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, Text
+
+metadata = MetaData()
+
+
+@polyjuice.model
+class Professor:
+    __table__ = Table(
+        "tracking__professor",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(30), nullable=False),
+    )
+
+    class Meta:
+        app_label = "tracking"
+
+
+@polyjuice.model
+class Potion:
+    __table__ = Table(
+        "tracking__potion",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False, django_field_name="title"),
+        Column("recipe", Text, nullable=False),
+        Column(
+            "invented_by",
+            Integer,
+            ForeignKey(Professor.__table__.c.id),
+            django_on_delete="CASCADE",
+            nullable=True,
+        ),
+        django_track_changes=True,
+    )
+
+    class Meta:
+        app_label = "tracking"
+
+
+@pytest.fixture(autouse=True)
+def setup_tables(create_models):
+    create_models(Professor, Potion)
+    Professor.objects.create(id=1, name="Severus Snape")
+    Potion.objects.create(id=1, title="Veritaserum", recipe="A very long recipe")
+
+
+def get_queries(function):
+    with CaptureQueriesContext(connection) as queries:
+        function()
+    return [query["sql"] for query in queries]
+
+
+class TestChangedFields:
+    def test_no_changes(self):
+        potion = Potion.objects.get(pk=1)
+
+        assert potion.polyjuice_changed_fields() == []
+
+    def test_changes(self):
+        potion = Potion.objects.get(pk=1)
+
+        potion.title = "Polyjuice"
+        potion.invented_by_id = 1
+
+        assert potion.polyjuice_changed_fields() == ["title", "invented_by"]
+
+    def test_value_set_back(self):
+        potion = Potion.objects.get(pk=1)
+
+        potion.title = "Polyjuice"
+        potion.title = "Veritaserum"
+
+        assert potion.polyjuice_changed_fields() == []
+
+    def test_deferred_fields(self):
+        potion = Potion.objects.defer("recipe").get(pk=1)
+
+        assert potion.polyjuice_changed_fields() == []
+        assert potion.recipe == "A very long recipe"
+        assert potion.polyjuice_changed_fields() == []
+
+
+class TestSave:
+    def test_only_changed_columns_are_updated(self):
+        potion = Potion.objects.get(pk=1)
+        potion.title = "Polyjuice"
+
+        queries = get_queries(potion.save)
+
+        assert len(queries) == 1
+        assert queries[0].startswith('UPDATE "tracking__potion" SET "name" = ')
+        assert "recipe" not in queries[0]
+        assert Potion.objects.get(pk=1).title == "Polyjuice"
+
+    def test_nothing_changed(self):
+        potion = Potion.objects.get(pk=1)
+
+        assert get_queries(potion.save) == []
+
+    def test_changes_are_reset_after_save(self):
+        potion = Potion.objects.get(pk=1)
+        potion.title = "Polyjuice"
+        potion.save()
+
+        assert potion.polyjuice_changed_fields() == []
+        assert get_queries(potion.save) == []
+
+    def test_created_instances(self):
+        potion = Potion.objects.create(id=2, title="Polyjuice", recipe="Lacewing flies")
+
+        potion.recipe = "Lacewing flies and leeches"
+        queries = get_queries(potion.save)
+
+        assert len(queries) == 1
+        assert '"name"' not in queries[0]
+
+    def test_explicit_update_fields(self):
+        potion = Potion.objects.get(pk=1)
+        potion.title = "Polyjuice"
+        potion.recipe = "Lacewing flies"
+
+        potion.save(update_fields=["recipe"])
+
+        assert potion.polyjuice_changed_fields() == ["title"]
+
+    def test_refresh_from_db(self):
+        potion = Potion.objects.get(pk=1)
+        Potion.objects.filter(pk=1).update(title="Polyjuice")
+
+        potion.refresh_from_db()
+
+        assert potion.title == "Polyjuice"
+        assert potion.polyjuice_changed_fields() == []
+
+    def test_changed_primary_key_saves_every_column(self):
+        potion = Potion.objects.get(pk=1)
+        potion.id = 2
+
+        potion.save()
+
+        assert Potion.objects.get(pk=2).recipe == "A very long recipe"
+
+
+def test_models_without_option_are_not_tracked():
+    assert not hasattr(Professor, "polyjuice_changed_fields")
+
+
+@polyjuice.model
+class Ingredient:
+    __table__ = Table(
+        "tracking__ingredient",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+        Column("origin", String(50), nullable=False),
+        django_track_changes=True,
+        django_fast_init=True,
+    )
+
+    class Meta:
+        app_label = "tracking"
+
+
+def test_fast_init_models(create_models):
+    create_models(Ingredient)
+    Ingredient.objects.create(id=1, name="Lacewing fly", origin="Forbidden Forest")
+    ingredient = Ingredient.objects.get(pk=1)
+
+    assert get_queries(ingredient.save) == []
+    ingredient.origin = "Hogsmeade"
+    assert ingredient.polyjuice_changed_fields() == ["origin"]